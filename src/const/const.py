@@ -42,6 +42,172 @@ RANK_PLACE_HOLDER: str = "공개전"
 EP_TYPES_NAMED_TUPLE_CLS = namedtuple("EpTypes", "free plus adult")
 EP_TYPES_NAMED_TUPLE = EP_TYPES_NAMED_TUPLE_CLS("자유", "PLUS", "성인")
 
+HTML_CSS_FILE_NAME: str = "style.css"  # 회차 HTML 문서들이 함께 쓰는 스타일 시트
+HTML_CSS: str = """body {
+  font-size: 18px;
+  line-height: 125%;
+  max-width: 900px;
+  margin: 0 auto;
+  padding: 0 1em;
+}
+article + article {
+  margin-top: 4em;
+}
+p {
+  margin: 0 0 0.5em;
+}
+"""
+HTML_BUFFER_SIZE: int = 1 << 20  # HTML 파일 쓰기 버퍼 크기 (1 MiB)
+
+################################################################################
+# src.func.table
+################################################################################
+NOVEL_TYPE_FLAGS: tuple[str, ...] = ("성인", "자유", "PLUS", "독점", "챌린지")  # NovelTable.types 의 비트 순서
+
+################################################################################
+# src.func.analytics
+################################################################################
+ABANDON_DAYS: int = 90  # 연재 중인데 이 기간 동안 새 회차가 없으면 연중작으로 봄
+
+################################################################################
+# src.func.sampling
+################################################################################
+SAMPLE_STRATA: int = 20  # 소설 번호 구간 (층) 수
+SAMPLE_BATCH_SIZE: int = 200  # 한 번에 요청하는 표본 수 (적응형 중단은 이 단위로 판단)
+SAMPLE_MAX_SIZE: int = 5_000  # 최대 표본 수
+SAMPLE_HALF_WIDTH: float = 0.01  # 신뢰구간 반폭이 모두 이보다 좁아지면 표본 추출을 멈춤
+SAMPLE_MIN_SIZE: int = 400  # 적응형 중단을 판단하기 전 최소 표본 수
+SAMPLE_Z: float = 1.959964  # 95% 신뢰수준의 표준정규분포 분위수
+SAMPLE_MAX_WORKERS: int = 8  # 표본 소설 동시 요청 수
+
+################################################################################
+# src.func.liveness
+################################################################################
+LIVENESS_FILE_NAME: str = "liveness.bin"  # DB 파일과 같은 폴더에 저장
+LIVENESS_EPOCH_DAYS: int = 7  # 확인 시점을 이 일수 단위로 기록
+LIVENESS_RECHECK_EPOCHS: dict[str, int] = {  # 죽은 번호를 다시 확인하기까지의 기간 (LIVENESS_EPOCH_DAYS 단위)
+    "deleted": 26,  # 삭제작은 거의 되살아나지 않음
+    "draft": 8,  # 연습작품은 공개 전환될 수 있음
+    "invalid": 4,  # 잘못된 번호는 새 소설이 등록되면 살아남
+}
+
+################################################################################
+# src.func.discovery
+################################################################################
+DISCOVERY_FILE_NAME: str = "max_code.json"  # DB 파일과 같은 폴더에 저장
+DISCOVERY_FIRST_STEP: int = 256  # 지수 탐색의 첫 보폭
+DISCOVERY_GAP_WINDOW: int = 8  # 이만큼 연달아 잘못된 번호여야 끝으로 봄 (중간에 빈 번호 허용)
+DISCOVERY_MAX_AGE_HOURS: int = 24  # 저장해 둔 최신 번호를 다시 찾기까지의 시간
+
+################################################################################
+# src.func.scheduler
+################################################################################
+SCHEDULE_BUDGET: int = 1_000  # 한 번 실행할 때 다시 요청하는 소설 수
+SCHEDULE_CADENCE_EPS: int = 10  # 연재 주기를 잴 때 쓰는 최근 회차 수
+SCHEDULE_DEFAULT_INTERVAL_DAYS: float = 7.0  # 회차가 하나 이하라 주기를 모를 때
+SCHEDULE_MIN_INTERVAL_DAYS: float = 0.5  # 연재 주기의 하한
+SCHEDULE_MAX_INTERVAL_DAYS: float = 365.0  # 연재 주기의 상한 (삭제작, 연습작품은 항상 이 값)
+SCHEDULE_STATUS_FACTORS: dict[str, float] = {  # 연재 상태별로 연재 주기에 곱하는 값
+    NOVEL_STATUSES_NAMED_TUPLE.ongoing: 1.0,
+    NOVEL_STATUSES_NAMED_TUPLE.delayed: 3.0,
+    NOVEL_STATUSES_NAMED_TUPLE.hiatus: 10.0,
+    NOVEL_STATUSES_NAMED_TUPLE.complete: 30.0,
+}
+
+################################################################################
+# src.func.vault
+################################################################################
+VAULT_MANIFEST_FILE_NAME: str = ".novel_manifest.json"  # Markdown 폴더에 두는 해시 목록 (Obsidian 은 점 파일을 무시)
+VAULT_STAT_KEYS: tuple[str, ...] = (  # 크롤링할 때마다 바뀌는 통계 속성 (해시에서 빼면 이 값만 바뀐 문서는 다시 쓰지 않음)
+    "로컬 갱신일", "알람 수", "선호 수", "추천 수", "조회 수",
+)
+VAULT_HASH_EXCLUDED_KEYS: tuple[str, ...] = ()  # 기본으로 해시에서 빼는 속성 (없음: 바뀐 문서는 모두 다시 씀)
+VAULT_OWNED_KEYS: tuple[str, ...] = (  # 기존 문서를 고칠 때 크롤러가 덮어 쓰는 속성 (연재 상태 속성은 따로 처리)
+    "연재 시작일", "최근(예정) 연재일", "소설 등록일", "소설 갱신일", "원격 갱신일", "로컬 갱신일",
+    "회차 수", "알람 수", "선호 수", "추천 수", "조회 수",
+)
+VAULT_INDEX_FILE_NAME: str = ".novel_index.json"  # Markdown 폴더에 두는 소설 번호 > 문서 경로 목록
+VAULT_LAYOUTS: tuple[str, ...] = ("flat", "code", "status")  # 한 폴더, 번호 앞자리별 폴더, 연재 상태별 폴더
+VAULT_SHARD_DIGITS: int = 3  # 'code' 구조에서 폴더 이름으로 쓰는 6자리 번호의 앞자리 수 (폴더당 문서 1000개)
+VAULT_UNKNOWN_STATUS_DIR: str = "알 수 없음"  # 'status' 구조에서 연재 상태를 모르는 문서의 폴더
+VAULT_GOT_TIME_KEY: str = "로컬 갱신일"  # 소설 정보를 받은 시각이 적힌 속성 (목록을 처음 만들 때 읽음)
+VAULT_FRESH_HOURS: float = 24  # 받은 지 이 시간이 안 된 소설은 다시 요청하지 않음
+
+################################################################################
+# src.func.writer
+################################################################################
+WRITER_MAX_WORKERS: int = 8  # 동시에 파일을 쓰는 스레드 수
+WRITER_BATCH_SIZE: int = 256  # 같은 폴더의 파일을 이만큼 모아서 스레드 하나에 맡김
+
+################################################################################
+# src.func.catalog
+################################################################################
+CATALOG_DIR_NAME: str = "소설 목록"  # 보관함에서 '소설 정보' 폴더 옆에 두는 목록 폴더
+CATALOG_NOTE_PREFIX: str = "소설 목록"  # 목록 문서 이름 ('소설 목록 001.md')
+CATALOG_CSV_NAME: str = "novels.csv"  # Dataview 의 dv.io.csv() 로 읽는 파일
+CATALOG_JSON_NAME: str = "novels.json"  # Dataview 의 dv.io.load() 로 읽는 파일
+CATALOG_SHARD_SIZE: int = 5000  # 목록 문서 하나에 넣는 소설 수
+CATALOG_FORMATS: tuple[str, ...] = ("md", "csv", "json")
+CATALOG_FIELDS: tuple[tuple[str, str], ...] = (  # (열 이름, Novel 속성)
+    ("소설 번호", "code"),
+    ("제목", "title"),
+    ("작가명", "writer_nick"),
+    ("연재 상태", "up_status"),
+    ("tags", "tags"),
+    ("유형", "types"),
+    ("연재 시작일", "start_date"),
+    ("최근(예정) 연재일", "last_write_date"),
+    ("로컬 갱신일", "got_time"),
+    ("회차 수", "count_book"),
+    ("알람 수", "count_alarm"),
+    ("선호 수", "count_like"),
+    ("추천 수", "count_good"),
+    ("조회 수", "count_view"),
+    ("소설 링크", "url"),
+)
+
+################################################################################
+# src.func.dataset
+################################################################################
+DATASET_ROW_GROUP_SIZE: int = 10_000  # Parquet 파일에 한 번에 쓰는 행 수
+
+################################################################################
+# src.func.store
+################################################################################
+STORE_FILE_NAME: str = "novelpia.sqlite3"  # 환경 변수 NOVEL_DB_PATH 가 없을 때의 DB 파일 이름
+STORE_BATCH_SIZE: int = 5_000  # 트랜잭션 하나에 넣는 행 수
+
+################################################################################
+# src.func.snapshot
+################################################################################
+NOVEL_SERIES_FIELDS: tuple[str, ...] = ("count_view", "count_good", "count_like", "count_alarm", "count_book")
+EP_SERIES_FIELDS: tuple[str, ...] = ("count_view", "count_good", "comment")
+
+################################################################################
+# src.epub
+################################################################################
+EPUB_MIMETYPE: str = "application/epub+zip"
+EPUB_MAX_WORKERS: int = 8  # 회차 본문 동시 요청 수
+EPUB_CONTAINER_XML: str = """<?xml version="1.0" encoding="utf-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles>
+    <rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>
+  </rootfiles>
+</container>
+"""
+
+################################################################################
+# src.search
+################################################################################
+SEARCH_RESULT_LIMIT: int = 20  # 검색 결과 수
+SEARCH_COLUMN_WEIGHTS: tuple[float, ...] = (10.0, 5.0, 1.0)  # 제목, 작가명, 시놉시스 순위 가중치 (BM25)
+
+################################################################################
+# src.query
+################################################################################
+QUERY_DEFAULT_COLUMNS: tuple[str, ...] = ("code", "title", "writer_nick", "up_status", "count_view", "count_book")
+QUERY_AGG_FUNCS: tuple[str, ...] = ("count", "sum", "avg", "min", "max")
+
 ################################################################################
 # src.myTest
 ################################################################################
@@ -0,0 +1,240 @@
+"""소설 전체를 EPUB 파일로 내려받는 코드"""
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from html import escape, unescape
+from pathlib import Path
+from typing import Callable, Iterable
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+from src.const.const import EPUB_MAX_WORKERS
+from src.func.userIO import print_under_new_line
+from src.func.writer import atomic_open
+from src.novel_info import Novel
+
+
+def chapter_to_xhtml(title: str, lines: Iterable[str] | None):
+    """회차 제목과 본문을 EPUB 용 XHTML 문서로 변환하여 한 문단씩 반환하는 함수
+
+    :param title: 회차 제목
+    :param lines: 회차 본문 줄 (받지 못했으면 None)
+    :return: XHTML 문서를 한 조각씩 반환하는 제너레이터
+    """
+    from re import compile
+
+    tag_pattern = compile(r"<[^>]+>")
+    title = escape(title)
+
+    yield (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<html xmlns="http://www.w3.org/1999/xhtml" xml:lang="ko">\n'
+        f"<head><title>{title}</title></head>\n"
+        f"<body>\n<h1>{title}</h1>\n"
+    )
+
+    if lines is None:
+        lines = ["[알림] 본문을 받지 못했어요."]
+
+    for line in lines:
+        # 노벨피아 본문의 HTML 태그, 개체(&nbsp; 등)를 XHTML 에서 쓸 수 있는 글자로 정리
+        paragraph: str = unescape(tag_pattern.sub("", line)).strip()
+
+        if paragraph:
+            yield "<p>" + escape(paragraph) + "</p>\n"
+        else:
+            yield "<br/>\n"
+
+    yield "</body>\n</html>\n"
+
+
+def novel_to_opf(novel: Novel, chapter_count: int) -> str:
+    """소설 정보와 회차 수로 EPUB 패키지 문서(content.opf)를 만드는 함수
+
+    :param novel: 소설 정보가 담긴 Novel 인스턴스
+    :param chapter_count: 회차 수
+    :return: content.opf 문서
+    """
+    from datetime import datetime, timezone
+
+    # "\n  - "현대판타지"\n  - "하렘"" > ["현대판타지", "하렘"]
+    tags: list[str] = [tag.strip('" ') for tag in (novel.tags or "").split("\n  - ") if tag.strip('" ')]
+    # "> [!TLDR] 시놉시스\n> 괴담, ..." > "괴담, ..."
+    story: str = "\n".join(line.removeprefix("> ") for line in (novel.novel_story or "").splitlines()[1:])
+    modified: str = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    metadata: str = "".join([
+        f'    <dc:identifier id="book-id">urn:novelpia:{escape(novel.code)}</dc:identifier>\n',
+        f"    <dc:title>{escape(novel.title)}</dc:title>\n",
+        f"    <dc:creator>{escape(novel.writer_nick or '')}</dc:creator>\n",
+        "    <dc:language>ko</dc:language>\n",
+        f"    <dc:source>{escape(novel.url)}</dc:source>\n",
+        f"    <dc:description>{escape(story)}</dc:description>\n",
+        *(f"    <dc:subject>{escape(tag)}</dc:subject>\n" for tag in tags),
+        f'    <meta property="dcterms:modified">{modified}</meta>\n',
+    ])
+    manifest: str = "".join(
+        f'    <item id="c{i:05}" href="chapter/{i:05}.xhtml" media-type="application/xhtml+xml"/>\n'
+        for i in range(1, chapter_count + 1)
+    )
+    spine: str = "".join(f'    <itemref idref="c{i:05}"/>\n' for i in range(1, chapter_count + 1))
+
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="book-id">\n'
+        '  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">\n'
+        f"{metadata}"
+        "  </metadata>\n"
+        "  <manifest>\n"
+        '    <item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>\n'
+        f"{manifest}"
+        "  </manifest>\n"
+        "  <spine>\n"
+        f"{spine}"
+        "  </spine>\n"
+        "</package>\n"
+    )
+
+
+def titles_to_nav(novel_title: str, titles: list[str]) -> str:
+    """회차 제목 목록으로 EPUB 목차 문서(nav.xhtml)를 만드는 함수
+
+    :param novel_title: 소설 제목
+    :param titles: 회차 제목 목록
+    :return: nav.xhtml 문서
+    """
+    items: str = "".join(
+        f'      <li><a href="chapter/{i:05}.xhtml">{escape(title)}</a></li>\n'
+        for i, title in enumerate(titles, 1)
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" xml:lang="ko">\n'
+        f"<head><title>{escape(novel_title)}</title></head>\n"
+        '<body>\n  <nav epub:type="toc">\n    <ol>\n'
+        f"{items}"
+        "    </ol>\n  </nav>\n</body>\n</html>\n"
+    )
+
+
+def fetch_in_order(ep_refs: Iterable[tuple[str, str]], fetch: Callable[[str], list[str] | None], max_workers: int):
+    """회차 본문을 동시에 요청하되, 회차 순서대로 하나씩 반환하는 함수
+
+    한 번에 max_workers * 2 개까지만 요청해 두므로, 회차 수와 상관없이 메모리 사용량이 일정합니다.
+
+    :param ep_refs: (회차 번호, 제목) 목록 또는 제너레이터
+    :param fetch: 회차 번호를 받아 본문 줄별 목록을 반환하는 함수
+    :param max_workers: 동시 요청 수
+    :return: (회차 번호, 제목, 본문 줄별 목록) 제너레이터
+    """
+    window: deque[tuple[str, str, Future]] = deque()
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        for ep_code, title in ep_refs:
+            window.append((ep_code, title, executor.submit(fetch, ep_code)))
+
+            # 앞선 회차부터 차례로 반환
+            if len(window) >= max_workers * 2:
+                ep_code, title, future = window.popleft()
+                yield ep_code, title, future.result()
+
+        while window:
+            ep_code, title, future = window.popleft()
+            yield ep_code, title, future.result()
+
+
+def novel_to_epub(novel: Novel, ep_refs: Iterable[tuple[str, str]], file_path: Path,
+                  fetch: Callable[[str], list[str] | None] = None, max_workers: int = EPUB_MAX_WORKERS,
+                  on_fetched: Callable[[str, list[str] | None], object] = None) -> int:
+    """소설 정보와 회차 목록을 받아 회차 본문을 차례로 EPUB 파일에 쓰는 함수
+
+    :param novel: 소설 정보가 담긴 Novel 인스턴스
+    :param ep_refs: (회차 번호, 제목) 목록 또는 제너레이터
+    :param file_path: EPUB 파일 경로
+    :param fetch: 회차 번호를 받아 본문 줄별 목록을 반환하는 함수 (기본값 get_ep_content)
+    :param max_workers: 동시 요청 수
+    :param on_fetched: 본문을 받을 때마다 (회차 번호, 본문 줄별 목록) 으로 호출할 함수 (예: 검색 색인 갱신)
+    :return: 쓴 회차 수
+    :raise FileExistsError: 같은 이름의 파일이 이미 있을 때
+    """
+    from src.const.const import EPUB_CONTAINER_XML, EPUB_MIMETYPE
+
+    if fetch is None:
+        from src.viewer import get_ep_content
+
+        fetch = get_ep_content
+
+    titles: list[str] = []
+
+    if file_path.exists():
+        raise FileExistsError(file_path)
+
+    # 임시 파일에 다 쓴 뒤에 바꿔치기하므로, 받다가 실패해도 반쯤 쓴 파일이 남지 않음
+    with atomic_open(file_path, mode="wb") as f, ZipFile(f, "w", ZIP_DEFLATED) as zf:
+        # mimetype 은 압축 없이 맨 앞에
+        zf.writestr("mimetype", EPUB_MIMETYPE, ZIP_STORED)
+        zf.writestr("META-INF/container.xml", EPUB_CONTAINER_XML)
+
+        # 본문을 받는 대로 압축 파일에 바로 쓰기
+        for i, (ep_code, title, lines) in enumerate(fetch_in_order(ep_refs, fetch, max_workers), 1):
+            with zf.open(f"OEBPS/chapter/{i:05}.xhtml", "w") as chapter_f:
+                for chunk in chapter_to_xhtml(title, lines):
+                    chapter_f.write(chunk.encode("utf-8"))
+
+            if on_fetched is not None:
+                on_fetched(ep_code, lines)
+
+            titles.append(title)
+            print(f"[알림] {i}번째 회차 <{title}>를 썼어요.")
+
+        zf.writestr("OEBPS/nav.xhtml", titles_to_nav(novel.title, titles))
+        zf.writestr("OEBPS/content.opf", novel_to_opf(novel, len(titles)))
+
+    return len(titles)
+
+
+def epub_main() -> None:
+    """직접 실행할 때만 호출되는 메인 함수"""
+    from src.func.episode import get_ep_refs
+    from src.func.userIO import input_num
+    from src.novel_info import set_novel_from_likes
+
+    # 소설 번호 입력 받기
+    novel_code: str = str(input_num("소설 번호"))
+
+    # Novel 객체 생성
+    novels, count = set_novel_from_likes(1, novel_code)
+    novel: Novel = next(novels)
+
+    from src.func.common import assure_path_exists, get_env_var_w_error
+
+    with get_env_var_w_error("EPUB_DIR") as (env_epub_dir, err):
+        # 환경 변수 無
+        if err:
+            epub_dir = Path.cwd().joinpath("novel", "epub")
+        else:
+            epub_dir = Path(env_epub_dir)
+
+    hardened_title: str = novel.title.replace("/", "|")  # 제목의 "/"로 인한 폴더 생성 방지
+    file_path = Path(epub_dir, f"{novel.code.zfill(6)} - {hardened_title}.epub")
+
+    # 폴더 확보
+    assure_path_exists(file_path)
+
+    from src.func.store import get_store_path
+    from src.search import EpSearchIndex
+
+    try:
+        # 받은 본문은 검색 색인에도 넣음
+        with EpSearchIndex(get_store_path()) as ep_index:
+            ep_count: int = novel_to_epub(
+                novel, get_ep_refs(novel_code, True), file_path,
+                on_fetched=lambda ep_code, lines: ep_index.add_ep(novel_code, ep_code, lines),
+            )
+    except FileExistsError as fe:
+        print_under_new_line("[오류]", f"{fe = }")
+        print("[오류]", file_path, "파일이 이미 있어요.")
+    else:
+        print_under_new_line("[알림]", file_path, f"파일에 {ep_count}개 회차를 썼어요.")
+
+
+if __name__ == "__main__":
+    epub_main()
@@ -0,0 +1,206 @@
+"""크롤링한 소설 전체를 몇 개의 목록 문서와 CSV/JSON 파일로 모아 쓰는 코드
+
+소설마다 문서를 하나씩 두면 Obsidian (Dataview) 이 표를 그릴 때 파일 수천 개를 열어야 하므로,
+소설 CATALOG_SHARD_SIZE 개를 목록 문서 하나에 한 줄씩 (Dataview 인라인 필드) 넣고, 같은 내용을 CSV/JSON 으로도 씁니다.
+소설을 하나씩 받아서 바로 쓰므로 (목록 문서는 한 개 분량만 모음) 소설 수와 상관없이 메모리 사용량이 일정하고,
+모든 파일을 임시 파일에 쓴 뒤 마지막에 한꺼번에 바꿔치기하므로 Dataview 가 반쯤 쓴 목록을 읽지 않습니다.
+
+Dataview 에서는 아래처럼 읽을 수 있습니다.
+    TABLE WITHOUT ID L.제목, L.작가명, L["회차 수"] FROM "소설 목록" FLATTEN file.lists AS L WHERE L["연재 상태"] = "완결"
+    const novels = await dv.io.csv("소설 목록/novels.csv")
+"""
+import csv
+import json
+import re
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Iterable
+
+from .common import DIR_CACHE, UserMeta
+from .table import split_tags
+from .writer import atomic_open
+from ..const.const import (CATALOG_CSV_NAME, CATALOG_DIR_NAME, CATALOG_FIELDS, CATALOG_FORMATS, CATALOG_JSON_NAME,
+                           CATALOG_NOTE_PREFIX, CATALOG_SHARD_SIZE)
+from ..novel_info import Novel
+
+CATALOG_HEADERS: tuple[str, ...] = tuple(header for header, name in CATALOG_FIELDS)
+INLINE_FIELD_TABLE: dict[int, str] = str.maketrans({"[": "(", "]": ")", "\n": " "})  # 인라인 필드를 깨는 글자
+NOTE_NAME_PATTERN: re.Pattern = re.compile(re.escape(CATALOG_NOTE_PREFIX) + r" \d{3,}\.md")  # '소설 목록 1000.md' 도 포함
+
+
+def catalog_values(novel: Novel) -> list[Any]:
+    """Novel 객체를 CATALOG_FIELDS 순서의 값 목록으로 바꾸는 함수 (tags, 유형은 문자열 목록)
+
+    :param novel: 소설 정보가 담긴 Novel 인스턴스
+    :return: 값 목록
+    """
+    values: list[Any] = [getattr(novel, "_" + name, None) for header, name in CATALOG_FIELDS]
+
+    for i, (header, name) in enumerate(CATALOG_FIELDS):
+        if name == "tags":
+            values[i] = split_tags(values[i])
+        elif name == "types":
+            values[i] = sorted(values[i] or ())
+
+    return values
+
+
+def to_text(value: Any) -> str:
+    """목록 문서, CSV 에 쓸 문자열로 바꾸는 함수 (목록은 쉼표로 이음)"""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ", ".join(value)
+    return str(value)
+
+
+def catalog_line(values: list[Any]) -> str:
+    """목록 문서의 한 줄 ('- [제목:: 값] [작가명:: 값] ..') 을 만드는 함수"""
+    return "- " + " ".join(
+        f"[{header}:: {to_text(value).translate(INLINE_FIELD_TABLE)}]" for header, value in zip(CATALOG_HEADERS, values)
+    ) + "\n"
+
+
+def get_catalog_dir() -> Path:
+    """목록 폴더 경로를 반환하는 함수 (Markdown 폴더 옆의 CATALOG_DIR_NAME 폴더)"""
+    from ..novel_info import get_md_dir
+
+    return Path(get_md_dir().parent, CATALOG_DIR_NAME)
+
+
+class CatalogWriter(metaclass=UserMeta):
+    """소설을 하나씩 받아서 목록 문서, CSV, JSON 파일에 쓰는 클래스.
+
+    with 문을 벗어나거나 close() 를 부르면 파일들을 바꿔치기하고, 전보다 줄어든 목록 문서는 지웁니다.
+    with 문 안에서 예외가 나면 목록 문서, CSV, JSON 파일 모두 기존 것을 그대로 둡니다.
+
+    :var out_dir: 목록 폴더 경로
+    :var shard_size: 목록 문서 하나에 넣는 소설 수
+    :var formats: 쓸 형식 (CATALOG_FORMATS 中)
+    :var count: 쓴 소설 수
+    :var note_paths: 쓴 목록 문서 경로
+    """
+    __slots__ = (
+        "out_dir",
+        "shard_size",
+        "formats",
+        "count",
+        "note_paths",
+        "_lines",
+        "_stack",
+        "_csv_writer",
+        "_json_file",
+    )
+
+    def __init__(self, out_dir: Path, shard_size: int = CATALOG_SHARD_SIZE, formats: Iterable[str] = CATALOG_FORMATS):
+        self.out_dir = Path(out_dir)
+        self.shard_size: int = shard_size
+        self.formats: frozenset[str] = frozenset(formats)
+        self.count: int = 0
+        self.note_paths: list[Path] = []
+
+        unknown: frozenset[str] = self.formats - frozenset(CATALOG_FORMATS)
+        if unknown:
+            raise ValueError(f"형식은 {CATALOG_FORMATS} 中에서 골라야 해요: {sorted(unknown)}")
+
+        DIR_CACHE.ensure(self.out_dir)
+        self._lines: list[str] = []
+        self._stack = ExitStack()
+        self._csv_writer = None
+        self._json_file = None
+
+        if "csv" in self.formats:
+            csv_file = self._stack.enter_context(atomic_open(Path(self.out_dir, CATALOG_CSV_NAME), newline=""))
+            self._csv_writer = csv.writer(csv_file)
+            self._csv_writer.writerow(CATALOG_HEADERS)
+
+        if "json" in self.formats:
+            self._json_file = self._stack.enter_context(atomic_open(Path(self.out_dir, CATALOG_JSON_NAME)))
+            self._json_file.write("[")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._stack.__exit__(exc_type, exc_val, exc_tb)
+
+    def write(self, novel: Novel) -> None:
+        """소설 하나를 모든 형식에 쓰는 함수"""
+        values: list[Any] = catalog_values(novel)
+
+        if self._csv_writer is not None:
+            self._csv_writer.writerow([to_text(value) for value in values])
+
+        if self._json_file is not None:
+            self._json_file.write(",\n" if self.count else "\n")
+            self._json_file.write(json.dumps(dict(zip(CATALOG_HEADERS, values)), ensure_ascii=False))
+
+        if "md" in self.formats:
+            self._lines.append(catalog_line(values))
+            if len(self._lines) >= self.shard_size:
+                self._write_note()
+
+        self.count += 1
+
+    def write_all(self, novels: Iterable[Novel]) -> int:
+        """소설 여러 개를 차례로 쓰는 함수
+
+        :param novels: Novel 객체 목록 또는 제너레이터
+        :return: 지금까지 쓴 소설 수
+        """
+        for novel in novels:
+            self.write(novel)
+
+        return self.count
+
+    def close(self) -> None:
+        """남은 목록 문서를 쓰고, 파일들을 바꿔치기하는 함수"""
+        if "md" in self.formats and (self._lines or not self.note_paths):
+            self._write_note()
+
+        if self._json_file is not None:
+            self._json_file.write("\n]\n")
+
+        self._stack.close()
+
+        if "md" in self.formats:
+            self._remove_stale_notes()
+
+    def _write_note(self) -> None:
+        number: int = len(self.note_paths) + 1
+        note_path = Path(self.out_dir, f"{CATALOG_NOTE_PREFIX} {number:03d}.md")
+        front: str = f"---\n목록 번호: {number}\n소설 수: {len(self._lines)}\n---\n"
+
+        # CSV, JSON 처럼 close() 때 한꺼번에 바꿔치기 (목록 문서마다 임시 파일이 하나씩 열려 있음)
+        note_file = self._stack.enter_context(atomic_open(note_path))
+        note_file.write(front + "".join(self._lines))
+        self.note_paths.append(note_path)
+        self._lines.clear()
+
+    def _remove_stale_notes(self) -> None:
+        # 지난번보다 소설이 줄어서 남은 목록 문서
+        written: set[Path] = set(self.note_paths)
+        for note_path in self.out_dir.glob(f"{CATALOG_NOTE_PREFIX} *.md"):
+            if note_path not in written and NOTE_NAME_PATTERN.fullmatch(note_path.name):
+                note_path.unlink()
+
+
+def catalog_main() -> None:
+    """직접 실행할 때만 호출되는 메인 함수 (DB 의 소설 전체로 목록을 다시 씀)"""
+    from .store import NovelStore, get_store_path
+    from .userIO import print_under_new_line
+
+    out_dir: Path = get_catalog_dir()
+
+    with NovelStore(get_store_path()) as store, CatalogWriter(out_dir) as catalog:
+        catalog.write_all(store.iter_novels())
+
+    print_under_new_line(f"[알림] 소설 {catalog.count}개를 {out_dir} 에 목록 문서 {len(catalog.note_paths)}개와 "
+                         f"{CATALOG_CSV_NAME}, {CATALOG_JSON_NAME} 로 썼어요.")
+
+
+if __name__ == "__main__":
+    catalog_main()
@@ -4,6 +4,7 @@
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import Iterable
 
 from multipledispatch import dispatch
 
@@ -177,23 +178,11 @@ class Page(metaclass=UserMeta):
 
     @url.setter
     def url(self, url: str):
-        from requests import get, Response
-        from ..const.const import BASIC_HEADERS
-
-        res: Response = get(url, headers=BASIC_HEADERS)
-
-        try:
-            domain: str = res.headers.get("Access-Control-Allow-Origin")
-        except KeyError as ke:
-            print_under_new_line("[오류]", f"{ke = }")
-            print(f"{type(self)}.url을 {url}(으)로 바꿀 수 없어요.")
+        if is_novelpia_url(url):
+            self._url = url
         else:
-            from ..const.const import HOST
-
-            if domain == HOST:
-                self._url = url
-            else:
-                print(f"{type(self)}.url을 {url}(으)로 바꿀 수 없어요.")
+            print_under_new_line(f"{type(self)}.url을 {url}(으)로 바꿀 수 없어요.")
+            print("노벨피아 주소를 입력해 주세요.")
 
     @property
     def ctime(self) -> str:
@@ -291,6 +280,70 @@ class Page(metaclass=UserMeta):
         self.set_signed_int("_count_view", count_view)
 
 
+def is_novelpia_url(url: str) -> bool:
+    """URL 이 노벨피아 주소의 형식인지 요청 없이 검사하는 함수
+
+    >>> is_novelpia_url("https://novelpia.com/novel/247416")
+    True
+    >>> is_novelpia_url("https://example.com/novel/247416")
+    False
+
+    :param url: 검사할 URL
+    :return: 형식이 올바르면 참, 그렇지 않으면 거짓
+    """
+    from urllib.parse import urlsplit
+    from ..const.const import HOST
+
+    if not isinstance(url, str):
+        return False
+
+    host = urlsplit(HOST)
+    parts = urlsplit(url)
+
+    return (parts.scheme, parts.netloc) == (host.scheme, host.netloc) and parts.path not in ("", "/")
+
+
+URL_REACHABLE_CACHE: dict[str, bool] = {}  # URL > 접속 가능 여부 (chk_urls_reachable 용)
+
+
+def chk_urls_reachable(urls: Iterable[str], max_workers: int = 8) -> dict[str, bool]:
+    """URL 들에 한꺼번에 접속해 보고 노벨피아가 응답하는지 반환하는 함수. 한 번 확인한 URL 은 다시 요청하지 않음
+    (요청 오류가 난 URL 은 기억하지 않으므로 다음 호출 때 다시 확인)
+
+    :param urls: 확인할 URL 목록
+    :param max_workers: 동시 요청 수
+    :return: URL > 접속 가능 여부
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    def chk_url_reachable(url: str) -> bool | None:
+        """URL 하나에 접속하여 노벨피아의 응답인지 확인하는 함수 (요청 오류가 나면 None)"""
+        from requests import get
+        from requests.exceptions import RequestException
+        from ..const.const import BASIC_HEADERS, HOST
+
+        try:
+            # 본문은 받지 않고 헤더만 확인
+            with get(url, headers=BASIC_HEADERS, stream=True) as res:
+                return res.ok and res.headers.get("Access-Control-Allow-Origin") == HOST
+        except RequestException as req_err:
+            print_under_new_line("[오류]", f"{req_err = }")
+            return None
+
+    urls = list(dict.fromkeys(urls))
+    new_urls: list[str] = [url for url in urls if url not in URL_REACHABLE_CACHE and is_novelpia_url(url)]
+
+    if new_urls:
+        with ThreadPoolExecutor(max_workers) as executor:
+            # 일시적인 오류로 실패한 URL 은 기억하지 않음
+            URL_REACHABLE_CACHE.update(
+                (url, reachable) for url, reachable in zip(new_urls, executor.map(chk_url_reachable, new_urls))
+                if reachable is not None
+            )
+
+    return {url: URL_REACHABLE_CACHE.get(url, False) for url in urls}
+
+
 @contextmanager
 def get_env_var_w_error(env_var_name: str):
     """입력받은 이름의 환경 변수를 찾고 값과 오류를 반환하는 제너레이터 함수
@@ -348,28 +401,62 @@ def add_npd_cookie(headers: dict[str: str]) -> tuple[str, dict]:
     return cookie, headers
 
 
-def assure_path_exists(path_to_assure: Path) -> None:
-    """파일/폴더의 상위 폴더가 다 있으면 넘어가고 없으면 만드는 함수.
+class DirCache(metaclass=UserMeta):
+    """이미 확보한 폴더를 기억하여, 같은 폴더의 파일을 여러 개 쓸 때 stat 시스템 호출을 반복하지 않는 클래스.
 
-    :param path_to_assure: 상위 폴더를 확보할 파일/폴더의 경로
+    확보한 뒤에 지워진 폴더는 forget() 으로 잊게 해야 다시 만듭니다.
+
+    :var ensured: 확보한 폴더 경로 집합
     """
-    parent_paths: [Path] = path_to_assure.parents
-    for i, parent_path in enumerate(parent_paths):
+    __slots__ = (
+        "ensured",
+    )
+
+    def __init__(self):
+        self.ensured: set[Path] = set()
+
+    def __contains__(self, dir_path: Path) -> bool:
+        return dir_path in self.ensured
 
-        # 상위 폴더 유무 확인
-        if parent_path.exists():
-            print()
+    def ensure(self, dir_path: Path, verbose: bool = False) -> bool:
+        """폴더를 처음 보면 (상위 폴더까지 한 번에) 만들고 기억하는 함수
 
-            # 상위 폴더 有, 작업 불필요
-            if i == 0:
-                print("[알림]", parent_path, "폴더가 이미 있으니 그대로 쓸게요.")
+        :param dir_path: 확보할 폴더 경로
+        :param verbose: 폴더를 새로 만들었을 때 알릴 지 여부
+        :return: 폴더를 새로 만들었는지 여부
+        """
+        if dir_path in self.ensured:
+            return False
+
+        created: bool = not dir_path.is_dir()
+        if created:
+            dir_path.mkdir(parents=True, exist_ok=True)
+            if verbose:
+                print_under_new_line("[알림]", dir_path, "폴더를 생성했어요.")
+
+        self.ensured.add(dir_path)
+        return created
+
+    def forget(self, dir_path: Path = None) -> None:
+        """기억한 폴더를 (dir_path 를 주지 않으면 모두) 잊는 함수"""
+        if dir_path is None:
+            self.ensured.clear()
+        else:
+            self.ensured.discard(dir_path)
 
-            # 상위 폴더 有, 재귀(?)적으로 하위 폴더 생성
-            for j in range(i):
-                child_path: Path = parent_paths[range(i)[i - 1 - j]]
-                child_path.mkdir()
-                print("[알림]", child_path, "폴더를 생성했어요.")
-            break
+
+DIR_CACHE = DirCache()  # 프로세스 전체에서 같이 쓰는 폴더 캐시
+
+
+def assure_path_exists(path_to_assure: Path, verbose: bool = False) -> None:
+    """파일/폴더의 상위 폴더가 다 있으면 넘어가고 없으면 만드는 함수.
+
+    한 번 확보한 폴더는 DIR_CACHE 에 기억하므로 다시 확인하지 않습니다.
+
+    :param path_to_assure: 상위 폴더를 확보할 파일/폴더의 경로
+    :param verbose: 폴더를 새로 만들었을 때 알릴 지 여부
+    """
+    DIR_CACHE.ensure(path_to_assure.parent, verbose)
 
 
 def extract_err_msg(err_group: ExceptionGroup) -> str:
@@ -514,7 +601,8 @@ def parse_alert_msg_w_error(html: str):
 
 
 @contextmanager
-def opened_x_error(file_path: Path, mode: str = "xt", encoding: str = "utf-8", skip: bool = False, overwrite: bool = False):
+def opened_x_error(file_path: Path, mode: str = "xt", encoding: str = "utf-8", skip: bool = False, overwrite: bool = False,
+                   buffering: int = -1):
     """입력받은 대로 파일을 열고 파일과 오류 내역을 반환하는 함수
 
     :param file_path: 파일 경로
@@ -522,12 +610,20 @@ def opened_x_error(file_path: Path, mode: str = "xt", encoding: str = "utf-8", s
     :param encoding: 파일의 인코딩 (기본 UTF-8)
     :param skip: 동명의 파일 존재 시 건너뛸 지 여부
     :param overwrite: 덮어 쓰기 여부
+    :param buffering: 쓰기 버퍼 크기 (기본값 -1은 시스템 기본 크기)
     """
     assert mode.find("b") == -1
     assure_path_exists(file_path)
 
     try:
-        f = open(file_path, mode, encoding='utf-8')
+        try:
+            f = open(file_path, mode, buffering, encoding)
+
+        # 기억해 둔 폴더가 그 사이에 지워졌으면 다시 만듦
+        except FileNotFoundError:
+            DIR_CACHE.forget(file_path.parent)
+            assure_path_exists(file_path)
+            f = open(file_path, mode, buffering, encoding)
 
     # 기존 파일을 "xt" 모드로 열었음
     except FileExistsError as fe:
@@ -548,7 +644,7 @@ def opened_x_error(file_path: Path, mode: str = "xt", encoding: str = "utf-8", s
         # 덮어 쓰기
         if overwrite or (asked_overwrite and can_overwrite):
             print_under_new_line("[알림]", file_path, "파일에 덮어 쓸게요.")  # 기존 파일 有, 덮어쓰기
-            with opened_x_error(file_path, "wt", encoding, True, True) as (f, fe_in):
+            with opened_x_error(file_path, "wt", encoding, True, True, buffering) as (f, fe_in):
                 yield f, fe_in
 
         # 기존 파일 유지
@@ -0,0 +1,196 @@
+"""크롤링한 소설, 회차 정보를 Parquet 데이터셋으로 내보내는 코드
+
+DuckDB, pandas 등에서 아래처럼 읽을 수 있습니다.
+    SELECT * FROM read_parquet('dataset/novel/*/*.parquet', hive_partitioning = true)
+"""
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Iterable
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .common import UserMeta, assure_path_exists
+from .episode import Ep
+from .table import NOVEL_DATE_FIELDS, NOVEL_FIELDS, NOVEL_LIST_FIELDS, NOVEL_STR_FIELDS, split_tags, to_int
+from ..const.const import DATASET_ROW_GROUP_SIZE
+from ..novel_info import Novel
+
+
+def field_type(name: str) -> pa.DataType:
+    """Novel 필드 이름에 맞는 Arrow 자료형을 반환하는 함수"""
+    if name in NOVEL_STR_FIELDS:
+        return pa.string()
+    if name in NOVEL_DATE_FIELDS:
+        return pa.timestamp("s")
+    if name in NOVEL_LIST_FIELDS:
+        return pa.list_(pa.string())
+    return pa.int64()
+
+
+NOVEL_SCHEMA = pa.schema([(name, field_type(name)) for name in NOVEL_FIELDS])
+
+EP_SCHEMA = pa.schema([
+    ("novel_code", pa.int64()),
+    ("code", pa.int64()),
+    ("title", pa.string()),
+    ("url", pa.string()),
+    ("num", pa.string()),  # 'BONUS' 회차가 있어서 문자열
+    ("types", pa.list_(pa.string())),
+    ("letter", pa.int64()),
+    ("comment", pa.int64()),
+    ("count_view", pa.int64()),
+    ("count_good", pa.int64()),
+    ("ctime", pa.timestamp("s")),
+])
+
+
+def to_datetime(value: str | None) -> datetime | None:
+    """ISO 8601 날짜 문자열을 datetime 으로 바꾸는 함수 (기본값 '0000-00-00T00:00' 등은 None)"""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def novel_to_row(novel: Novel) -> dict[str, Any]:
+    """Novel 객체를 Parquet 행 Dict 로 바꾸는 함수
+
+    :param novel: 소설 정보가 담긴 Novel 인스턴스
+    :return: 필드 이름 > 값
+    """
+    row: dict[str, Any] = {}
+
+    for name in NOVEL_FIELDS:
+        value = getattr(novel, "_" + name, None)
+
+        if name == "tags":
+            row[name] = split_tags(value)
+        elif name == "types":
+            row[name] = sorted(value or ())
+        elif name in NOVEL_DATE_FIELDS:
+            row[name] = to_datetime(value)
+        elif name in NOVEL_STR_FIELDS:
+            row[name] = value
+        else:
+            row[name] = to_int(value, None)
+
+    return row
+
+
+def ep_to_row(ep: Ep, novel_code: str | int) -> dict[str, Any]:
+    """Ep 객체를 Parquet 행 Dict 로 바꾸는 함수
+
+    :param ep: Ep 클래스 객체
+    :param novel_code: 회차가 속한 소설 번호
+    :return: 필드 이름 > 값
+    """
+    return {
+        "novel_code": to_int(novel_code, None),
+        "code": to_int(ep.code, None),
+        "title": ep.title,
+        "url": ep.url,
+        "num": str(ep.num),
+        "types": sorted(ep.types),
+        "letter": to_int(ep.letter, None),
+        "comment": to_int(ep.comment, None),
+        "count_view": to_int(ep.count_view, None),
+        "count_good": to_int(ep.count_good, None),
+        "ctime": to_datetime(ep.ctime),
+    }
+
+
+class ParquetRowWriter(metaclass=UserMeta):
+    """행을 모아 두었다가 row_group_size 개마다 Parquet 파일에 row group 으로 쓰는 클래스.
+
+    :var file_path: 파일 경로 ({root}/{name}/crawl_date=YYYY-MM-DD/part-HHMMSS.parquet)
+    :var schema: Arrow 스키마
+    :var row_group_size: row group 하나의 행 수
+    """
+    __slots__ = (
+        "file_path",
+        "schema",
+        "row_group_size",
+        "_rows",
+        "_writer",
+        "row_count",
+    )
+
+    def __init__(self, root: Path, name: str, schema: pa.Schema, crawl_date: date = None,
+                 row_group_size: int = DATASET_ROW_GROUP_SIZE):
+        now: datetime = datetime.now()
+        crawl_date = crawl_date or now.date()
+
+        self.file_path = Path(root, name, f"crawl_date={crawl_date.isoformat()}", f"part-{now:%H%M%S%f}.parquet")
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self._rows: list[dict] = []
+        self._writer: pq.ParquetWriter | None = None
+        self.row_count: int = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write(self, row: dict[str, Any]) -> None:
+        """행 하나를 추가하는 함수. row_group_size 개가 모이면 파일에 씀"""
+        self._rows.append(row)
+
+        if len(self._rows) >= self.row_group_size:
+            self.flush()
+
+    def write_many(self, rows: Iterable[dict[str, Any]]) -> None:
+        """행 여러 개를 차례로 추가하는 함수"""
+        for row in rows:
+            self.write(row)
+
+    def flush(self) -> None:
+        """모아 둔 행을 row group 하나로 파일에 쓰는 함수"""
+        if not self._rows:
+            return
+
+        if self._writer is None:
+            assure_path_exists(self.file_path)
+            self._writer = pq.ParquetWriter(self.file_path, self.schema, compression="zstd")
+
+        self._writer.write_table(pa.Table.from_pylist(self._rows, self.schema))
+        self.row_count += len(self._rows)
+        self._rows.clear()
+
+    def close(self) -> None:
+        """남은 행을 쓰고 파일을 닫는 함수"""
+        self.flush()
+
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def novels_to_parquet(novels: Iterable[Novel], root: Path, crawl_date: date = None) -> Path:
+    """Novel 객체들을 {root}/novel/crawl_date=.../ 아래 Parquet 파일로 쓰는 함수
+
+    :param novels: Novel 객체 목록 또는 제너레이터
+    :param root: 데이터셋 폴더
+    :param crawl_date: 크롤링 일자 (기본값 오늘)
+    :return: Parquet 파일 경로
+    """
+    with ParquetRowWriter(root, "novel", NOVEL_SCHEMA, crawl_date) as writer:
+        writer.write_many(novel_to_row(novel) for novel in novels)
+
+    return writer.file_path
+
+
+def eps_to_parquet(eps: Iterable[tuple[str | int, Ep]], root: Path, crawl_date: date = None) -> Path:
+    """(소설 번호, Ep 객체) 쌍들을 {root}/episode/crawl_date=.../ 아래 Parquet 파일로 쓰는 함수
+
+    :param eps: (소설 번호, Ep 객체) 목록 또는 제너레이터
+    :param root: 데이터셋 폴더
+    :param crawl_date: 크롤링 일자 (기본값 오늘)
+    :return: Parquet 파일 경로
+    """
+    with ParquetRowWriter(root, "episode", EP_SCHEMA, crawl_date) as writer:
+        writer.write_many(ep_to_row(ep, novel_code) for novel_code, ep in eps)
+
+    return writer.file_path
@@ -0,0 +1,151 @@
+"""가장 최근에 등록된 소설 번호를 지수 탐색과 이진 탐색으로 찾는 코드
+
+소설 번호는 등록 순으로 늘어나므로, 알려진 번호에서 보폭을 두 배씩 늘리며 살아 있는 번호를 찾고
+처음으로 죽은 구간과의 사이를 이진 탐색하면 요청 수십 번 안에 최신 번호가 나옵니다.
+잘못된 번호 (404) 가 중간중간 섞여 있으므로, DISCOVERY_GAP_WINDOW 개가 연달아 잘못된 번호일 때만 끝으로 봅니다.
+"""
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable
+from urllib.parse import urljoin
+
+from .common import UserMeta
+from .liveness import INVALID, LivenessMap, novel_to_state
+from .store import get_store_path
+from ..const.const import (ALL_NOVEL_COUNT, DISCOVERY_FILE_NAME, DISCOVERY_FIRST_STEP, DISCOVERY_GAP_WINDOW,
+                           DISCOVERY_MAX_AGE_HOURS, HOST)
+
+# 소설 번호 > 생존 상태 (liveness 의 UNKNOWN, LIVE, DELETED, DRAFT, INVALID 中 1)
+StateProbe = Callable[[int], int]
+
+
+def get_discovery_path() -> Path:
+    """최신 소설 번호 파일 경로를 반환하는 함수 (DB 파일과 같은 폴더)"""
+    return get_store_path().with_name(DISCOVERY_FILE_NAME)
+
+
+def fetch_state(novel_code: int) -> int:
+    """소설 메인 페이지를 요청하여 생존 상태를 반환하는 함수
+
+    :param novel_code: 소설 번호
+    :return: 생존 상태
+    """
+    from .common import get_novel_main_w_error
+    from ..novel_info import Novel, chk_novel_up_status
+
+    with get_novel_main_w_error(urljoin(HOST + "/novel/", str(novel_code))) as (html, err):
+        if err:
+            raise err
+
+    novel = Novel()
+    novel.code = str(novel_code)
+
+    with chk_novel_up_status(novel, html) as (novel, info_soup, err):
+        return novel_to_state(novel)
+
+
+class MaxCodeFinder(metaclass=UserMeta):
+    """살아 있는 번호를 찾으며 요청 결과를 기억해 두는 클래스 (같은 번호를 두 번 요청하지 않음)
+
+    :var probe: 소설 번호 > 생존 상태
+    :var window: 이만큼 연달아 잘못된 번호여야 끝으로 봄
+    :var states: 소설 번호 > 요청한 생존 상태
+    """
+    __slots__ = (
+        "probe",
+        "window",
+        "states",
+    )
+
+    def __init__(self, probe: StateProbe = fetch_state, window: int = DISCOVERY_GAP_WINDOW):
+        self.probe = probe
+        self.window = window
+        self.states: dict[int, int] = {}
+
+    def state(self, code: int) -> int:
+        """소설 번호의 생존 상태 (처음 묻는 번호만 요청)"""
+        if code not in self.states:
+            self.states[code] = self.probe(code)
+        return self.states[code]
+
+    def alive_from(self, code: int) -> int | None:
+        """code ~ code + window - 1 中 처음으로 살아 있는 (잘못된 번호가 아닌) 번호, 없으면 None"""
+        return next((i for i in range(code, code + self.window) if self.state(i) != INVALID), None)
+
+    def find(self, start: int = ALL_NOVEL_COUNT, first_step: int = DISCOVERY_FIRST_STEP) -> int:
+        """start 근처에서 출발하여 가장 큰 살아 있는 소설 번호를 찾는 함수
+
+        :param start: 살아 있으리라 짐작하는 번호 (이전에 찾은 최신 번호 등)
+        :param first_step: 지수 탐색의 첫 보폭
+        :return: 가장 큰 살아 있는 소설 번호 (하나도 없으면 0)
+        """
+        start = max(1, start)
+
+        # 출발점이 죽어 있으면 (번호를 너무 크게 짐작함) 1 부터 다시 찾음
+        if self.alive_from(start) is None:
+            if start == 1:
+                return 0
+            low, high = 1, start
+            if self.alive_from(low) is None:
+                return 0
+        else:
+            # 지수 탐색: 죽은 구간이 나올 때까지 보폭을 두 배씩
+            low, step = start, first_step
+            while self.alive_from(low + step) is not None:
+                low += step
+                step *= 2
+            high = low + step
+
+        # 이진 탐색: low 부터는 살아 있는 번호가 있고, high 부터는 window 개가 연달아 죽어 있음
+        while high - low > 1:
+            mid: int = (low + high) // 2
+            if self.alive_from(mid) is not None:
+                low = mid
+            else:
+                high = mid
+
+        # low ~ low + window - 1 中 가장 큰 살아 있는 번호
+        return max(i for i in range(low, low + self.window) if self.state(i) != INVALID)
+
+
+def read_max_code(file_path: Path = None) -> tuple[int, datetime] | None:
+    """저장해 둔 (최신 소설 번호, 찾은 시각) 을 반환하는 함수 (없으면 None)"""
+    file_path = Path(file_path or get_discovery_path())
+    if not file_path.exists():
+        return None
+
+    dic: dict = json.loads(file_path.read_text(encoding="utf-8"))
+    return dic["max_code"], datetime.fromisoformat(dic["found_at"])
+
+
+def get_max_code(probe: StateProbe = fetch_state, max_age: timedelta = timedelta(hours=DISCOVERY_MAX_AGE_HOURS),
+                 file_path: Path = None, liveness: LivenessMap = None, now: datetime = None) -> int:
+    """최신 소설 번호를 반환하는 함수. 저장해 둔 값이 max_age 보다 오래됐으면 다시 찾아서 저장함
+
+    :param probe: 소설 번호 > 생존 상태 (기본값은 실제 요청)
+    :param max_age: 저장해 둔 값을 그대로 쓸 기간
+    :param file_path: 저장 파일 경로 (기본값 get_discovery_path())
+    :param liveness: 주면 탐색 中 요청한 번호의 생존 상태를 기록함
+    :param now: 현재 시각 (기본값 지금)
+    :return: 최신 소설 번호
+    """
+    file_path = Path(file_path or get_discovery_path())
+    now = now or datetime.now()
+
+    cached: tuple[int, datetime] | None = read_max_code(file_path)
+    if cached and now - cached[1] < max_age:
+        return cached[0]
+
+    finder = MaxCodeFinder(probe)
+    max_code: int = finder.find(cached[0] if cached else ALL_NOVEL_COUNT)
+
+    if liveness is not None:
+        for code, state in finder.states.items():
+            liveness.mark(code, state, now.date())
+
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    dic: dict = {"max_code": max_code, "found_at": now.isoformat(timespec="seconds"), "probes": len(finder.states)}
+    file_path.write_text(json.dumps(dic), encoding="utf-8")
+
+    return max_code
@@ -2,7 +2,8 @@
 
 """
 from datetime import datetime
-from typing import Generator
+from pathlib import Path
+from typing import Generator, Iterable
 from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup
@@ -10,7 +11,7 @@ from bs4.element import ResultSet, Tag
 from bs4.filter import SoupStrainer
 from requests import post
 
-from src.const.const import DEFAULT_TIME, EP_TYPES_NAMED_TUPLE, HOST
+from src.const.const import DEFAULT_TIME, EP_TYPES_NAMED_TUPLE, HOST, HTML_CSS_FILE_NAME
 from src.func.common import PARSER, Page
 from src.func.userIO import print_under_new_line
 
@@ -514,6 +515,47 @@ def extract_ep_info(list_html: str, ep_no: int = 1):
     return ep
 
 
+def get_ep_refs(novel_code: str, plus_login: bool = False):
+    """소설의 회차 목록을 첫 화부터 한 페이지씩 요청하여 회차 번호와 제목을 하나씩 반환하는 함수
+
+    :param novel_code: 소설 번호
+    :param plus_login: 로그인 키 사용 여부
+    :return: (회차 번호, 제목) 제너레이터
+    """
+    from src.const.selector import EP_TABLE_CSS, EP_TAGS_CSS, EP_VIEW_COUNT_CSS, EP_VIEW_CSS
+
+    only_ep = SoupStrainer("table", {"class": EP_TABLE_CSS})
+    page: int = 1
+
+    while True:
+        list_html: str = get_ep_list(novel_code, "DOWN", page, plus_login)
+        soup = BeautifulSoup(list_html, PARSER, parse_only=only_ep)
+        ep_tags: ResultSet[Tag] = soup.select(EP_TAGS_CSS)
+
+        # 마지막 페이지 다음
+        if not ep_tags:
+            return
+
+        for ep_tag in ep_tags:
+            title: str = ep_tag.select_one("b i").next.text.strip()
+
+            # <span class="episode_count_view novel_count_view_7146">0</span>
+            view_tag: Tag | None = ep_tag.select_one(EP_VIEW_COUNT_CSS)
+
+            if view_tag is not None:
+                ep_code: str = view_tag.attrs["class"][1].removeprefix("novel_count_view_")
+
+            # 예약 회차, onclick 속성에서 추출
+            else:
+                click: str = ep_tag.select_one(EP_VIEW_CSS).attrs["onclick"]  # "location = '/viewer/3790123';"
+                start_index: int = click.find("viewer") + len("viewer") + 1
+                ep_code: str = click[start_index: -2]
+
+            yield ep_code, title
+
+        page += 1
+
+
 def has_prologue(novel_code: str) -> bool:
     """소설의 회차 목록에서 프롤로그의 유무를 반환하는 함수.
 
@@ -557,29 +599,80 @@ def ep_content_to_md(ep: Ep, ep_lines: list[str]):
     yield from md_lines
 
 
-def ep_content_to_html(ep: Ep, lines: list[str]):
-    """회차 제목과 본문을 입력받아 HTML 문서 제너레이터를 반환하는 함수
+def ep_content_to_html(ep: Ep, lines: Iterable[str], css_href: str = HTML_CSS_FILE_NAME):
+    """회차 정보와 본문을 입력받아 HTML 문서 제너레이터를 반환하는 함수
+
+    :param ep: Ep 클래스 객체
+    :param lines: 회차 본문 줄 (목록 또는 제너레이터)
+    :param css_href: 공용 스타일 시트의 상대 경로
+    :return: HTML 문서를 한 조각씩 반환하는 제너레이터
+    """
+    yield html_head(ep.title, css_href)
+    yield from ep_to_html_article(ep, lines)
+    yield "\t</body>\n</html>\n"
+
+
+def html_head(title: str, css_href: str) -> str:
+    """HTML 문서의 머리말을 반환하는 함수
+
+    :param title: 문서 제목
+    :param css_href: 공용 스타일 시트의 상대 경로
+    :return: <html>부터 <body>까지의 HTML 문자열
+    """
+    from html import escape
+
+    return (
+        "<!DOCTYPE html>\n"
+        '<html lang="ko">\n'
+        "\t<head>\n"
+        '\t\t<meta charset="utf-8">\n'
+        f"\t\t<title>{escape(title)}</title>\n"
+        f'\t\t<link rel="stylesheet" href="{escape(css_href)}">\n'
+        "\t</head>\n"
+        "\t<body>\n"
+    )
+
+
+def ep_to_html_article(ep: Ep, lines: Iterable[str]):
+    """회차 하나를 <article> 요소로 변환하여 한 문단씩 반환하는 함수
 
     :param ep: Ep 클래스 객체
-    :param lines: 회차 본문 줄 목록
-    :return: HTML 문서를 한 줄씩 반환하는 제너레이터
+    :param lines: 회차 본문 줄 (목록 또는 제너레이터)
+    :return: HTML 문단을 하나씩 반환하는 제너레이터
     """
-    print(ep)
-    contents: list[str] = []
-    # style_attr: str = '\"font-size: 18px; line-height: 125%; max-width: 900px; margin: 0px auto;\"'
-    # '<div style=' + style_attr + '>\n'
+    from html import escape
 
-    tabs: str = "\t\t\t\t"
+    yield f"\t\t<article>\n\t\t\t<h1>{escape(ep.title)}</h1>\n"
+
+    tabs: str = "\t\t\t"
     line_break: str = tabs + "<br>\n"
 
-    # 본문 HTML 조립
+    # 본문을 한 줄씩 HTML 문단으로 변환 (get_ep_content 는 빈 줄을 "\n"으로 반환)
     for line in lines:
-        if line == "&nbsp;\n":
-            contents.append(line_break)
+        paragraph: str = line.strip()
+
+        if not paragraph or paragraph == "&nbsp;":
+            yield line_break
         else:
-            paragraph: str = tabs + "<p>" + line.rstrip() + "</p>\n"
-            contents.append(paragraph)
+            yield tabs + "<p>" + paragraph + "</p>\n"
+
+    yield "\t\t</article>\n"
+
+
+def write_html_css(dir_path: Path) -> Path:
+    """HTML 문서들이 함께 쓰는 스타일 시트를 폴더에 한 번만 쓰는 함수
+
+    :param dir_path: 스타일 시트를 쓸 폴더
+    :return: 스타일 시트 경로
+    """
+    from src.const.const import HTML_CSS
+    from src.func.common import opened_x_error
+
+    css_path = Path(dir_path, HTML_CSS_FILE_NAME)
 
-    # css_file_path = Path.cwd().joinpath("html/style.css")
+    # 이미 있으면 건너뛰기
+    with opened_x_error(css_path, "xt", skip=True) as (f, err):
+        if not err:
+            f.write(HTML_CSS)
 
-    yield from contents
+    return css_path
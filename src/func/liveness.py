@@ -0,0 +1,203 @@
+"""소설 번호마다 생존 상태와 마지막 확인 시점을 1 바이트씩 기록해 두는 코드
+
+한 바이트의 하위 3 비트는 상태 (모름, 정상, 삭제, 연습작품, 잘못된 번호), 상위 5 비트는 확인 시점 (에포크) 입니다.
+에포크는 기준일부터 LIVENESS_EPOCH_DAYS 일 단위로 센 값이고, 31 을 넘으면 기준일을 앞으로 옮깁니다.
+소설 30만 개면 300 KB 이고, 같은 상태가 이어지는 구간이 많아 zlib 으로 저장하면 그보다 훨씬 작아집니다.
+"""
+import struct
+import zlib
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from .common import UserMeta
+from .snapshot import EPOCH, day_number
+from .store import get_store_path
+from .writer import atomic_open
+from ..const.const import (LIVENESS_EPOCH_DAYS, LIVENESS_FILE_NAME, LIVENESS_RECHECK_EPOCHS,
+                           NOVEL_STATUSES_NAMED_TUPLE as STATUS_TU)
+from ..novel_info import Novel
+
+STATE_NAMES: tuple[str, ...] = ("unknown", "live", "deleted", "draft", "invalid")
+UNKNOWN, LIVE, DELETED, DRAFT, INVALID = range(len(STATE_NAMES))
+
+STATE_BITS: int = 3
+STATE_MASK: int = (1 << STATE_BITS) - 1
+MAX_EPOCH: int = (1 << (8 - STATE_BITS)) - 1
+
+FILE_MAGIC: bytes = b"NLV1"
+FILE_HEADER: struct.Struct = struct.Struct("<4siI")  # 매직, 기준일 (일 번호), 소설 번호 수
+
+
+def get_liveness_path() -> Path:
+    """생존 상태 파일 경로를 반환하는 함수 (DB 파일과 같은 폴더)"""
+    return get_store_path().with_name(LIVENESS_FILE_NAME)
+
+
+def novel_to_state(novel: Novel | None) -> int:
+    """chk_novel_up_status 가 반환한 Novel 객체로 생존 상태를 정하는 함수
+
+    :param novel: Novel 객체 (잘못된 소설 번호 (404) 면 None)
+    :return: 생존 상태
+    """
+    if novel is None:
+        return INVALID
+    if novel.up_status == STATUS_TU.deleted:  # 204
+        return DELETED
+    if novel.up_status == STATUS_TU.draft:  # 403
+        return DRAFT
+    return LIVE
+
+
+class LivenessMap(metaclass=UserMeta):
+    """소설 번호 > (생존 상태, 확인 에포크) 를 바이트 배열로 들고 있는 클래스.
+
+    :var cells: 소설 번호를 인덱스로 하는 uint8 배열 (0 번은 쓰지 않음)
+    :var base_day: 에포크 0 의 시작일 (1970-01-01 부터 센 일 번호)
+    """
+    __slots__ = (
+        "cells",
+        "base_day",
+    )
+
+    def __init__(self, max_code: int = 0, base_day: int = None):
+        self.cells: np.ndarray = np.zeros(max_code + 1, np.uint8)
+        self.base_day: int = day_number(date.today()) if base_day is None else base_day
+
+    def __len__(self) -> int:
+        return len(self.cells) - 1
+
+    @property
+    def states(self) -> np.ndarray:
+        """소설 번호별 생존 상태"""
+        return self.cells & STATE_MASK
+
+    @property
+    def epochs(self) -> np.ndarray:
+        """소설 번호별 확인 에포크"""
+        return self.cells >> STATE_BITS
+
+    def grow(self, max_code: int) -> None:
+        """가장 큰 소설 번호가 max_code 가 되도록 배열을 늘리는 함수 (새 번호는 '모름')"""
+        if max_code > len(self):
+            self.cells = np.concatenate([self.cells, np.zeros(max_code - len(self), np.uint8)])
+
+    def epoch_of(self, day: date = None) -> int:
+        """날짜의 에포크를 반환하는 함수. 5 비트를 넘으면 기준일을 옮기고 기존 에포크를 그만큼 당김
+
+        당기다가 0 보다 작아진 에포크는 0 으로 두는데, 다시 확인하는 기간이 모두 31 에포크보다 짧으므로 문제없습니다.
+
+        :param day: 날짜 (기본값 오늘)
+        :return: 에포크
+        """
+        epoch: int = (day_number(day or date.today()) - self.base_day) // LIVENESS_EPOCH_DAYS
+
+        if epoch > MAX_EPOCH:
+            shift: int = epoch - MAX_EPOCH
+            epochs: np.ndarray = np.maximum(self.epochs.astype(np.int16) - shift, 0).astype(np.uint8)
+
+            self.cells = (epochs << STATE_BITS) | self.states
+            self.base_day += shift * LIVENESS_EPOCH_DAYS
+            epoch = MAX_EPOCH
+
+        return max(epoch, 0)
+
+    def mark(self, codes, state: int, day: date = None) -> None:
+        """소설 번호들의 생존 상태와 확인 시점을 기록하는 함수
+
+        :param codes: 소설 번호 또는 번호 목록/배열
+        :param state: 생존 상태
+        :param day: 확인한 날짜 (기본값 오늘)
+        """
+        codes = np.asarray(codes, np.int64).reshape(-1)
+        if not len(codes):
+            return
+
+        epoch: int = self.epoch_of(day)
+        self.grow(int(codes.max()))
+        self.cells[codes] = (epoch << STATE_BITS) | state
+
+    def state(self, code: int) -> int:
+        """소설 번호의 생존 상태 (범위 밖이면 '모름')"""
+        return int(self.cells[code] & STATE_MASK) if 0 < code <= len(self) else UNKNOWN
+
+    def checked_on(self, code: int) -> date | None:
+        """소설 번호를 확인한 에포크의 시작일 (확인한 적이 없으면 None)"""
+        if self.state(code) == UNKNOWN:
+            return None
+        return EPOCH + timedelta(self.base_day + int(self.cells[code] >> STATE_BITS) * LIVENESS_EPOCH_DAYS)
+
+    def counts(self) -> dict[str, int]:
+        """생존 상태 이름 > 소설 번호 수"""
+        counts: np.ndarray = np.bincount(self.states[1:], minlength=len(STATE_NAMES))
+        return dict(zip(STATE_NAMES, counts[:len(STATE_NAMES)].tolist()))
+
+    def due(self, start: int = 1, end: int = None, day: date = None,
+            recheck_epochs: dict[str, int] = None) -> np.ndarray:
+        """start ~ end 中 이번에 요청해야 하는 소설 번호를 반환하는 함수
+
+        정상이거나 모르는 번호는 항상 요청하고, 죽은 번호는 확인한 지 recheck_epochs 만큼 지났을 때만 요청합니다.
+
+        :param start: 첫 소설 번호
+        :param end: 마지막 소설 번호 (포함, 기본값 가장 큰 번호)
+        :param day: 기준일 (기본값 오늘)
+        :param recheck_epochs: 상태 이름 > 다시 확인하기까지의 에포크 수
+        :return: 소설 번호 배열
+        """
+        end = len(self) if end is None else end
+        recheck_epochs = LIVENESS_RECHECK_EPOCHS if recheck_epochs is None else recheck_epochs
+
+        # 기준일을 옮기면 배열이 바뀌므로 에포크를 먼저 구함
+        epoch: int = self.epoch_of(day)
+        known_end: int = min(end, len(self))
+        cells: np.ndarray = self.cells[start:known_end + 1]
+        states: np.ndarray = cells & STATE_MASK
+        age: np.ndarray = epoch - (cells >> STATE_BITS).astype(np.int16)
+
+        # 상태별 다시 확인하기까지의 에포크 수 (정상, 모름은 0)
+        wait: np.ndarray = np.zeros(len(STATE_NAMES), np.int16)
+        for name, epochs in recheck_epochs.items():
+            wait[STATE_NAMES.index(name)] = epochs
+
+        codes: np.ndarray = np.flatnonzero(age >= wait[states]) + start
+        return np.concatenate([codes, np.arange(max(known_end + 1, start), end + 1)])
+
+    def save(self, file_path: Path = None) -> int:
+        """임시 파일에 쓴 뒤 바꿔치기하여 저장하는 함수 (atomic_open)
+
+        :param file_path: 파일 경로 (기본값 get_liveness_path())
+        :return: 파일 크기
+        """
+        file_path = Path(file_path or get_liveness_path())
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        data: bytes = FILE_HEADER.pack(FILE_MAGIC, self.base_day, len(self)) + zlib.compress(self.cells[1:].tobytes(), 9)
+        with atomic_open(file_path, mode="wb") as f:
+            f.write(data)
+
+        return len(data)
+
+    @classmethod
+    def load(cls, file_path: Path = None) -> "LivenessMap":
+        """save 로 저장한 파일을 읽는 함수 (파일이 없으면 빈 LivenessMap)
+
+        :param file_path: 파일 경로 (기본값 get_liveness_path())
+        :return: LivenessMap 객체
+        """
+        file_path = Path(file_path or get_liveness_path())
+        if not file_path.exists():
+            return cls()
+
+        data: bytes = file_path.read_bytes()
+        magic, base_day, size = FILE_HEADER.unpack_from(data)
+        if magic != FILE_MAGIC:
+            raise ValueError(f"{file_path} 는 생존 상태 파일이 아니에요.")
+
+        liveness = cls(0, base_day)
+        cells: np.ndarray = np.frombuffer(zlib.decompress(data[FILE_HEADER.size:]), np.uint8)
+        liveness.cells = np.concatenate([np.zeros(1, np.uint8), cells])
+        if len(liveness) != size:
+            raise ValueError(f"{file_path} 의 소설 수가 헤더와 달라요. ({len(liveness)} != {size})")
+
+        return liveness
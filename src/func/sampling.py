@@ -0,0 +1,273 @@
+"""소설 번호를 층화 무작위로 뽑아 요청하고, 프롤로그/삭제작/연중작 비율을 신뢰구간과 함께 추정하는 코드
+
+전체 소설을 하나씩 요청하면 며칠이 걸리지만, 수천 개만 뽑아도 비율은 ±1%p 안팎으로 추정됩니다.
+소설 번호를 같은 폭의 구간 (층) 으로 나누고 구간마다 같은 수를 뽑으므로, 시기별로 비율이 달라도 표본이 한쪽에 몰리지 않습니다.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from math import sqrt
+from typing import Callable
+from urllib.parse import urljoin
+
+import numpy as np
+
+from .common import UserMeta
+from ..const.const import (ALL_NOVEL_COUNT, HOST, NOVEL_STATUSES_NAMED_TUPLE as STATUS_TU, SAMPLE_BATCH_SIZE,
+                           SAMPLE_HALF_WIDTH, SAMPLE_MAX_SIZE, SAMPLE_MAX_WORKERS, SAMPLE_MIN_SIZE, SAMPLE_STRATA,
+                           SAMPLE_Z)
+
+SHARE_NAMES: tuple[str, ...] = ("prologue", "deleted", "hiatus")
+
+# 소설 번호 > 비율 이름 > 해당 여부 (해당 없음은 None, 잘못된 소설 번호면 결과 자체가 None)
+Probe = Callable[[int], dict[str, bool | None] | None]
+
+
+def wilson_interval(hits: float, n: float, z: float = SAMPLE_Z) -> tuple[float, float]:
+    """이항 비율의 윌슨 점수 신뢰구간을 구하는 함수
+
+    :param hits: 해당하는 표본 수 (유효 표본 수를 쓰면 실수일 수 있음)
+    :param n: 표본 수
+    :param z: 신뢰수준에 맞는 표준정규분포 분위수
+    :return: (하한, 상한)
+    """
+    if n <= 0:
+        return 0.0, 1.0
+
+    p: float = hits / n
+    z2: float = z * z
+    center: float = (p + z2 / (2 * n)) / (1 + z2 / n)
+    margin: float = z / (1 + z2 / n) * sqrt(p * (1 - p) / n + z2 / (4 * n * n))
+
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def probe_novel(novel_code: int) -> dict[str, bool | None] | None:
+    """소설 메인 페이지를 요청하여 프롤로그 유무, 삭제 여부, 연중 여부를 반환하는 함수
+
+    선호작 목록을 거치지 않으므로 계정 상태를 바꾸지 않고, 여러 스레드에서 동시에 불러도 됩니다.
+    삭제작과 연습작품은 회차 목록을 볼 수 없으므로 프롤로그 유무는 None 입니다.
+
+    :param novel_code: 소설 번호
+    :return: 비율 이름 > 해당 여부, 잘못된 소설 번호면 None
+    """
+    from .common import get_novel_main_w_error
+    from .episode import has_prologue
+    from ..const.selector import NOVEL_BADGE_CSS
+    from ..novel_info import Novel, chk_novel_up_status
+
+    code = str(novel_code)
+
+    with get_novel_main_w_error(urljoin(HOST + "/novel/", code)) as (html, err):
+        if err:
+            raise err
+
+    novel = Novel()
+    novel.code = code
+
+    with chk_novel_up_status(novel, html) as (novel, info_soup, err):
+        if novel is None:
+            return None
+
+        # 삭제작, 연습작품이 아니면 소설 정보의 배지 (완결, 연재중단 등) 로 연재 상태를 확인
+        badges: set[str] = set()
+        if info_soup is not None:
+            badges = {text for badge in info_soup.select(NOVEL_BADGE_CSS) for text in badge.stripped_strings}
+
+        up_status: str = novel.up_status
+        readable: bool = up_status not in (STATUS_TU.deleted, STATUS_TU.draft)
+
+        return {
+            "prologue": has_prologue(code) if readable else None,
+            "deleted": up_status == STATUS_TU.deleted,
+            "hiatus": readable and not badges.isdisjoint((STATUS_TU.hiatus, STATUS_TU.delayed)),
+        }
+
+
+class StratifiedSampler(metaclass=UserMeta):
+    """소설 번호를 층마다 비복원으로 뽑고, 층별 결과를 모아 비율과 신뢰구간을 추정하는 클래스.
+
+    1 ~ max_code 의 소설 번호를 strata 개의 층으로 똑같이 나누고, 층마다 seed 로 섞어 둔 순서대로 뽑습니다.
+
+    :var edges: 층 경계 (층 i 는 edges[i] 이상 edges[i + 1] 미만)
+    :var orders: 층마다 미리 섞어 둔 소설 번호
+    :var taken: 층마다 뽑은 수
+    :var hits: 비율 이름 > 층마다 해당하는 표본 수
+    :var counts: 비율 이름 > 층마다 해당 여부를 아는 표본 수
+    :var probed: 요청한 소설 수
+    :var invalid: 잘못된 소설 번호 수
+    :var errors: 요청 오류로 결과를 모르는 소설 수
+    :var z: 신뢰수준에 맞는 표준정규분포 분위수
+    """
+    __slots__ = (
+        "edges",
+        "orders",
+        "taken",
+        "hits",
+        "counts",
+        "probed",
+        "invalid",
+        "errors",
+        "z",
+    )
+
+    def __init__(self, max_code: int = ALL_NOVEL_COUNT, strata: int = SAMPLE_STRATA, seed: int = None,
+                 z: float = SAMPLE_Z):
+        strata = max(1, min(strata, max_code))
+        rng = np.random.default_rng(seed)
+
+        self.edges: np.ndarray = np.linspace(1, max_code + 1, strata + 1).astype(np.int64)
+        self.orders: list[np.ndarray] = [
+            rng.permutation(np.arange(lo, hi)) for lo, hi in zip(self.edges, self.edges[1:])
+        ]
+        self.taken: np.ndarray = np.zeros(strata, np.int64)
+
+        self.hits: dict[str, np.ndarray] = {name: np.zeros(strata, np.int64) for name in SHARE_NAMES}
+        self.counts: dict[str, np.ndarray] = {name: np.zeros(strata, np.int64) for name in SHARE_NAMES}
+        self.probed: int = 0
+        self.invalid: int = 0
+        self.errors: int = 0
+        self.z: float = z
+
+    @property
+    def weights(self) -> np.ndarray:
+        """층마다 전체 소설 번호 中 차지하는 비중"""
+        sizes: np.ndarray = np.diff(self.edges)
+        return sizes / sizes.sum()
+
+    @property
+    def exhausted(self) -> bool:
+        """모든 소설 번호를 뽑았는지 여부"""
+        return bool((self.taken >= np.diff(self.edges)).all())
+
+    def draw(self, size: int) -> list[int]:
+        """층마다 고르게 (남는 수는 덜 뽑힌 층부터) 소설 번호를 뽑는 함수
+
+        :param size: 뽑을 소설 번호 수
+        :return: 소설 번호 목록
+        """
+        codes: list[int] = []
+        remains: np.ndarray = np.diff(self.edges) - self.taken
+
+        while size > 0 and remains.any():
+            open_strata: np.ndarray = np.flatnonzero(remains)
+            share: int = max(1, size // len(open_strata))
+
+            for i in open_strata[np.argsort(self.taken[open_strata], kind="stable")]:
+                take: int = int(min(share, remains[i], size))
+                codes += self.orders[i][self.taken[i]: self.taken[i] + take].tolist()
+
+                self.taken[i] += take
+                remains[i] -= take
+                size -= take
+                if size == 0:
+                    break
+
+        return codes
+
+    def add(self, novel_code: int, result: dict[str, bool | None] | None) -> None:
+        """소설 하나의 요청 결과를 층별 집계에 더하는 함수
+
+        :param novel_code: 소설 번호
+        :param result: 비율 이름 > 해당 여부, 잘못된 소설 번호면 None
+        """
+        self.probed += 1
+        if result is None:
+            self.invalid += 1
+            return
+
+        stratum: int = int(np.searchsorted(self.edges, novel_code, "right")) - 1
+
+        for name in SHARE_NAMES:
+            value: bool | None = result.get(name)
+            if value is None:
+                continue
+            self.counts[name][stratum] += 1
+            self.hits[name][stratum] += value
+
+    def add_error(self) -> None:
+        """요청 오류로 결과를 모르는 소설 하나를 세는 함수 (비율 집계에는 넣지 않음)"""
+        self.probed += 1
+        self.errors += 1
+
+    def estimate(self, name: str) -> dict:
+        """층별 비율을 층 비중으로 가중 평균하고 신뢰구간을 구하는 함수
+
+        신뢰구간은 층화 분산으로 구한 유효 표본 수를 윌슨 구간에 넣어 구합니다.
+        표본이 없는 층은 빼고 남은 층의 비중을 다시 맞춥니다.
+
+        :param name: 비율 이름
+        :return: {"estimate": 추정값, "low": 하한, "high": 상한, "count": 표본 수}
+        """
+        counts: np.ndarray = self.counts[name]
+        sampled: np.ndarray = counts > 0
+        n: int = int(counts.sum())
+
+        if not n:
+            return {"estimate": 0.0, "low": 0.0, "high": 1.0, "count": 0}
+
+        weights: np.ndarray = self.weights[sampled]
+        weights = weights / weights.sum()
+        shares: np.ndarray = self.hits[name][sampled] / counts[sampled]
+
+        p: float = float(weights @ shares)
+        variance: float = float((weights ** 2 * shares * (1 - shares) / counts[sampled]).sum())
+
+        # 모든 층의 비율이 0 또는 1 이면 층화 분산이 0 이므로 실제 표본 수를 씀
+        n_eff: float = p * (1 - p) / variance if variance > 0 else n
+        low, high = wilson_interval(p * n_eff, n_eff, self.z)
+
+        return {"estimate": p, "low": low, "high": high, "count": n}
+
+    def estimates(self) -> dict[str, dict]:
+        """비율 이름 > 추정 결과"""
+        return {name: self.estimate(name) for name in SHARE_NAMES}
+
+    def half_width(self) -> float:
+        """비율들의 신뢰구간 반폭 中 가장 넓은 값"""
+        return max((row["high"] - row["low"]) / 2 for row in self.estimates().values())
+
+
+def estimate_shares(probe: Probe = probe_novel, max_code: int = ALL_NOVEL_COUNT,
+                    half_width: float | None = SAMPLE_HALF_WIDTH, min_size: int = SAMPLE_MIN_SIZE,
+                    max_size: int = SAMPLE_MAX_SIZE, batch_size: int = SAMPLE_BATCH_SIZE,
+                    strata: int = SAMPLE_STRATA, seed: int = None, max_workers: int = SAMPLE_MAX_WORKERS,
+                    on_batch: Callable[[StratifiedSampler], None] = None) -> dict:
+    """층화 표본을 batch_size 개씩 요청하면서, 신뢰구간이 충분히 좁아지면 멈추는 함수
+
+    :param probe: 소설 번호 > 비율 이름 > 해당 여부를 반환하는 함수 (기본값은 실제 요청)
+    :param max_code: 가장 큰 소설 번호
+    :param half_width: 모든 비율의 신뢰구간 반폭이 이 값 이하면 멈춤 (None 이면 max_size 까지 뽑음)
+    :param min_size: 멈출지 판단하기 전 최소 표본 수
+    :param max_size: 최대 표본 수
+    :param batch_size: 한 번에 요청하는 표본 수
+    :param strata: 층 수
+    :param seed: 난수 시드
+    :param max_workers: 동시 요청 수
+    :param on_batch: 묶음마다 진행 상황을 받을 함수
+    :return: {"sampled": 요청한 수, "invalid": 잘못된 소설 번호 수, "errors": 요청 오류 수, 비율 이름: 추정 결과}
+    """
+    from .userIO import print_under_new_line
+
+    sampler = StratifiedSampler(max_code, strata, seed)
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        while sampler.probed < max_size and not sampler.exhausted:
+            codes: list[int] = sampler.draw(min(batch_size, max_size - sampler.probed))
+            futures: list[Future] = [executor.submit(probe, code) for code in codes]
+
+            # 한 소설의 요청 오류로 전체 표본 조사가 멈추지 않도록 소설마다 따로 받음
+            for code, future in zip(codes, futures):
+                try:
+                    result: dict[str, bool | None] | None = future.result()
+                except Exception as err:
+                    print_under_new_line("[오류]", f"{code = }, {err = }")
+                    sampler.add_error()
+                else:
+                    sampler.add(code, result)
+
+            if on_batch:
+                on_batch(sampler)
+
+            if half_width is not None and sampler.probed >= min_size and sampler.half_width() <= half_width:
+                break
+
+    return {"sampled": sampler.probed, "invalid": sampler.invalid, "errors": sampler.errors, **sampler.estimates()}
@@ -0,0 +1,181 @@
+"""소설마다 다음 변경이 예상되는 시각을 우선순위로 삼아, 바뀌었을 가능성이 큰 소설부터 다시 요청하는 스케줄러
+
+다음 변경 예상 시각 = 최근 (예정) 연재일 + 연재 주기 x 연재 상태별 배수
+- 연재 주기는 최근 회차들의 게시일 간격, 회차 정보가 없으면 (최근 연재일 - 연재 시작일) / (회차 수 - 1)
+- 예상 시각 뒤에 요청했는데도 그대로였으면 마지막 요청 시각부터 한 주기 뒤로 미룸
+- 삭제작, 연습작품은 SCHEDULE_MAX_INTERVAL_DAYS 마다 한 번만 확인
+시각은 모두 율리우스 일 (SQLite 의 julianday()) 로 다룹니다.
+"""
+import heapq
+from datetime import datetime
+
+from .common import UserMeta
+from .store import NovelStore
+from ..const.const import (SCHEDULE_BUDGET, SCHEDULE_CADENCE_EPS, SCHEDULE_DEFAULT_INTERVAL_DAYS,
+                           SCHEDULE_MAX_INTERVAL_DAYS, SCHEDULE_MIN_INTERVAL_DAYS, SCHEDULE_STATUS_FACTORS)
+from ..novel_info import Novel
+
+UNIX_EPOCH: datetime = datetime(1970, 1, 1)
+UNIX_EPOCH_JULIAN_DAY: float = 2440587.5  # 1970-01-01 00:00 의 율리우스 일
+
+CADENCE_SQL: str = """
+SELECT novel_code, (max(day) - min(day)) / (count(*) - 1) FROM (
+    SELECT novel_code, julianday(ctime) AS day,
+           row_number() OVER (PARTITION BY novel_code ORDER BY code DESC) AS recent
+    FROM episode WHERE julianday(ctime) IS NOT NULL
+) WHERE recent <= ? GROUP BY novel_code HAVING count(*) > 1
+"""
+NOVEL_SQL: str = """
+SELECT code, up_status, count_book, julianday(start_date), julianday(last_write_date), julianday(got_time) FROM novel
+"""
+
+
+def to_julian_day(moment: datetime | str | None) -> float | None:
+    """datetime 객체나 ISO 형식 문자열을 율리우스 일로 바꾸는 함수 (알 수 없으면 None)"""
+    if isinstance(moment, str):
+        try:
+            moment = datetime.fromisoformat(moment)
+        except ValueError:  # DEFAULT_TIME 등
+            return None
+    if moment is None:
+        return None
+
+    # SQLite 의 julianday() 처럼 시간대는 무시
+    return (moment.replace(tzinfo=None) - UNIX_EPOCH).total_seconds() / 86400 + UNIX_EPOCH_JULIAN_DAY
+
+
+def expected_interval(up_status: str | None, count_book: int | None, start_day: float | None,
+                      last_day: float | None, cadence: float = None) -> float:
+    """다음 변경까지의 예상 간격 (일) 을 구하는 함수
+
+    :param up_status: 연재 상태
+    :param count_book: 회차 수
+    :param start_day: 연재 시작일 (율리우스 일)
+    :param last_day: 최근 (예정) 연재일 (율리우스 일)
+    :param cadence: 최근 회차들로 잰 연재 주기 (일)
+    :return: 예상 간격 (일)
+    """
+    factor: float | None = SCHEDULE_STATUS_FACTORS.get(up_status)
+    if factor is None:
+        return SCHEDULE_MAX_INTERVAL_DAYS
+
+    if cadence is None:
+        if count_book and count_book > 1 and start_day is not None and last_day is not None:
+            cadence = (last_day - start_day) / (count_book - 1)
+        else:
+            cadence = SCHEDULE_DEFAULT_INTERVAL_DAYS
+
+    return min(max(cadence * factor, SCHEDULE_MIN_INTERVAL_DAYS), SCHEDULE_MAX_INTERVAL_DAYS)
+
+
+def next_change_day(up_status: str | None, count_book: int | None, start_day: float | None, last_day: float | None,
+                    got_day: float | None, cadence: float = None) -> float:
+    """다음 변경이 예상되는 시각 (율리우스 일) 을 구하는 함수. 요청한 적이 없으면 -inf
+
+    :param up_status: 연재 상태
+    :param count_book: 회차 수
+    :param start_day: 연재 시작일
+    :param last_day: 최근 (예정) 연재일
+    :param got_day: 마지막으로 요청한 시각
+    :param cadence: 최근 회차들로 잰 연재 주기 (일)
+    :return: 다음 변경 예상 시각
+    """
+    if got_day is None:
+        return float("-inf")
+
+    interval: float = expected_interval(up_status, count_book, start_day, last_day, cadence)
+    due: float = (got_day if last_day is None else last_day) + interval
+
+    # 예상 시각 뒤에 요청했는데도 바뀌지 않았으면 한 주기 뒤로
+    if due <= got_day:
+        due = got_day + interval
+
+    return due
+
+
+class RecrawlScheduler(metaclass=UserMeta):
+    """소설 번호를 다음 변경 예상 시각 순으로 꺼내는 우선순위 큐 (heapq) 클래스.
+
+    같은 소설을 다시 넣으면 예전 항목은 꺼낼 때 건너뜁니다.
+
+    :var heap: (다음 변경 예상 시각, 소설 번호) 힙
+    :var due_days: 소설 번호 > 최신 다음 변경 예상 시각
+    :var cadences: 소설 번호 > 최근 회차들로 잰 연재 주기 (일)
+    """
+    __slots__ = (
+        "heap",
+        "due_days",
+        "cadences",
+    )
+
+    def __init__(self, cadences: dict[int, float] = None):
+        self.heap: list[tuple[float, int]] = []
+        self.due_days: dict[int, float] = {}
+        self.cadences: dict[int, float] = cadences or {}
+
+    def __len__(self) -> int:
+        return len(self.due_days)
+
+    def __contains__(self, code: int) -> bool:
+        return code in self.due_days
+
+    @classmethod
+    def from_store(cls, store: NovelStore, cadence_eps: int = SCHEDULE_CADENCE_EPS) -> "RecrawlScheduler":
+        """저장소의 모든 소설로 큐를 만드는 함수
+
+        :param store: NovelStore 객체
+        :param cadence_eps: 연재 주기를 잴 때 쓰는 최근 회차 수
+        :return: RecrawlScheduler 객체
+        """
+        scheduler = cls(dict(store.conn.execute(CADENCE_SQL, (cadence_eps,))))
+        cadences: dict[int, float] = scheduler.cadences
+
+        scheduler.heap = [
+            (next_change_day(*row[1:], cadences.get(row[0])), row[0]) for row in store.conn.execute(NOVEL_SQL)
+        ]
+        heapq.heapify(scheduler.heap)
+        scheduler.due_days = {code: due for due, code in scheduler.heap}
+
+        return scheduler
+
+    def push(self, code: int, due_day: float) -> None:
+        """소설 번호를 다음 변경 예상 시각과 함께 넣는 함수 (이미 있으면 시각을 바꿈)"""
+        self.due_days[code] = due_day
+        heapq.heappush(self.heap, (due_day, code))
+
+    def push_novel(self, novel: Novel) -> float:
+        """방금 요청한 소설을 다음 변경 예상 시각에 맞춰 다시 넣는 함수
+
+        :param novel: Novel 객체
+        :return: 다음 변경 예상 시각
+        """
+        code = int(novel.code)
+        due_day: float = next_change_day(
+            novel.up_status, novel.count_book, to_julian_day(novel.start_date), to_julian_day(novel.last_write_date),
+            to_julian_day(novel.got_time), self.cadences.get(code),
+        )
+        self.push(code, due_day)
+
+        return due_day
+
+    def pop_due(self, budget: int = SCHEDULE_BUDGET, now: datetime = None) -> list[int]:
+        """다음 변경 예상 시각이 지난 소설을 이른 순으로 budget 개까지 꺼내는 함수
+
+        :param budget: 꺼낼 최대 소설 수 (이번 실행의 요청 수)
+        :param now: 현재 시각 (기본값 지금)
+        :return: 소설 번호 목록
+        """
+        now_day: float = to_julian_day(now or datetime.now())
+        codes: list[int] = []
+
+        while self.heap and len(codes) < budget and self.heap[0][0] <= now_day:
+            due_day, code = heapq.heappop(self.heap)
+
+            # 다시 넣어서 낡은 항목
+            if self.due_days.get(code) != due_day:
+                continue
+
+            del self.due_days[code]
+            codes.append(code)
+
+        return codes
@@ -0,0 +1,213 @@
+"""크롤링할 때마다 소설, 회차의 통계(조회/추천/선호/알람/회차 수)를 쌓아 두는 코드
+
+통계는 (종류, 번호, 월) 마다 한 블록으로 묶고, 블록 안에서는 직전 표본과의 차이를
+zigzag varint 로 적은 뒤 zlib 으로 줄어들면 압축해서 저장합니다.
+하루 한 번 전체 소설을 크롤링해도 한 해에 소설 하나당 블록 12개만 생깁니다.
+"""
+import sqlite3
+import zlib
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterable
+
+from .common import UserMeta
+from .episode import Ep
+from .store import batched, get_store_path
+from .table import to_int
+from ..const.const import EP_SERIES_FIELDS, NOVEL_SERIES_FIELDS, STORE_BATCH_SIZE
+from ..novel_info import Novel
+
+NOVEL_KIND: int = 0
+EP_KIND: int = 1
+EPOCH: date = date(1970, 1, 1)
+
+RAW_FLAG: int = 0  # 블록 첫 바이트: 압축 안 함
+ZLIB_FLAG: int = 1  # 블록 첫 바이트: zlib 압축
+
+SNAPSHOT_SQL: str = """
+CREATE TABLE IF NOT EXISTS snapshot (
+    kind INTEGER NOT NULL,
+    code INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (kind, code, month)
+) WITHOUT ROWID;
+"""
+
+
+def encode_samples(samples: list[tuple[int, ...]]) -> bytes:
+    """(일 번호, 값, ..) 표본 목록을 차분 + zigzag varint 로 적고, 줄어들면 zlib 으로 압축하는 함수
+
+    >>> decode_samples(encode_samples([(19000, 10, -1), (19001, 15, -1)]))
+    [(19000, 10, -1), (19001, 15, -1)]
+
+    :param samples: 일 번호 순으로 정렬된 표본 목록
+    :return: 블록 바이트
+    """
+    out = bytearray()
+    prev: tuple[int, ...] = (0,) * len(samples[0]) if samples else ()
+
+    for sample in samples:
+        for value, prev_value in zip(sample, prev):
+            delta: int = value - prev_value
+            n: int = delta * 2 if delta >= 0 else -delta * 2 - 1  # zigzag
+
+            # varint
+            while n > 0x7F:
+                out.append(n & 0x7F | 0x80)
+                n >>= 7
+            out.append(n)
+        prev = sample
+
+    compressed: bytes = zlib.compress(out, 9)
+
+    if len(compressed) < len(out):
+        return bytes([ZLIB_FLAG, len(samples[0])]) + compressed
+    return bytes([RAW_FLAG, len(samples[0]) if samples else 0]) + out
+
+
+def decode_samples(data: bytes) -> list[tuple[int, ...]]:
+    """encode_samples 로 만든 블록을 표본 목록으로 되돌리는 함수
+
+    :param data: 블록 바이트
+    :return: 표본 목록
+    """
+    flag, width = data[0], data[1]
+    body: bytes = zlib.decompress(data[2:]) if flag == ZLIB_FLAG else data[2:]
+
+    samples: list[tuple[int, ...]] = []
+    values: list[int] = []
+    prev: list[int] = [0] * width
+    n, shift = 0, 0
+
+    for byte in body:
+        n |= (byte & 0x7F) << shift
+        shift += 7
+
+        if byte & 0x80:
+            continue
+
+        delta: int = n >> 1 if not n & 1 else -(n >> 1) - 1
+        values.append(prev[len(values)] + delta)
+        n, shift = 0, 0
+
+        if len(values) == width:
+            samples.append(tuple(values))
+            prev, values = values, []
+
+    return samples
+
+
+def day_number(day: date) -> int:
+    """날짜를 1970-01-01 부터 센 일 번호로 바꾸는 함수"""
+    return (day - EPOCH).days
+
+
+def month_number(day: date) -> int:
+    """날짜가 속한 달의 번호를 반환하는 함수 (연도 * 12 + 월 - 1)"""
+    return day.year * 12 + day.month - 1
+
+
+class SnapshotStore(metaclass=UserMeta):
+    """소설, 회차 통계의 시계열을 SQLite 파일에 쌓는 클래스.
+
+    :var conn: SQLite 연결
+    """
+    __slots__ = (
+        "conn",
+    )
+
+    def __init__(self, db_path: Path | str = None):
+        if db_path is None:
+            db_path = get_store_path()
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SNAPSHOT_SQL)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def append(self, kind: int, samples: Iterable[tuple[int, tuple[int, ...]]], day: date = None,
+               batch_size: int = STORE_BATCH_SIZE) -> int:
+        """(번호, 값 튜플) 표본들을 해당 날짜의 표본으로 추가하는 함수. 같은 날 표본이 이미 있으면 바꿈
+
+        :param kind: NOVEL_KIND 또는 EP_KIND
+        :param samples: (번호, 값 튜플) 목록 또는 제너레이터
+        :param day: 크롤링 일자 (기본값 오늘)
+        :param batch_size: 트랜잭션 하나에 넣는 표본 수
+        :return: 추가한 표본 수
+        """
+        day = day or date.today()
+        day_no: int = day_number(day)
+        month: int = month_number(day)
+        count: int = 0
+
+        select_sql: str = "SELECT data FROM snapshot WHERE kind = ? AND code = ? AND month = ?"
+        upsert_sql: str = "INSERT OR REPLACE INTO snapshot (kind, code, month, data) VALUES (?, ?, ?, ?)"
+
+        for batch in batched(samples, batch_size):
+            with self.conn:
+                for code, values in batch:
+                    row = self.conn.execute(select_sql, (kind, code, month)).fetchone()
+                    block: list[tuple[int, ...]] = decode_samples(row[0]) if row else []
+
+                    # 같은 날 다시 크롤링했으면 마지막 표본을 교체
+                    if block and block[-1][0] == day_no:
+                        block.pop()
+                    block.append((day_no, *values))
+
+                    self.conn.execute(upsert_sql, (kind, code, month, encode_samples(block)))
+
+            count += len(batch)
+
+        return count
+
+    def append_novels(self, novels: Iterable[Novel], day: date = None) -> int:
+        """Novel 객체들의 통계를 표본으로 추가하는 함수 (없는 값은 -1)"""
+        samples = (
+            (int(novel.code), tuple(to_int(getattr(novel, "_" + field, None)) for field in NOVEL_SERIES_FIELDS))
+            for novel in novels
+        )
+        return self.append(NOVEL_KIND, samples, day)
+
+    def append_eps(self, eps: Iterable[Ep], day: date = None) -> int:
+        """Ep 객체들의 통계를 표본으로 추가하는 함수 (없는 값은 -1)"""
+        samples = (
+            (int(ep.code), tuple(to_int(getattr(ep, "_" + field, None)) for field in EP_SERIES_FIELDS))
+            for ep in eps
+        )
+        return self.append(EP_KIND, samples, day)
+
+    def series(self, kind: int, code: int | str, start: date = None, end: date = None) -> list[tuple]:
+        """한 소설/회차의 통계 시계열을 반환하는 함수
+
+        :param kind: NOVEL_KIND 또는 EP_KIND
+        :param code: 소설/회차 번호
+        :param start: 시작일 (포함, 기본값 처음부터)
+        :param end: 종료일 (포함, 기본값 끝까지)
+        :return: (날짜, 값, ..) 목록. 값의 순서는 NOVEL_SERIES_FIELDS 또는 EP_SERIES_FIELDS
+        """
+        start_no: int = day_number(start) if start else -(1 << 62)
+        end_no: int = day_number(end) if end else 1 << 62
+        start_month: int = month_number(start) if start else 0
+        end_month: int = month_number(end) if end else 1 << 62
+
+        sql: str = "SELECT data FROM snapshot WHERE kind = ? AND code = ? AND month BETWEEN ? AND ? ORDER BY month"
+        series: list[tuple] = []
+
+        for data, in self.conn.execute(sql, (kind, int(code), start_month, end_month)):
+            for day_no, *values in decode_samples(data):
+                if start_no <= day_no <= end_no:
+                    series.append((EPOCH + timedelta(days=day_no), *values))
+
+        return series
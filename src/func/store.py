@@ -0,0 +1,262 @@
+"""소설, 회차 정보를 SQLite 파일에 저장하고 불러오는 코드
+
+"""
+import sqlite3
+from itertools import islice
+from pathlib import Path
+from typing import Any, Generator, Iterable
+
+from .common import UserMeta, get_env_var_w_error
+from .episode import Ep
+from .table import NOVEL_DATE_FIELDS, NOVEL_FIELDS, NOVEL_STR_FIELDS, split_tags, to_int
+from ..const.const import STORE_BATCH_SIZE, STORE_FILE_NAME
+from ..novel_info import Novel, genre_to_tags, new_novel_from_info_dic
+
+# novel 테이블의 열 (태그는 novel_tag 테이블에 따로 저장)
+NOVEL_COLUMNS: tuple[str, ...] = tuple(name for name in NOVEL_FIELDS if name != "tags")
+EP_COLUMNS: tuple[str, ...] = (
+    "code",
+    "novel_code",
+    "title",
+    "url",
+    "num",
+    "types",
+    "letter",
+    "comment",
+    "count_view",
+    "count_good",
+    "ctime",
+    "got_time",
+)
+
+
+def column_def(name: str) -> str:
+    """novel 테이블 열의 SQL 정의를 반환하는 함수"""
+    if name == "code":
+        return "code INTEGER PRIMARY KEY"
+    if name in NOVEL_STR_FIELDS or name in NOVEL_DATE_FIELDS or name == "types":
+        return name + " TEXT"
+    return name + " INTEGER"
+
+
+SCHEMA_SQL: str = f"""
+CREATE TABLE IF NOT EXISTS novel ({", ".join(map(column_def, NOVEL_COLUMNS))});
+CREATE INDEX IF NOT EXISTS novel_up_status ON novel (up_status);
+CREATE INDEX IF NOT EXISTS novel_writer_nick ON novel (writer_nick);
+CREATE INDEX IF NOT EXISTS novel_last_write_date ON novel (last_write_date);
+
+CREATE TABLE IF NOT EXISTS novel_tag (
+    tag TEXT NOT NULL,
+    code INTEGER NOT NULL,
+    pos INTEGER NOT NULL,
+    PRIMARY KEY (tag, code)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS novel_tag_code ON novel_tag (code);
+
+CREATE TABLE IF NOT EXISTS episode (
+    code INTEGER PRIMARY KEY,
+    novel_code INTEGER NOT NULL,
+    title TEXT,
+    url TEXT,
+    num TEXT,
+    types TEXT,
+    letter INTEGER,
+    comment INTEGER,
+    count_view INTEGER,
+    count_good INTEGER,
+    ctime TEXT,
+    got_time TEXT
+);
+CREATE INDEX IF NOT EXISTS episode_novel_code ON episode (novel_code, code);
+"""
+
+
+def upsert_sql(table: str, columns: tuple[str, ...]) -> str:
+    """code 가 같은 행이 있으면 갱신하고 없으면 추가하는 SQL 을 반환하는 함수"""
+    updates: str = ", ".join(f"{column} = excluded.{column}" for column in columns if column != "code")
+
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT (code) DO UPDATE SET {updates}"
+    )
+
+
+def novel_to_record(novel: Novel) -> tuple:
+    """Novel 객체를 novel 테이블의 행으로 바꾸는 함수"""
+    record: list[Any] = []
+
+    for name in NOVEL_COLUMNS:
+        value = getattr(novel, "_" + name, None)
+
+        if name == "types":
+            record.append(",".join(sorted(value or ())))
+        elif name in NOVEL_STR_FIELDS or name in NOVEL_DATE_FIELDS:
+            record.append(value)
+        else:
+            record.append(to_int(value, None))
+
+    return tuple(record)
+
+
+def ep_to_record(ep: Ep, novel_code: str | int, got_time: str) -> tuple:
+    """Ep 객체를 episode 테이블의 행으로 바꾸는 함수"""
+    return (
+        to_int(ep.code, None),
+        to_int(novel_code, None),
+        ep.title,
+        ep.url,
+        str(ep.num),
+        ",".join(sorted(ep.types)),
+        to_int(ep.letter, None),
+        to_int(ep.comment, None),
+        to_int(ep.count_view, None),
+        to_int(ep.count_good, None),
+        ep.ctime,
+        got_time,
+    )
+
+
+def batched(iterable: Iterable, size: int) -> Generator[list, None, None]:
+    """목록을 size 개씩 끊어서 반환하는 함수"""
+    iterator = iter(iterable)
+
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def get_store_path() -> Path:
+    """환경 변수 NOVEL_DB_PATH 의 DB 파일 경로를 반환하는 함수 (없으면 ./novel/novelpia.sqlite3)"""
+    with get_env_var_w_error("NOVEL_DB_PATH") as (env_db_path, key_err):
+        if key_err:
+            return Path(Path.cwd(), "novel", STORE_FILE_NAME)
+        return Path(env_db_path)
+
+
+class NovelStore(metaclass=UserMeta):
+    """소설, 회차 정보를 저장하는 SQLite DB 클래스.
+
+    :var db_path: DB 파일 경로
+    :var conn: SQLite 연결
+    """
+    __slots__ = (
+        "db_path",
+        "conn",
+    )
+
+    def __init__(self, db_path: Path | str):
+        self.db_path = db_path
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+
+        # 크롤러가 쓰는 동안에도 다른 프로세스가 읽을 수 있도록 WAL 모드 사용
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SCHEMA_SQL)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM novel").fetchone()[0]
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def upsert_novels(self, novels: Iterable[Novel], batch_size: int = STORE_BATCH_SIZE) -> int:
+        """Novel 객체들을 batch_size 개씩 한 트랜잭션으로 저장하는 함수
+
+        :param novels: Novel 객체 목록 또는 제너레이터
+        :param batch_size: 트랜잭션 하나에 넣는 행 수
+        :return: 저장한 소설 수
+        """
+        novel_sql: str = upsert_sql("novel", NOVEL_COLUMNS)
+        count: int = 0
+
+        for batch in batched(novels, batch_size):
+            records: list[tuple] = [novel_to_record(novel) for novel in batch]
+            codes: list[tuple[int]] = [(record[NOVEL_COLUMNS.index("code")],) for record in records]
+            tag_records: list[tuple] = [
+                (tag, code, pos)
+                for novel, (code,) in zip(batch, codes)
+                for pos, tag in enumerate(split_tags(novel.tags))
+            ]
+            with self.conn:
+                self.conn.executemany(novel_sql, records)
+                self.conn.executemany("DELETE FROM novel_tag WHERE code = ?", codes)
+                self.conn.executemany("INSERT INTO novel_tag (tag, code, pos) VALUES (?, ?, ?)", tag_records)
+
+            count += len(records)
+
+        return count
+
+    def upsert_eps(self, novel_code: str | int, eps: Iterable[Ep], batch_size: int = STORE_BATCH_SIZE) -> int:
+        """한 소설의 Ep 객체들을 batch_size 개씩 한 트랜잭션으로 저장하는 함수
+
+        :param novel_code: 소설 번호
+        :param eps: Ep 객체 목록 또는 제너레이터
+        :param batch_size: 트랜잭션 하나에 넣는 행 수
+        :return: 저장한 회차 수
+        """
+        ep_sql: str = upsert_sql("episode", EP_COLUMNS)
+        count: int = 0
+
+        for batch in batched(eps, batch_size):
+            with self.conn:
+                self.conn.executemany(ep_sql, [ep_to_record(ep, novel_code, ep.got_time) for ep in batch])
+            count += len(batch)
+
+        return count
+
+    def iter_novels(self, where: str = "", params: Iterable = ()) -> Generator[Novel, None, None]:
+        """조건에 맞는 소설을 Novel 객체로 하나씩 반환하는 함수
+
+        :param where: SQL WHERE 절 (예: "up_status = ?")
+        :param params: WHERE 절의 매개변수
+        :return: Novel 객체 제너레이터
+        """
+        sql: str = (
+            "SELECT *, (SELECT group_concat(tag, char(10)) FROM "
+            "(SELECT tag FROM novel_tag WHERE novel_tag.code = novel.code ORDER BY pos)) AS tags FROM novel"
+        )
+        if where:
+            sql += " WHERE " + where
+        sql += " ORDER BY code"
+
+        for row in self.conn.execute(sql, tuple(params)):
+            novel: Novel = new_novel_from_info_dic({})
+
+            for name in NOVEL_COLUMNS:
+                setattr(novel, "_" + name, row[name])
+
+            novel._code = str(row["code"])
+            novel._types = set(row["types"].split(",")) if row["types"] else set()
+            if row["tags"]:
+                novel._novel_genre = row["tags"].split("\n")
+                novel._tags = genre_to_tags(novel._novel_genre)
+
+            yield novel
+
+    def codes_with_tags(self, *tags: str) -> list[int]:
+        """입력받은 태그를 모두 가진 소설 번호 목록을 반환하는 함수 (태그가 없으면 모든 소설 번호)"""
+        if not tags:
+            return [code for code, in self.conn.execute("SELECT code FROM novel ORDER BY code")]
+
+        sql: str = " INTERSECT ".join(["SELECT code FROM novel_tag WHERE tag = ?"] * len(tags))
+
+        return [code for code, in self.conn.execute(sql + " ORDER BY code", tags)]
+
+    def codes_written_since(self, since: str) -> list[int]:
+        """최근 (예정) 연재일이 입력받은 시각 이후인 소설 번호 목록을 반환하는 함수
+
+        :param since: 'YYYY-MM-DD' 또는 'YYYY-MM-DD HH:MM:SS'
+        :return: 소설 번호 목록
+        """
+        sql: str = "SELECT code FROM novel WHERE last_write_date >= ? ORDER BY code"
+
+        return [code for code, in self.conn.execute(sql, (since,))]
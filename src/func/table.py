@@ -0,0 +1,374 @@
+"""소설 정보를 열(column) 단위 배열로 모아 통계를 내는 코드
+
+"""
+from pathlib import Path
+from typing import Callable, Generator, Iterable
+
+import numpy as np
+
+from .common import UserMeta
+from ..const.const import NOVEL_STATUSES_NAMED_TUPLE, NOVEL_TYPE_FLAGS
+from ..novel_info import NOVEL_FIELD_TABLE, Novel, genre_to_tags, tags_to_genre, trusted_info_dics_to_novels
+
+# Novel.__slots__ 의 필드 (novel_genre 는 tags 로 대신함)
+NOVEL_FIELDS: tuple[str, ...] = tuple(
+    slot[1:] for slot in dict.fromkeys(Novel.__slots__) if slot != "_novel_genre"
+)
+NOVEL_STR_FIELDS: frozenset[str] = frozenset(["title", "url", "writer_nick", "up_status", "novel_story"])
+NOVEL_DATE_FIELDS: frozenset[str] = frozenset([
+    "ctime", "mtime", "got_time", "start_date", "last_view_date", "last_write_date", "reg_date", "status_date",
+    "del_date", "complete_date", "update_dt",
+])
+NOVEL_LIST_FIELDS: frozenset[str] = frozenset(["types", "tags"])
+
+# 열 이름 > 자료형 (없는 값은 -1)
+INT_COLUMNS: dict[str, type] = {
+    "code": np.int32,
+    "mem_no": np.int32,
+    "count_view": np.int64,
+    "count_good": np.int64,
+    "count_book": np.int32,
+    "count_alarm": np.int32,
+    "count_like": np.int32,
+    "count_pick": np.int32,
+    "main_genre": np.int16,
+    "novel_age": np.int8,
+    "novel_live": np.int8,
+}
+# 날짜 열 (없는 값은 NaT)
+DATE_COLUMNS: tuple[str, ...] = (
+    "start_date",
+    "last_write_date",
+    "reg_date",
+    "update_dt",
+    "status_date",
+    "complete_date",
+    "del_date",
+    "got_time",
+)
+# 문자열 열 (파이썬 str 객체 배열)
+STR_COLUMNS: tuple[str, ...] = ("title", "writer_nick", "novel_story")
+
+# 연재 상태 범주 (up_status 열의 값은 이 튜플의 인덱스, 0은 미상)
+UP_STATUS_CATEGORIES: tuple[str | None, ...] = (None,) + tuple(NOVEL_STATUSES_NAMED_TUPLE)
+
+
+def split_tags(tags: str | None) -> list[str]:
+    """Novel.tags 의 Markdown 목록 문자열을 태그 목록으로 되돌리는 함수
+
+    >>> split_tags('\\n  - "현대판타지"\\n  - "하렘"')
+    ['현대판타지', '하렘']
+
+    :param tags: Markdown 목록 문자열
+    :return: 태그 목록
+    """
+    return tags_to_genre(tags)
+
+
+def to_int(value, default: int = -1) -> int:
+    """정수로 바꿀 수 있으면 바꾸고, 없으면 기본값을 반환하는 함수
+
+    :param value: 정수, 숫자 문자열, None, '공개전' 등
+    :param default: 기본값
+    :return: 정수
+    """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.replace(",", "").isdecimal():
+        return int(value.replace(",", ""))
+    return default
+
+
+class NovelTable(metaclass=UserMeta):
+    """소설 정보를 열 단위 NumPy 배열로 들고 있는 클래스.
+
+    :var columns: 열 이름 > 배열 (정수, 날짜, 문자열 열과 up_status, types)
+    :var tag_names: 태그 ID > 태그 이름
+    :var tag_ids: 모든 소설의 태그 ID 를 이어 붙인 배열
+    :var tag_offsets: i번째 소설의 태그 ID 는 tag_ids[tag_offsets[i]:tag_offsets[i + 1]]
+    """
+    __slots__ = (
+        "columns",
+        "tag_names",
+        "tag_ids",
+        "tag_offsets",
+        "_tag_rows",
+    )
+
+    def __init__(self, columns: dict[str, np.ndarray], tag_names: list[str], tag_ids: np.ndarray,
+                 tag_offsets: np.ndarray):
+        self.columns = columns
+        self.tag_names = tag_names
+        self.tag_ids = tag_ids
+        self.tag_offsets = tag_offsets
+        self._tag_rows = None
+
+    def __len__(self) -> int:
+        return len(self.columns["code"])
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    @classmethod
+    def from_novels(cls, novels: Iterable[Novel]) -> "NovelTable":
+        """Novel 객체들을 열 단위로 모아 NovelTable 로 만드는 함수
+
+        :param novels: Novel 객체 목록 또는 제너레이터
+        :return: NovelTable 객체
+        """
+        values: dict[str, list] = {column: [] for column in (*INT_COLUMNS, *DATE_COLUMNS, *STR_COLUMNS)}
+        up_statuses: list[int] = []
+        types: list[int] = []
+        tag_names: list[str] = []
+        tag_id_dic: dict[str, int] = {}
+        tag_ids: list[int] = []
+        tag_offsets: list[int] = [0]
+
+        status_index: dict[str | None, int] = {status: i for i, status in enumerate(UP_STATUS_CATEGORIES)}
+        type_bits: dict[str, int] = {novel_type: 1 << i for i, novel_type in enumerate(NOVEL_TYPE_FLAGS)}
+
+        for novel in novels:
+            for column, column_values in values.items():
+                column_values.append(getattr(novel, "_" + column, None))
+
+            up_statuses.append(status_index.get(novel.up_status, 0))
+            types.append(sum(type_bits.get(novel_type, 0) for novel_type in novel.types))
+
+            # 태그 이름을 ID 로 바꿔서 저장
+            for tag in novel.novel_genre or ():
+                tag_id: int | None = tag_id_dic.get(tag)
+                if tag_id is None:
+                    tag_id = tag_id_dic[tag] = len(tag_names)
+                    tag_names.append(tag)
+                tag_ids.append(tag_id)
+
+            tag_offsets.append(len(tag_ids))
+
+        columns: dict[str, np.ndarray] = {}
+
+        for column, dtype in INT_COLUMNS.items():
+            columns[column] = np.array([to_int(value) for value in values[column]], dtype)
+
+        for column in DATE_COLUMNS:
+            columns[column] = np.array([value or None for value in values[column]], "datetime64[s]")
+
+        for column in STR_COLUMNS:
+            columns[column] = np.array(values[column], object)
+
+        columns["up_status"] = np.array(up_statuses, np.uint8)
+        columns["types"] = np.array(types, np.uint8)
+
+        return cls(columns, tag_names, np.array(tag_ids, np.int32), np.array(tag_offsets, np.int64))
+
+    def to_novels(self) -> Generator[Novel, None, None]:
+        """각 행을 Novel 객체로 되돌려 하나씩 반환하는 함수
+
+        :return: Novel 객체 제너레이터
+        """
+        # '2024-04-17T20:00:00' > '2024-04-17 20:00:00' (NaT 는 None)
+        api_dates: dict[str, list[str | None]] = {
+            column: np.where(
+                np.isnat(self.columns[column]),
+                None,
+                np.char.replace(np.datetime_as_string(self.columns[column], "s"), "T", " ").astype(object),
+            ).tolist()
+            for column in DATE_COLUMNS if column != "got_time"
+        }
+        got_times: np.ndarray = np.datetime_as_string(self.columns["got_time"], "m")
+
+        # 없는 값 (-1) 은 Novel 의 기본값으로
+        int_defaults: dict[str, int | None] = {column: NOVEL_FIELD_TABLE["_" + column][1] for column in INT_COLUMNS}
+
+        def info_dics():
+            for i in range(len(self)):
+                info_dic: dict = {"novel_no": int(self.columns["code"][i]), "novel_name": self.columns["title"][i]}
+
+                for column, default in int_defaults.items():
+                    value = int(self.columns[column][i])
+                    info_dic[column] = default if value == -1 else value
+
+                for column, dates in api_dates.items():
+                    info_dic[column] = dates[i]
+
+                info_dic["writer_nick"] = self.columns["writer_nick"][i]
+                yield info_dic
+
+        for i, novel in enumerate(trusted_info_dics_to_novels(info_dics())):
+            types: int = int(self.columns["types"][i])
+            start, end = self.tag_offsets[i], self.tag_offsets[i + 1]
+            tags: list[str] = [self.tag_names[tag_id] for tag_id in self.tag_ids[start:end]]
+
+            novel._types = {novel_type for bit, novel_type in enumerate(NOVEL_TYPE_FLAGS) if types >> bit & 1}
+            novel._up_status = UP_STATUS_CATEGORIES[self.columns["up_status"][i]]
+            if tags:
+                novel._novel_genre = tags
+                novel._tags = genre_to_tags(tags)
+            novel._novel_story = self.columns["novel_story"][i]
+            if got_times[i] != "NaT":
+                novel._got_time = str(got_times[i])
+
+            yield novel
+
+    ################################################################################
+    # 조건 (행별 참/거짓 배열)
+    ################################################################################
+    def mask_status(self, *up_statuses: str) -> np.ndarray:
+        """연재 상태가 입력 값 中 하나인 행을 고르는 함수"""
+        codes = [UP_STATUS_CATEGORIES.index(up_status) for up_status in up_statuses]
+        return np.isin(self.columns["up_status"], codes)
+
+    def mask_types(self, *novel_types: str, match_all: bool = False) -> np.ndarray:
+        """작품 유형 (성인/자유/PLUS/독점/챌린지) 으로 행을 고르는 함수
+
+        :param novel_types: 작품 유형들
+        :param match_all: 참이면 모든 유형, 거짓이면 하나 이상의 유형을 가진 행
+        """
+        bits: int = sum(1 << NOVEL_TYPE_FLAGS.index(novel_type) for novel_type in novel_types)
+        masked: np.ndarray = self.columns["types"] & bits
+
+        return masked == bits if match_all else masked != 0
+
+    def mask_tags(self, *tags: str, match_all: bool = True) -> np.ndarray:
+        """태그로 행을 고르는 함수
+
+        :param tags: 태그들
+        :param match_all: 참이면 모든 태그, 거짓이면 하나 이상의 태그를 가진 행
+        """
+        if self._tag_rows is None:
+            # tag_ids 의 각 원소가 속한 행 번호
+            self._tag_rows = np.repeat(np.arange(len(self)), np.diff(self.tag_offsets))
+
+        masks: list[np.ndarray] = []
+
+        for tag in tags:
+            mask = np.zeros(len(self), bool)
+
+            if tag in self.tag_names:
+                mask[self._tag_rows[self.tag_ids == self.tag_names.index(tag)]] = True
+            masks.append(mask)
+
+        if not masks:
+            return np.ones(len(self), bool)
+
+        return np.logical_and.reduce(masks) if match_all else np.logical_or.reduce(masks)
+
+    def mask_between(self, column: str, start=None, end=None) -> np.ndarray:
+        """열의 값이 start 이상 end 미만인 행을 고르는 함수 (날짜 열은 'YYYY-MM-DD' 문자열도 가능)"""
+        values: np.ndarray = self.columns[column]
+        mask = np.ones(len(self), bool)
+
+        if values.dtype.kind == "M":
+            mask &= ~np.isnat(values)
+            start = None if start is None else np.datetime64(start)
+            end = None if end is None else np.datetime64(end)
+
+        if start is not None:
+            mask &= values >= start
+        if end is not None:
+            mask &= values < end
+
+        return mask
+
+    def select(self, mask: np.ndarray) -> "NovelTable":
+        """조건에 맞는 행만 남긴 새 NovelTable 을 반환하는 함수
+
+        :param mask: 행별 참/거짓 배열
+        :return: NovelTable 객체
+        """
+        counts: np.ndarray = np.diff(self.tag_offsets)
+        tag_mask: np.ndarray = np.repeat(mask, counts)
+        tag_offsets = np.concatenate([[0], np.cumsum(counts[mask])])
+        columns = {column: values[mask] for column, values in self.columns.items()}
+
+        return NovelTable(columns, self.tag_names, self.tag_ids[tag_mask], tag_offsets.astype(np.int64))
+
+    ################################################################################
+    # 집계
+    ################################################################################
+    def start_year(self) -> np.ndarray:
+        """연재 시작 연도 배열을 반환하는 함수 (없으면 -1)"""
+        dates: np.ndarray = self.columns["start_date"]
+        years: np.ndarray = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+
+        return np.where(np.isnat(dates), -1, years)
+
+    def status_counts(self) -> dict[str | None, int]:
+        """연재 상태별 소설 수를 반환하는 함수"""
+        counts: np.ndarray = np.bincount(self.columns["up_status"], minlength=len(UP_STATUS_CATEGORIES))
+
+        return {status: int(count) for status, count in zip(UP_STATUS_CATEGORIES, counts) if count}
+
+    def tag_counts(self) -> dict[str, int]:
+        """태그별 소설 수를 많은 순으로 반환하는 함수"""
+        counts: np.ndarray = np.bincount(self.tag_ids, minlength=len(self.tag_names))
+        order: np.ndarray = np.argsort(-counts, kind="stable")
+
+        return {self.tag_names[i]: int(counts[i]) for i in order if counts[i]}
+
+    def group_by(self, keys: np.ndarray, column: str, func: Callable = np.sum) -> dict:
+        """키 배열로 행을 묶어 열의 값을 집계하는 함수
+
+        :param keys: 행별 키 배열 (예: self.start_year(), self["main_genre"])
+        :param column: 집계할 열 이름
+        :param func: 집계 함수 (np.sum, np.mean, np.median, len 등)
+        :return: 키 > 집계 값
+        """
+        values: np.ndarray = self.columns[column]
+        order: np.ndarray = np.argsort(keys, kind="stable")
+        unique_keys, starts = np.unique(keys[order], return_index=True)
+        groups = np.split(values[order], starts[1:])
+
+        return {key.item(): func(group) for key, group in zip(unique_keys, groups)}
+
+    ################################################################################
+    # 파일 저장
+    ################################################################################
+    def save(self, file_path: Path) -> None:
+        """NovelTable 을 압축된 .npz 파일로 저장하는 함수
+
+        :param file_path: 파일 경로
+        """
+        arrays: dict[str, np.ndarray] = {}
+
+        for column, values in self.columns.items():
+            if values.dtype == object:
+                # 문자열 열은 NUL 문자로 이어 붙인 UTF-8 바이트로 저장
+                joined: str = "\0".join("" if value is None else value for value in values)
+                arrays["str_" + column] = np.frombuffer(joined.encode("utf-8"), np.uint8)
+            else:
+                arrays[column] = values
+
+        arrays["str_tag_names"] = np.frombuffer("\0".join(self.tag_names).encode("utf-8"), np.uint8)
+        np.savez_compressed(file_path, tag_ids=self.tag_ids, tag_offsets=self.tag_offsets, **arrays)
+
+    @classmethod
+    def load(cls, file_path: Path) -> "NovelTable":
+        """save 로 저장한 .npz 파일을 읽어 NovelTable 을 만드는 함수
+
+        :param file_path: 파일 경로
+        :return: NovelTable 객체
+        """
+        columns: dict[str, np.ndarray] = {}
+        tag_names: list[str] = []
+
+        with np.load(file_path) as npz:
+            for name in npz.files:
+                if not name.startswith("str_"):
+                    columns[name] = npz[name]
+                    continue
+
+                strings: list[str] = npz[name].tobytes().decode("utf-8").split("\0")
+
+                if name == "str_tag_names":
+                    tag_names = [tag for tag in strings if tag]
+                else:
+                    columns[name[4:]] = np.array([string or None for string in strings], object)
+
+        tag_ids = columns.pop("tag_ids")
+        tag_offsets = columns.pop("tag_offsets")
+
+        # 빈 표의 문자열 열은 "".split("\0") == [""] 이므로 행 수에 맞춤
+        for column in STR_COLUMNS:
+            columns[column] = columns[column][:len(tag_offsets) - 1]
+
+        return cls(columns, tag_names, tag_ids, tag_offsets)
@@ -0,0 +1,200 @@
+"""태그 > 소설 번호 역색인(inverted index)을 만들고 AND/OR 로 검색하는 코드
+
+소설 번호 목록(posting list)은 정렬한 뒤 직전 번호와의 차이를 varint 로 적어 압축합니다.
+예) [3, 10, 300] > 차이 [3, 7, 290] > b'\\x03\\x07\\xa2\\x02'
+인코딩과 디코딩은 NumPy 로 한꺼번에 처리하므로 10만 개 목록도 몇 ms 안에 풉니다.
+"""
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from .common import UserMeta
+from ..novel_info import Novel
+
+VARINT_MAX_BYTES: int = 5  # 2 ** 35 미만의 번호
+
+
+def encode_postings(codes: Iterable[int]) -> bytes:
+    """소설 번호 목록을 정렬, 중복 제거한 뒤 차이를 varint 로 적은 바이트로 바꾸는 함수
+
+    >>> encode_postings([300, 3, 10, 10])
+    b'\\x03\\x07\\xa2\\x02'
+
+    :param codes: 소설 번호 목록
+    :return: 압축된 posting list
+    """
+    codes = np.unique(np.asarray(list(codes) if not isinstance(codes, np.ndarray) else codes, np.int64))
+    deltas: np.ndarray = np.diff(codes, prepend=0)
+
+    # 값마다 필요한 바이트 수
+    lengths: np.ndarray = np.ones(len(deltas), np.int64)
+    for k in range(1, VARINT_MAX_BYTES):
+        lengths += deltas >= 1 << 7 * k
+
+    starts: np.ndarray = np.cumsum(lengths) - lengths
+    out: np.ndarray = np.zeros(int(lengths.sum()), np.uint8)
+
+    for k in range(VARINT_MAX_BYTES):
+        mask: np.ndarray = lengths > k
+        byte: np.ndarray = deltas[mask] >> 7 * k & 0x7F
+        out[starts[mask] + k] = byte | np.where(lengths[mask] > k + 1, 0x80, 0)
+
+    return out.tobytes()
+
+
+def decode_postings(data: bytes) -> np.ndarray:
+    """encode_postings 로 만든 바이트를 소설 번호 배열로 되돌리는 함수
+
+    >>> decode_postings(b'\\x03\\x07\\xa2\\x02').tolist()
+    [3, 10, 300]
+
+    :param data: 압축된 posting list
+    :return: 정렬된 소설 번호 배열
+    """
+    if not data:
+        return np.zeros(0, np.int64)
+
+    buffer: np.ndarray = np.frombuffer(data, np.uint8)
+    ends: np.ndarray = np.flatnonzero(buffer < 0x80)
+    starts: np.ndarray = np.concatenate([[0], ends[:-1] + 1])
+
+    # 각 바이트가 값 안에서 몇 번째 바이트인지
+    positions: np.ndarray = np.arange(len(buffer)) - np.repeat(starts, ends - starts + 1)
+    parts: np.ndarray = (buffer & 0x7F).astype(np.int64) << 7 * positions
+
+    return np.cumsum(np.add.reduceat(parts, starts))
+
+
+class TagIndex(metaclass=UserMeta):
+    """태그, 연재 상태별 소설 번호 목록을 압축해서 들고 있는 역색인 클래스.
+
+    :var postings: 태그 > 압축된 소설 번호 목록
+    :var status_postings: 연재 상태 > 압축된 소설 번호 목록
+    :var counts: 태그 > 소설 수
+    """
+    __slots__ = (
+        "postings",
+        "status_postings",
+        "counts",
+    )
+
+    def __init__(self, postings: dict[str, bytes], status_postings: dict[str, bytes], counts: dict[str, int]):
+        self.postings = postings
+        self.status_postings = status_postings
+        self.counts = counts
+
+    def __len__(self) -> int:
+        return len(self.postings)
+
+    def __contains__(self, tag: str) -> bool:
+        return tag in self.postings
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[int, Iterable[str], str | None]]) -> "TagIndex":
+        """(소설 번호, 태그 목록, 연재 상태) 들로 역색인을 만드는 함수
+
+        :param rows: (소설 번호, 태그 목록, 연재 상태) 목록 또는 제너레이터
+        :return: TagIndex 객체
+        """
+        tag_codes: dict[str, list[int]] = {}
+        status_codes: dict[str, list[int]] = {}
+
+        for code, tags, up_status in rows:
+            for tag in tags:
+                tag_codes.setdefault(tag, []).append(code)
+            if up_status:
+                status_codes.setdefault(up_status, []).append(code)
+
+        postings: dict[str, bytes] = {tag: encode_postings(codes) for tag, codes in tag_codes.items()}
+        counts: dict[str, int] = {tag: len(set(codes)) for tag, codes in tag_codes.items()}
+        status_postings: dict[str, bytes] = {status: encode_postings(codes) for status, codes in status_codes.items()}
+
+        return cls(postings, status_postings, counts)
+
+    @classmethod
+    def from_novels(cls, novels: Iterable[Novel]) -> "TagIndex":
+        """크롤링한 Novel 객체들로 역색인을 만드는 함수"""
+        return cls.from_rows((int(novel.code), novel.novel_genre or (), novel.up_status) for novel in novels)
+
+    def codes(self, tag: str) -> np.ndarray:
+        """태그가 붙은 소설 번호 배열을 반환하는 함수 (없는 태그는 빈 배열)"""
+        return decode_postings(self.postings.get(tag, b""))
+
+    def query(self, all_tags: Iterable[str] = (), any_tags: Iterable[str] = (),
+              up_statuses: Iterable[str] = ()) -> np.ndarray:
+        """태그와 연재 상태 조건에 맞는 소설 번호 배열을 반환하는 함수
+
+        예) 완결된 '판타지' + '회귀' 소설: query(["판타지", "회귀"], up_statuses=["완결"])
+
+        :param all_tags: 모두 붙어 있어야 하는 태그들 (AND)
+        :param any_tags: 하나 이상 붙어 있어야 하는 태그들 (OR)
+        :param up_statuses: 연재 상태들 中 하나 (OR)
+        :return: 정렬된 소설 번호 배열
+        """
+        all_tags = list(all_tags)
+        any_tags = list(any_tags)
+        up_statuses = list(up_statuses)
+
+        # 교집합은 짧은 목록부터 좁혀 나감
+        all_tags.sort(key=lambda tag: self.counts.get(tag, 0))
+        candidates: list[np.ndarray] = [self.codes(tag) for tag in all_tags]
+
+        if any_tags:
+            candidates.append(np.unique(np.concatenate([self.codes(tag) for tag in any_tags])))
+        if up_statuses:
+            status_codes = [decode_postings(self.status_postings.get(status, b"")) for status in up_statuses]
+            candidates.append(np.unique(np.concatenate(status_codes)))
+
+        if not candidates:
+            return np.zeros(0, np.int64)
+
+        result: np.ndarray = candidates[0]
+        for codes in candidates[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, codes, assume_unique=True)
+
+        return result
+
+    def nbytes(self) -> int:
+        """압축된 목록들의 전체 바이트 수를 반환하는 함수"""
+        return sum(map(len, self.postings.values())) + sum(map(len, self.status_postings.values()))
+
+    ################################################################################
+    # 파일 저장
+    ################################################################################
+    def save(self, file_path: Path) -> None:
+        """역색인을 .npz 파일로 저장하는 함수
+
+        :param file_path: 파일 경로
+        """
+        arrays: dict[str, np.ndarray] = {}
+
+        for name, postings in (("tag", self.postings), ("status", self.status_postings)):
+            # 키는 NUL 문자로 이어 붙인 UTF-8 바이트, 목록은 이어 붙인 바이트와 경계 배열로 저장
+            arrays[name + "_keys"] = np.frombuffer("\0".join(postings).encode("utf-8"), np.uint8)
+            arrays[name + "_data"] = np.frombuffer(b"".join(postings.values()), np.uint8)
+            arrays[name + "_offsets"] = np.cumsum([0] + [len(data) for data in postings.values()])
+
+        np.savez(file_path, tag_counts=np.array(list(self.counts.values()), np.int64), **arrays)
+
+    @classmethod
+    def load(cls, file_path: Path) -> "TagIndex":
+        """save 로 저장한 .npz 파일을 읽어 TagIndex 를 만드는 함수
+
+        :param file_path: 파일 경로
+        :return: TagIndex 객체
+        """
+        dics: list[dict[str, bytes]] = []
+
+        with np.load(file_path) as npz:
+            for name in ("tag", "status"):
+                keys: list[str] = [key for key in npz[name + "_keys"].tobytes().decode("utf-8").split("\0") if key]
+                data: bytes = npz[name + "_data"].tobytes()
+                offsets: list[int] = npz[name + "_offsets"].tolist()
+                dics.append({key: data[offsets[i]:offsets[i + 1]] for i, key in enumerate(keys)})
+
+            counts: dict[str, int] = dict(zip(dics[0], npz["tag_counts"].tolist()))
+
+        return cls(dics[0], dics[1], counts)
@@ -79,6 +79,24 @@ def input_str(prompt: str = "입력", type: type = str) -> str:
         return answer_str
 
 
+def input_text(prompt: str = "입력") -> str:
+    """한글 등 ASCII 가 아닌 글자도 받는 자유 입력 (검색어 등) 을 입력받는 함수
+
+    :param prompt: 문자열을 입력하라는 메시지
+    :return: 앞뒤 공백을 뺀, 비어 있지 않은 입력 문자열
+    """
+
+    # 빈 문자열이 아닐 때까지 반복
+    while True:
+        print()
+        answer_str: str = input(f"{prompt}: ").strip()
+
+        if len(answer_str) == 0:
+            print_under_new_line("[오류] 입력을 받지 못했어요. 이전 단계로 돌아갈게요.")
+            continue
+        return answer_str
+
+
 def input_num(num_type: str) -> int:
     """유효한 번호를 얻을 때까지 입력을 받는 함수
 
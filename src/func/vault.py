@@ -0,0 +1,514 @@
+"""Obsidian 보관함 (Markdown 폴더) 에 쓴 소설 정보 문서를 관리하는 코드
+
+문서를 쓸 때마다 내용의 해시를 목록 (manifest) 에 적어 두고, 다음에 같은 해시가 나오면 파일을 다시 쓰지 않습니다.
+조회 수처럼 크롤링할 때마다 바뀌는 통계 속성 (VAULT_STAT_KEYS) 을 해시에서 빼도록 고르면, 실제로 바뀐 소설만 다시 쓰게 됩니다.
+
+이미 있는 문서는 통째로 덮어 쓰는 대신 앞부분 속성 (frontmatter) 中 크롤러가 쓰는 속성만 고칠 수 있으므로,
+사용자가 직접 적은 '유입 경로', 'aliases' 와 본문은 그대로 남습니다.
+
+소설이 수십만 개면 한 폴더에 두기 어려우므로, 환경 변수 NOVEL_INFO_MD_LAYOUT 으로 폴더 구조를 고를 수 있습니다.
+- flat: 한 폴더 (기본값)
+- code: 6자리 번호의 앞 VAULT_SHARD_DIGITS 자리별 폴더 (000/000001 - 제목.md)
+- status: 연재 상태별 폴더 (완결/000001 - 제목.md)
+소설 번호 > 문서 경로, 해시, 받은 시각은 목록 (index) 에 적어 둡니다. 목록이 없으면 문서들의 파일 이름과 앞부분 속성을
+한 번 읽어서 만들고, 그 뒤로는 문서를 쓸 때마다 고칩니다. 목록이 있으므로
+- 최근에 받은 소설은 다시 요청하지 않고 (fresh_codes)
+- 제목이 바뀐 소설은 새 문서를 만드는 대신 기존 문서를 옮기며
+- 폴더 구조를 바꿀 때는 migrate_vault 로 기존 문서를 옮깁니다.
+"""
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from hashlib import blake2b
+from pathlib import Path, PurePosixPath
+
+from .common import DIR_CACHE, UserMeta
+from .writer import atomic_open
+from ..const.const import (NOVEL_STATUSES_NAMED_TUPLE, VAULT_FRESH_HOURS, VAULT_GOT_TIME_KEY, VAULT_HASH_EXCLUDED_KEYS,
+                           VAULT_INDEX_FILE_NAME, VAULT_LAYOUTS, VAULT_MANIFEST_FILE_NAME, VAULT_OWNED_KEYS,
+                           VAULT_SHARD_DIGITS, VAULT_UNKNOWN_STATUS_DIR)
+
+STATUS_KEYS: frozenset[str] = frozenset(NOVEL_STATUSES_NAMED_TUPLE)  # '완결: True' 처럼 하나만 있는 연재 상태 속성
+NOTE_NAME_PATTERN = re.compile(r"^(\d{6}) - .*\.md$")  # '6자리 번호 - 제목.md'
+
+
+def dump_json_atomic(file_path: Path, obj) -> None:
+    """객체를 JSON 으로 임시 파일에 쓴 뒤 file_path 로 바꿔치기하는 함수"""
+    DIR_CACHE.ensure(file_path.parent)
+    tmp_path: Path = file_path.with_name(file_path.name + ".tmp")
+    tmp_path.write_text(json.dumps(obj, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, file_path)
+
+
+def get_md_layout() -> str:
+    """환경 변수 NOVEL_INFO_MD_LAYOUT 의 보관함 폴더 구조를 반환하는 함수 (없거나 모르는 값이면 'flat')"""
+    layout: str = os.environ.get("NOVEL_INFO_MD_LAYOUT", "flat")
+    return layout if layout in VAULT_LAYOUTS else "flat"
+
+
+def md_file_name(code: str, title: str) -> str:
+    """소설 정보 문서의 파일 이름 ('6자리 번호 - 제목.md') 을 반환하는 함수"""
+    hardened_title: str = title.replace("/", "|")  # 제목의 "/"로 인한 폴더 생성 방지
+    padded_code: str = code.zfill(6)  # 노벨피아 총 소설 수는 약 30만 개 (6자리)
+
+    # 예전처럼 제목의 마지막 '.' 뒤는 확장자로 보고 바꿈
+    return Path(padded_code + " - " + hardened_title).with_suffix(".md").name
+
+
+def shard_dir(code: str, up_status: str | None, layout: str) -> str:
+    """폴더 구조에 따라 문서를 둘 하위 폴더 이름을 반환하는 함수 ('flat' 이면 빈 문자열)
+
+    :param code: 소설 번호
+    :param up_status: 연재 상태
+    :param layout: 폴더 구조 (VAULT_LAYOUTS 中 하나)
+    :return: 하위 폴더 이름
+    """
+    if layout == "code":
+        return code.zfill(6)[:VAULT_SHARD_DIGITS]
+    if layout == "status":
+        return up_status or VAULT_UNKNOWN_STATUS_DIR
+    return ""
+
+
+def md_rel_path(code: str, title: str, up_status: str | None, layout: str) -> str:
+    """Markdown 폴더 안에서의 문서 경로 ('/' 로 구분) 를 반환하는 함수"""
+    return str(PurePosixPath(shard_dir(code, up_status, layout), md_file_name(code, title)))
+
+
+def read_md_status(file_path: Path) -> str | None:
+    """문서의 앞부분 속성에서 연재 상태를 읽는 함수 (없으면 None)"""
+    parts: tuple[str, str] | None = split_frontmatter(file_path.read_text(encoding="utf-8"))
+    if parts is None:
+        return None
+
+    return next((key for key, text in frontmatter_entries(parts[0]) if key in STATUS_KEYS), None)
+
+
+def md_digest(md: str, excluded_keys: tuple[str, ...] = VAULT_HASH_EXCLUDED_KEYS) -> str:
+    """Markdown 문서의 해시를 구하는 함수. 앞부분 속성 (frontmatter) 中 excluded_keys 줄은 빼고 구함
+
+    :param md: Markdown 문서
+    :param excluded_keys: 해시에서 뺄 속성 이름
+    :return: 16 바이트 BLAKE2b 해시의 16진수 문자열
+    """
+    if excluded_keys and md.startswith("---\n"):
+        end: int = md.find("\n---\n", 3)
+        if end != -1:
+            prefixes: tuple[str, ...] = tuple(key + ":" for key in excluded_keys)
+            front: str = "\n".join(line for line in md[4:end].split("\n") if not line.startswith(prefixes))
+            md = "---\n" + front + md[end:]
+
+    return blake2b(md.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def split_frontmatter(md: str) -> tuple[str, str] | None:
+    """Markdown 문서를 앞부분 속성과 나머지 ('\\n---\\n' 부터) 로 나누는 함수 (속성이 없으면 None)"""
+    if not md.startswith("---\n"):
+        return None
+
+    end: int = md.find("\n---\n", 3)
+    if end == -1:
+        return None
+
+    return md[4:end], md[end:]
+
+
+def frontmatter_entries(front: str) -> list[tuple[str | None, str]]:
+    """앞부분 속성을 (속성 이름, 해당 줄들) 목록으로 나누는 함수
+
+    들여 쓴 줄과 '-' 로 시작하는 줄 (목록 값) 은 앞 속성에 붙입니다. 이름이 없는 줄의 이름은 None 입니다.
+
+    :param front: split_frontmatter 로 나눈 앞부분 속성
+    :return: (속성 이름, 줄들) 목록
+    """
+    entries: list[tuple[str | None, str]] = []
+
+    for line in front.split("\n"):
+        if entries and line.startswith((" ", "\t", "-")):
+            key, text = entries[-1]
+            entries[-1] = key, text + "\n" + line
+        else:
+            key, sep, value = line.partition(":")
+            entries.append((key if sep else None, line))
+
+    return entries
+
+
+def patch_frontmatter(old_md: str, new_md: str, owned_keys: tuple[str, ...] = VAULT_OWNED_KEYS) -> str | None:
+    """기존 문서의 앞부분 속성 中 크롤러가 쓰는 속성만 새 문서의 값으로 바꾼 문서를 반환하는 함수
+
+    - owned_keys 속성은 새 값으로 바꾸고, 기존 문서에 없으면 마지막으로 바꾼 속성 뒤에 넣음
+    - 연재 상태 속성은 기존 자리에 새 문서의 것 하나만 남김
+    - 그 밖의 속성 (사용자가 고친 속성 포함) 과 본문은 그대로 둠
+
+    :param old_md: 기존 문서
+    :param new_md: novel_info_to_md 로 새로 만든 문서 (삭제된 소설이면 연재 상태 문자열)
+    :param owned_keys: 크롤러가 쓰는 속성 이름
+    :return: 고친 문서, 기존 문서에 앞부분 속성이 없으면 None
+    """
+    old_parts: tuple[str, str] | None = split_frontmatter(old_md)
+    if old_parts is None:
+        return None
+    old_front, rest = old_parts
+
+    new_parts: tuple[str, str] | None = split_frontmatter(new_md)
+    if new_parts:
+        new_entries: dict[str, str] = {key: text for key, text in frontmatter_entries(new_parts[0]) if key}
+    else:
+        # 삭제된 소설은 연재 상태만 바꿈
+        new_entries = {new_md: new_md + ": True"} if new_md in STATUS_KEYS else {}
+
+    owned: dict[str, str] = {key: text for key, text in new_entries.items() if key in owned_keys or key in STATUS_KEYS}
+    new_statuses: set[str] = STATUS_KEYS.intersection(owned)
+
+    lines: list[str] = []
+    patched: set[str] = set()
+    insert_at: int | None = None
+
+    for key, text in frontmatter_entries(old_front):
+        # 바뀐 연재 상태 속성은 같은 자리에서 새 상태로 바꿈
+        if key in STATUS_KEYS and new_statuses and key not in new_statuses:
+            key = next((status for status in new_statuses if status not in patched), None)
+            if key is None:
+                continue
+        if key in patched:
+            continue
+        if key in owned:
+            text = owned[key]
+            patched.add(key)
+            insert_at = len(lines) + 1
+        lines.append(text)
+
+    missing: list[str] = [text for key, text in owned.items() if key not in patched]
+    insert_at = len(lines) if insert_at is None else insert_at
+    lines[insert_at:insert_at] = missing
+
+    return "---\n" + "\n".join(lines) + rest
+
+
+def patch_md_file(file_path: Path, new_md: str, owned_keys: tuple[str, ...] = VAULT_OWNED_KEYS) -> int | None:
+    """기존 Markdown 파일의 크롤러 속성만 고쳐 쓰는 함수
+
+    고친 문서는 임시 파일에 쓴 뒤 바꿔치기하므로, 쓰다가 멈춰도 사용자가 적은 속성과 본문이 깨지지 않습니다.
+
+    :param file_path: 기존 파일 경로
+    :param new_md: novel_info_to_md 로 새로 만든 문서
+    :param owned_keys: 크롤러가 쓰는 속성 이름
+    :return: 쓴 바이트 수 (바뀐 게 없으면 0), 파일이 없거나 앞부분 속성이 없으면 None
+    """
+    try:
+        old_data: bytes = file_path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+    patched: str | None = patch_frontmatter(old_data.decode("utf-8"), new_md, owned_keys)
+    if patched is None:
+        return None
+
+    new_data: bytes = patched.encode("utf-8")
+    if new_data == old_data:
+        return 0
+
+    with atomic_open(file_path, mode="wb") as f:
+        return f.write(new_data)
+
+
+class MdManifest(metaclass=UserMeta):
+    """파일 이름 > 마지막으로 쓴 문서의 해시 목록을 JSON 파일로 들고 있는 클래스.
+
+    :var file_path: 목록 파일 경로
+    :var digests: 파일 이름 > 해시
+    :var dirty: 저장한 뒤로 바뀌었는지 여부
+    """
+    __slots__ = (
+        "file_path",
+        "digests",
+        "dirty",
+    )
+
+    def __init__(self, file_path: Path, digests: dict[str, str] = None):
+        self.file_path = Path(file_path)
+        self.digests: dict[str, str] = digests or {}
+        self.dirty: bool = False
+
+    def __len__(self) -> int:
+        return len(self.digests)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.save()
+
+    @classmethod
+    def load(cls, md_dir: Path) -> "MdManifest":
+        """Markdown 폴더의 목록 파일을 읽는 함수 (없으면 빈 목록)
+
+        :param md_dir: Markdown 폴더 경로
+        :return: MdManifest 객체
+        """
+        file_path = Path(md_dir, VAULT_MANIFEST_FILE_NAME)
+        if not file_path.exists():
+            return cls(file_path)
+
+        return cls(file_path, json.loads(file_path.read_text(encoding="utf-8")))
+
+    def save(self) -> None:
+        """바뀐 것이 있으면 임시 파일에 쓴 뒤 바꿔치기하여 저장하는 함수"""
+        if not self.dirty:
+            return
+
+        dump_json_atomic(self.file_path, self.digests)
+        self.dirty = False
+
+    def is_unchanged(self, file_path: Path, digest: str) -> bool:
+        """파일이 있고, 마지막으로 쓴 문서와 해시가 같은지 여부"""
+        return self.digests.get(file_path.name) == digest and file_path.exists()
+
+    def update(self, file_path: Path, digest: str) -> None:
+        """파일에 쓴 문서의 해시를 기록하는 함수"""
+        if self.digests.get(file_path.name) != digest:
+            self.digests[file_path.name] = digest
+            self.dirty = True
+
+
+def scan_vault(md_dir: Path):
+    """Markdown 폴더의 소설 정보 문서를 모두 읽어서 (소설 번호, 문서 정보) 를 내는 제너레이터 함수
+
+    문서 정보는 {"path": Markdown 폴더 안의 경로, "digest": md_digest 해시, "got_time": 로컬 갱신일} 입니다.
+
+    :param md_dir: Markdown 폴더 경로
+    :return: (소설 번호, 문서 정보) 제너레이터
+    """
+    md_dir = Path(md_dir)
+
+    for file_path in md_dir.rglob("*.md"):
+        match = NOTE_NAME_PATTERN.match(file_path.name)
+        if match is None:
+            continue
+
+        md: str = file_path.read_text(encoding="utf-8")
+        parts: tuple[str, str] | None = split_frontmatter(md)
+        got_time: str | None = None
+        if parts:
+            got_time = next((text.partition(":")[2].strip() for key, text in frontmatter_entries(parts[0])
+                             if key == VAULT_GOT_TIME_KEY), None)
+
+        yield str(int(match[1])), {
+            "path": file_path.relative_to(md_dir).as_posix(),
+            "digest": md_digest(md),
+            "got_time": got_time,
+        }
+
+
+class VaultIndex(metaclass=UserMeta):
+    """소설 번호 > 문서 정보 ({"path": Markdown 폴더 안의 경로, "digest": 해시, "got_time": 받은 시각}) 목록을
+    JSON 파일로 들고 있는 클래스.
+
+    :var md_dir: Markdown 폴더 경로
+    :var file_path: 목록 파일 경로
+    :var entries: 소설 번호 > 문서 정보
+    :var dirty: 저장한 뒤로 바뀌었는지 여부
+    """
+    __slots__ = (
+        "md_dir",
+        "file_path",
+        "entries",
+        "dirty",
+    )
+
+    def __init__(self, md_dir: Path, entries: dict[str, dict] = None):
+        self.md_dir = Path(md_dir)
+        self.file_path = Path(md_dir, VAULT_INDEX_FILE_NAME)
+        self.entries: dict[str, dict] = entries or {}
+        self.dirty: bool = False
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.entries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.save()
+
+    @classmethod
+    def load(cls, md_dir: Path) -> "VaultIndex":
+        """Markdown 폴더의 목록 파일을 읽는 함수 (없으면 build 로 만듦)
+
+        :param md_dir: Markdown 폴더 경로
+        :return: VaultIndex 객체
+        """
+        file_path = Path(md_dir, VAULT_INDEX_FILE_NAME)
+        if not file_path.exists():
+            return cls.build(md_dir)
+
+        return cls(md_dir, json.loads(file_path.read_text(encoding="utf-8")))
+
+    @classmethod
+    def build(cls, md_dir: Path) -> "VaultIndex":
+        """Markdown 폴더의 문서들을 읽어서 목록을 만드는 함수
+
+        번호가 같은 문서가 여럿이면 (예전 제목의 문서 등) 가장 최근에 받은 문서를 적습니다.
+
+        :param md_dir: Markdown 폴더 경로
+        :return: VaultIndex 객체 (문서가 있으면 dirty)
+        """
+        index = cls(md_dir)
+
+        for code, entry in scan_vault(md_dir):
+            old_entry: dict | None = index.entries.get(code)
+            if old_entry is None or (entry["got_time"] or "") > (old_entry["got_time"] or ""):
+                index.entries[code] = entry
+
+        index.dirty = bool(index.entries)
+        return index
+
+    def save(self) -> None:
+        """바뀐 것이 있으면 임시 파일에 쓴 뒤 바꿔치기하여 저장하는 함수"""
+        if not self.dirty:
+            return
+
+        dump_json_atomic(self.file_path, self.entries)
+        self.dirty = False
+
+    def path_of(self, code: str) -> Path | None:
+        """소설 문서의 경로 (목록에 없으면 None)"""
+        entry: dict | None = self.entries.get(code)
+        return None if entry is None else Path(self.md_dir, entry["path"])
+
+    def place(self, code: str, rel_path: str) -> Path:
+        """소설 문서를 rel_path 에 두도록 기록하고, 목록상 다른 곳에 있던 문서는 옮기는 함수
+
+        새 경로에 이미 문서가 있으면 목록의 해시와 맞는 기존 문서로 덮어써서 중복 문서를 하나로 합침
+
+        :param code: 소설 번호
+        :param rel_path: Markdown 폴더 안에서의 새 경로
+        :return: 새 경로
+        """
+        new_path = Path(self.md_dir, rel_path)
+        entry: dict = self.entries.setdefault(code, {})
+
+        old_rel_path: str | None = entry.get("path")
+        if old_rel_path != rel_path:
+            old_path = Path(self.md_dir, old_rel_path) if old_rel_path else None
+
+            if old_path is not None and old_path.exists():
+                if new_path.exists() and not new_path.samefile(old_path):
+                    from .userIO import print_under_new_line
+                    print_under_new_line("[알림]", f"{new_path} 에 있던 중복 문서를 {old_path} 로 덮어썼습니다.")
+
+                DIR_CACHE.ensure(new_path.parent)
+                os.replace(old_path, new_path)
+
+            entry["path"] = rel_path
+            self.dirty = True
+
+        return new_path
+
+    def is_unchanged(self, code: str, digest: str) -> bool:
+        """문서가 있고, 마지막으로 쓴 문서와 해시가 같은지 여부"""
+        entry: dict | None = self.entries.get(code)
+        return entry is not None and entry.get("digest") == digest and Path(self.md_dir, entry["path"]).exists()
+
+    def update(self, code: str, digest: str, got_time: str = None) -> None:
+        """문서를 쓴 뒤 해시와 소설 정보를 받은 시각을 기록하는 함수 (경로는 place 로 먼저 기록)"""
+        entry: dict = self.entries.setdefault(code, {})
+        if entry.get("digest") != digest or entry.get("got_time") != got_time:
+            entry["digest"], entry["got_time"] = digest, got_time
+            self.dirty = True
+
+    def fresh_codes(self, max_age_hours: float = VAULT_FRESH_HOURS, now: datetime = None) -> frozenset[str]:
+        """받은 지 max_age_hours 시간이 안 된 소설 번호 집합을 반환하는 함수
+
+        :param max_age_hours: 최대 경과 시간
+        :param now: 현재 시각 (기본값 지금)
+        :return: 소설 번호 집합
+        """
+        # 로컬 갱신일은 분 단위 ISO 문자열이므로 문자열로 비교
+        since: str = ((now or datetime.now()) - timedelta(hours=max_age_hours)).isoformat(timespec="minutes")
+
+        return frozenset(code for code, entry in self.entries.items() if (entry.get("got_time") or "") >= since)
+
+
+def migrate_vault(md_dir: Path, layout: str, index: VaultIndex = None) -> int:
+    """Markdown 폴더의 소설 정보 문서를 모두 layout 구조로 옮기고 목록에 적는 함수
+
+    파일 이름은 그대로 두고, 비게 된 하위 폴더는 지웁니다. 옮길 자리에 파일이 이미 있으면 옮기지 않습니다.
+
+    :param md_dir: Markdown 폴더 경로
+    :param layout: 새 폴더 구조 (VAULT_LAYOUTS 中 하나)
+    :param index: VaultIndex 객체 (기본값 md_dir 의 목록, 이때는 저장까지 함)
+    :return: 옮긴 문서 수
+    """
+    if layout not in VAULT_LAYOUTS:
+        raise ValueError(f"폴더 구조는 {VAULT_LAYOUTS} 中 하나여야 해요: {layout}")
+
+    md_dir = Path(md_dir)
+    own_index: bool = index is None
+    if own_index:
+        index = VaultIndex.load(md_dir)
+
+    moved: int = 0
+    old_dirs: set[Path] = set()
+
+    for file_path in sorted(md_dir.rglob("*.md")):
+        match = NOTE_NAME_PATTERN.match(file_path.name)
+        if match is None:
+            continue
+
+        code: str = str(int(match[1]))
+        up_status: str | None = read_md_status(file_path) if layout == "status" else None
+        rel_path: str = str(PurePosixPath(shard_dir(code, up_status, layout), file_path.name))
+        new_path = Path(md_dir, rel_path)
+
+        if new_path != file_path:
+            if new_path.exists():
+                continue
+
+            DIR_CACHE.ensure(new_path.parent)
+            os.replace(file_path, new_path)
+            old_dirs.add(file_path.parent)
+            moved += 1
+
+        if index.entries.get(code, {}).get("path") != rel_path:
+            index.entries.setdefault(code, {})["path"] = rel_path
+            index.dirty = True
+
+    # 비게 된 하위 폴더 정리
+    for old_dir in sorted(old_dirs, key=lambda path: len(path.parts), reverse=True):
+        if old_dir != md_dir and not any(old_dir.iterdir()):
+            old_dir.rmdir()
+            DIR_CACHE.forget(old_dir)
+
+    if own_index:
+        index.save()
+
+    return moved
+
+
+def migrate_main(argv: list[str] = None) -> None:
+    """직접 실행할 때만 호출되는 메인 함수 (python -m src.func.vault code)"""
+    from argparse import ArgumentParser
+
+    from .userIO import print_under_new_line
+    from ..novel_info import get_md_dir
+
+    parser = ArgumentParser(description="보관함의 소설 정보 문서를 다른 폴더 구조로 옮깁니다.")
+    parser.add_argument("layout", choices=VAULT_LAYOUTS, help="새 폴더 구조")
+    parser.add_argument("--md-dir", type=Path, help="Markdown 폴더 경로 (기본값 get_md_dir())")
+    args = parser.parse_args(argv)
+
+    md_dir: Path = args.md_dir or get_md_dir()
+    with VaultIndex.load(md_dir) as index:
+        moved: int = migrate_vault(md_dir, args.layout, index)
+
+    print_under_new_line(f"[알림] 문서 {moved}개를 옮겼어요. 환경 변수 NOVEL_INFO_MD_LAYOUT 을 {args.layout} 로 바꿔 주세요.")
+
+
+if __name__ == "__main__":
+    migrate_main()
@@ -0,0 +1,174 @@
+"""여러 파일을 스레드 여러 개로 동시에 쓰되, 임시 파일에 쓴 뒤 바꿔치기하여 반쯤 쓴 파일이 보이지 않게 하는 코드
+
+파일은 폴더별로 WRITER_BATCH_SIZE 개씩 모아서 스레드 하나에 맡기므로, 폴더 확보는 묶음마다 한 번만 합니다.
+대기 중인 묶음은 max_workers * 2 개까지만 두므로, 파일 수와 상관없이 메모리 사용량이 일정합니다.
+파일마다 콘솔에 출력하지 않고, 쓴 파일 수와 오류만 모아 둡니다.
+파일을 다 쓴 뒤에 할 일 (해시 기록 등) 은 submit 의 on_done 으로 넘기면, 쓰기에 성공한 파일만 메인 스레드에서 불러 줍니다.
+"""
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, TextIO
+
+from .common import DIR_CACHE, UserMeta
+from ..const.const import WRITER_BATCH_SIZE, WRITER_MAX_WORKERS
+
+# (파일 경로, 내용, 다 쓰면 부를 함수)
+WriteJob = tuple[Path, str, Callable[[], None] | None]
+
+
+@contextmanager
+def atomic_open(file_path: Path, encoding: str = "utf-8", newline: str = None, mode: str = "wt"):
+    """같은 폴더의 임시 파일을 열어 주고, with 문이 끝나면 file_path 로 바꿔치기하는 함수 (폴더는 이미 있어야 함)
+
+    with 문 안에서 예외가 나면 임시 파일을 지우고 기존 파일은 그대로 둡니다.
+
+    :param file_path: 파일 경로
+    :param encoding: 인코딩 (바이너리 모드에서는 무시)
+    :param newline: open() 의 newline (csv 모듈로 쓸 때는 "")
+    :param mode: 파일 모드 ("wt" 또는 "wb")
+    :return: 임시 파일 객체
+    """
+    # 스레드, 프로세스마다 다른 임시 파일 (점으로 시작하므로 Obsidian 은 무시)
+    tmp_path: Path = file_path.with_name(f".{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    if "b" in mode:
+        encoding, newline = None, None
+
+    try:
+        with open(tmp_path, mode, encoding=encoding, newline=newline) as f:
+            yield f
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def write_atomic(file_path: Path, text: str, encoding: str = "utf-8") -> int:
+    """같은 폴더의 임시 파일에 쓴 뒤 file_path 로 바꿔치기하는 함수 (폴더는 이미 있어야 함)
+
+    :param file_path: 파일 경로
+    :param text: 파일 내용
+    :param encoding: 인코딩
+    :return: 쓴 글자 수
+    """
+    f: TextIO
+    with atomic_open(file_path, encoding) as f:
+        return f.write(text)
+
+
+class AtomicWriterPool(metaclass=UserMeta):
+    """파일을 폴더별로 묶어서 스레드 풀로 쓰는 클래스.
+
+    with 문을 벗어나거나 close() 를 부르면 남은 파일을 모두 쓰고 스레드를 닫습니다.
+
+    :var executor: 스레드 풀
+    :var batch_size: 한 스레드에 맡기는 파일 수
+    :var max_pending: 대기 중인 묶음의 최대 수
+    :var batches: 폴더 > 아직 맡기지 않은 (파일 경로, 내용, on_done) 목록
+    :var pending: 맡긴 묶음의 (Future, 묶음)
+    :var written: 쓴 파일 수
+    :var errors: (파일 경로, 오류) 목록
+    """
+    __slots__ = (
+        "executor",
+        "batch_size",
+        "max_pending",
+        "batches",
+        "pending",
+        "written",
+        "errors",
+    )
+
+    def __init__(self, max_workers: int = WRITER_MAX_WORKERS, batch_size: int = WRITER_BATCH_SIZE):
+        self.executor = ThreadPoolExecutor(max_workers)
+        self.batch_size: int = batch_size
+        self.max_pending: int = max_workers * 2
+        self.batches: dict[Path, list[WriteJob]] = {}
+        self.pending: deque[tuple[Future, list[WriteJob]]] = deque()
+        self.written: int = 0
+        self.errors: list[tuple[Path, BaseException]] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def submit(self, file_path: Path, text: str, on_done: Callable[[], None] = None) -> None:
+        """파일을 쓰도록 맡기는 함수 (같은 폴더의 파일이 batch_size 개 모이면 스레드에 넘김)
+
+        :param file_path: 파일 경로
+        :param text: 파일 내용
+        :param on_done: 파일을 다 쓰면 메인 스레드에서 부를 함수 (쓰지 못하면 부르지 않음)
+        """
+        file_path = Path(file_path)
+        batch: list[WriteJob] = self.batches.setdefault(file_path.parent, [])
+        batch.append((file_path, text, on_done))
+
+        if len(batch) >= self.batch_size:
+            self._dispatch(self.batches.pop(file_path.parent))
+
+    def flush(self) -> int:
+        """모아 둔 파일을 모두 스레드에 넘기고 다 쓸 때까지 기다리는 함수
+
+        :return: 지금까지 쓴 파일 수
+        """
+        for batch in self.batches.values():
+            self._dispatch(batch)
+        self.batches.clear()
+
+        while self.pending:
+            self._collect(*self.pending.popleft())
+
+        return self.written
+
+    def close(self) -> None:
+        """남은 파일을 모두 쓰고 스레드 풀을 닫는 함수"""
+        try:
+            self.flush()
+        finally:
+            self.executor.shutdown()
+
+    def _dispatch(self, batch: list[WriteJob]) -> None:
+        # 대기 중인 묶음이 많으면 먼저 맡긴 묶음이 끝날 때까지 기다림
+        while len(self.pending) >= self.max_pending:
+            self._collect(*self.pending.popleft())
+
+        self.pending.append((self.executor.submit(write_batch, batch), batch))
+
+    def _collect(self, future: Future, batch: list[WriteJob]) -> None:
+        written, errors = future.result()
+        self.written += written
+        self.errors += errors
+
+        # 쓰기에 성공한 파일만 on_done 을 부름
+        failed: set[Path] = {file_path for file_path, err in errors}
+        for file_path, text, on_done in batch:
+            if on_done is not None and file_path not in failed:
+                on_done()
+
+
+def write_batch(batch: list[WriteJob]) -> tuple[int, list[tuple[Path, BaseException]]]:
+    """같은 폴더의 파일들을 차례로 쓰는 함수 (폴더는 DIR_CACHE 로 한 번만 확보, on_done 은 부르지 않음)
+
+    :param batch: (파일 경로, 내용, on_done) 목록
+    :return: (쓴 파일 수, (파일 경로, 오류) 목록)
+    """
+    errors: list[tuple[Path, BaseException]] = []
+
+    try:
+        DIR_CACHE.ensure(batch[0][0].parent)
+    except OSError as err:
+        return 0, [(file_path, err) for file_path, text, on_done in batch]
+
+    for file_path, text, on_done in batch:
+        try:
+            write_atomic(file_path, text)
+        except OSError as err:
+            errors.append((file_path, err))
+
+    return len(batch) - len(errors), errors
@@ -0,0 +1,32 @@
+"""여러 테스트가 함께 쓰는 시험용 소설 정보 (테스트 모듈이 아니므로 테스트로 수집되지 않음)"""
+from src.novel_info import Novel, trusted_info_dics_to_novels
+
+
+def make_info_dic(novel_no: int, genre: str, is_complete: int, novel_type: int, start_date: str | None) -> dict:
+    """시험용 소설 정보 Dict 를 만드는 함수"""
+    return {
+        "novel_no": novel_no,
+        "novel_name": f"{novel_no}번 소설",
+        "writer_nick": "미츄리",
+        "novel_type": novel_type,
+        "novel_genre": genre,
+        "novel_story": "괴담, 저주, 여학생 등….\r\n집착해선 안 될 것들이 내게 집착한다",
+        "count_view": novel_no * 10,
+        "count_good": novel_no,
+        "count_book": novel_no % 7,
+        "count_pick": "공개전",
+        "is_del": 0,
+        "is_complete": is_complete,
+        "novel_live": 0,
+        "start_date": start_date,
+        "last_write_date": "2024-04-17 20:00:00",
+    }
+
+
+INFO_DICS: list[dict] = [
+    make_info_dic(1, '["판타지","회귀"]', 1, 1, "2021-01-07 10:38:08"),
+    make_info_dic(2, '["판타지"]', 0, 2, "2022-03-01 00:00:00"),
+    make_info_dic(3, '["회귀","현대판타지"]', 1, 2, "2022-05-05 12:00:00"),
+    make_info_dic(4, "[]", 0, 1, None),
+]
+NOVELS: list[Novel] = [*trusted_info_dics_to_novels(INFO_DICS)]
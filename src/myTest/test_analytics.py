@@ -0,0 +1,78 @@
+"""연중/완결/무회차 비율 계산 테스트"""
+from unittest import TestCase, main
+
+import numpy as np
+
+from src.const.const import ALL_NOVEL_COUNT
+from src.func.analytics import ratios
+from src.func.table import DATE_COLUMNS, INT_COLUMNS, STR_COLUMNS, UP_STATUS_CATEGORIES, NovelTable
+from src.myTest.fixtures import make_info_dic
+from src.novel_info import trusted_info_dics_to_novels
+
+
+class RatiosTest(TestCase):
+    info_dics: list[dict] = [
+        dict(make_info_dic(1, '["판타지","회귀"]', 1, 1, "2021-01-07 10:38:08"), count_book=1),
+        dict(make_info_dic(2, '["판타지"]', 0, 2, "2022-03-01 00:00:00"), count_book=5),
+        dict(make_info_dic(3, '["회귀"]', 0, 2, "2022-05-05 12:00:00"), count_book=0,
+             last_write_date="2023-01-01 00:00:00"),  # 연재 중이지만 방치
+        dict(make_info_dic(4, '["판타지"]', 0, 1, "2022-06-01 00:00:00"), count_book=0, novel_live=2),  # 연재중단
+        dict(make_info_dic(5, "[]", 0, 2, None), count_book=3, novel_live=1),  # 연재지연
+        dict(make_info_dic(6, "[]", 0, 2, None), count_book=None),  # 회차 수 모름
+    ]
+    table: NovelTable = NovelTable.from_novels(trusted_info_dics_to_novels(info_dics))
+
+    def test_total(self):
+        result: dict = ratios(self.table, as_of="2024-05-01")
+
+        self.assertEqual(6, result["count"])
+        self.assertAlmostEqual(2 / 6, result["hiatus"])
+        self.assertAlmostEqual(3 / 6, result["abandoned"])
+        self.assertAlmostEqual(1 / 6, result["completed"])
+        self.assertAlmostEqual(2 / 5, result["no_episode"])
+
+        # 기준일을 당기면 방치된 소설이 없음
+        self.assertAlmostEqual(2 / 6, ratios(self.table, as_of="2023-02-01")["abandoned"])
+
+    def test_group_by(self):
+        by_plan: dict = ratios(self.table, "plan", as_of="2024-05-01")
+        self.assertEqual({"PLUS", "자유"}, set(by_plan))
+        self.assertEqual((2, 0.5, 0.5), (by_plan["PLUS"]["count"], by_plan["PLUS"]["completed"],
+                                          by_plan["PLUS"]["hiatus"]))
+
+        by_tag: dict = ratios(self.table, "tag", as_of="2024-05-01")
+        self.assertEqual({"판타지": 3, "회귀": 2}, {tag: row["count"] for tag, row in by_tag.items()})
+        self.assertAlmostEqual(1 / 2, by_tag["회귀"]["abandoned"])
+
+        by_year: dict = ratios(self.table, "start_year", as_of="2024-05-01", min_count=2)
+        self.assertEqual({-1: 2, 2022: 3}, {year: row["count"] for year, row in by_year.items()})
+
+    def test_all_novels(self):
+        """전체 소설 수만큼의 NovelTable 로 묶음별 비율을 계산해도 소설 수가 맞는지 확인하는 테스트"""
+        rng = np.random.default_rng(0)
+        size: int = ALL_NOVEL_COUNT
+
+        columns: dict[str, np.ndarray] = {column: np.full(size, -1, dtype) for column, dtype in INT_COLUMNS.items()}
+        columns.update({column: np.full(size, np.datetime64("NaT"), "datetime64[s]") for column in DATE_COLUMNS})
+        columns.update({column: np.full(size, None, object) for column in STR_COLUMNS})
+        columns["code"] = np.arange(1, size + 1, dtype=np.int32)
+        columns["count_book"] = rng.integers(0, 300, size).astype(np.int32)
+        columns["main_genre"] = rng.integers(1, 20, size).astype(np.int16)
+        columns["start_date"] = np.datetime64("2018-01-01") + rng.integers(0, 365 * 6, size).astype("timedelta64[D]")
+        columns["last_write_date"] = columns["start_date"] + rng.integers(0, 365, size).astype("timedelta64[D]")
+        columns["up_status"] = rng.integers(1, len(UP_STATUS_CATEGORIES), size).astype(np.uint8)
+        columns["types"] = rng.choice([2, 4, 5], size).astype(np.uint8)
+
+        tag_counts: np.ndarray = rng.integers(0, 8, size)
+        tag_offsets: np.ndarray = np.concatenate([[0], np.cumsum(tag_counts)])
+        tag_ids: np.ndarray = rng.integers(0, 3000, tag_offsets[-1]).astype(np.int32)
+        table = NovelTable(columns, [f"태그{i}" for i in range(3000)], tag_ids, tag_offsets)
+
+        results = [ratios(table, by, as_of="2024-08-23") for by in (None, "main_genre", "start_year", "plan", "tag")]
+
+        self.assertEqual(size, results[0]["count"])
+        self.assertEqual(size, sum(row["count"] for row in results[1].values()))
+
+
+if __name__ == '__main__':
+    main()
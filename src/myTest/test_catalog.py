@@ -0,0 +1,113 @@
+"""소설 목록 문서, CSV/JSON 파일 테스트"""
+import csv
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from src.const.const import CATALOG_CSV_NAME, CATALOG_JSON_NAME
+from src.func.catalog import CATALOG_HEADERS, CatalogWriter, catalog_line, catalog_values
+from src.myTest import fixtures
+from src.novel_info import trusted_info_dics_to_novels
+
+
+class CatalogWriterTest(TestCase):
+    novels = fixtures.NOVELS
+
+    def test_catalog_line(self):
+        values = catalog_values(self.novels[0])
+        line: str = catalog_line(values)
+
+        self.assertTrue(line.startswith("- [소설 번호:: 1] [제목:: 1번 소설] [작가명:: 미츄리] [연재 상태:: 완결] "))
+        self.assertIn("[tags:: 판타지, 회귀]", line)
+        self.assertEqual(len(CATALOG_HEADERS), line.count("::"))
+
+        # 인라인 필드를 깨는 글자는 바꿈
+        values[1] = "[외전]\n제목"
+        self.assertIn("[제목:: (외전) 제목]", catalog_line(values))
+
+    def test_write(self):
+        with TemporaryDirectory() as tmp_dir:
+            with CatalogWriter(tmp_dir, shard_size=3) as catalog:
+                self.assertEqual(len(self.novels), catalog.write_all(self.novels))
+
+            # 목록 문서 2개 (3개 + 1개)
+            self.assertEqual(["소설 목록 001.md", "소설 목록 002.md"], [path.name for path in catalog.note_paths])
+            note: str = catalog.note_paths[1].read_text(encoding="utf-8")
+            self.assertTrue(note.startswith("---\n목록 번호: 2\n소설 수: 1\n---\n- [소설 번호:: 4]"))
+
+            with open(Path(tmp_dir, CATALOG_CSV_NAME), encoding="utf-8", newline="") as f:
+                rows: list[dict] = list(csv.DictReader(f))
+            self.assertEqual([novel.code for novel in self.novels], [row["소설 번호"] for row in rows])
+            self.assertEqual("판타지, 회귀", rows[0]["tags"])
+
+            items: list[dict] = json.loads(Path(tmp_dir, CATALOG_JSON_NAME).read_text(encoding="utf-8"))
+            self.assertEqual(["판타지", "회귀"], items[0]["tags"])
+            self.assertEqual(self.novels[2].count_view, items[2]["조회 수"])
+
+            # 소설이 줄면 남은 목록 문서는 지우고, 임시 파일은 남지 않음
+            with CatalogWriter(tmp_dir, shard_size=3) as catalog:
+                catalog.write_all(self.novels[:2])
+
+            self.assertEqual(["소설 목록 001.md"], sorted(path.name for path in Path(tmp_dir).glob("*.md")))
+            self.assertEqual([], list(Path(tmp_dir).glob(".*.tmp")))
+            self.assertEqual(2, len(json.loads(Path(tmp_dir, CATALOG_JSON_NAME).read_text(encoding="utf-8"))))
+
+    def test_error(self):
+        """쓰다가 예외가 나면 기존 CSV, JSON 파일을 그대로 두는지 확인하는 테스트"""
+        with TemporaryDirectory() as tmp_dir:
+            with CatalogWriter(tmp_dir) as catalog:
+                catalog.write_all(self.novels)
+            csv_text: str = Path(tmp_dir, CATALOG_CSV_NAME).read_text(encoding="utf-8")
+
+            with self.assertRaises(RuntimeError):
+                with CatalogWriter(tmp_dir) as catalog:
+                    catalog.write(self.novels[0])
+                    raise RuntimeError
+
+            self.assertEqual(csv_text, Path(tmp_dir, CATALOG_CSV_NAME).read_text(encoding="utf-8"))
+            self.assertEqual([], list(Path(tmp_dir).glob(".*.tmp")))
+
+            # 목록 문서도 예외가 나면 바꿔치기하지 않음
+            note_text: str = Path(tmp_dir, "소설 목록 001.md").read_text(encoding="utf-8")
+            with self.assertRaises(RuntimeError):
+                with CatalogWriter(tmp_dir, shard_size=1) as catalog:
+                    catalog.write_all(self.novels)
+                    raise RuntimeError
+
+            self.assertEqual(note_text, Path(tmp_dir, "소설 목록 001.md").read_text(encoding="utf-8"))
+            self.assertEqual([Path(tmp_dir, "소설 목록 001.md")], list(Path(tmp_dir).glob("*.md")))
+            self.assertEqual([], list(Path(tmp_dir).glob(".*.tmp")))
+
+            with self.assertRaises(ValueError):
+                CatalogWriter(tmp_dir, formats=("xlsx",))
+
+    def test_stale_notes(self):
+        """목록 번호가 1000 이상인 예전 목록 문서도 지우고, 이름이 다른 문서는 두는지 확인하는 테스트"""
+        with TemporaryDirectory() as tmp_dir:
+            stale_paths: list[Path] = [Path(tmp_dir, f"소설 목록 {number}.md") for number in (999, 1000, 12345)]
+            other_path = Path(tmp_dir, "소설 목록 메모.md")
+            for path in stale_paths + [other_path]:
+                path.write_text("예전 문서", encoding="utf-8")
+
+            with CatalogWriter(tmp_dir) as catalog:
+                catalog.write_all(self.novels)
+
+            self.assertEqual(sorted(catalog.note_paths + [other_path]), sorted(Path(tmp_dir).glob("*.md")))
+
+    def test_many_novels(self):
+        """소설 수만 개를 제너레이터로 받아서 목록 문서 여러 개로 나눠 쓰는지 확인하는 테스트"""
+        count: int = 20_000
+        info_dics = (fixtures.make_info_dic(i, '["판타지","회귀"]', i % 2, 1, "2021-01-07 10:38:08")
+                     for i in range(1, count + 1))
+
+        with TemporaryDirectory() as tmp_dir:
+            with CatalogWriter(tmp_dir) as catalog:
+                catalog.write_all(trusted_info_dics_to_novels(info_dics))
+
+            self.assertEqual(count, catalog.count)
+            self.assertEqual(4, len(catalog.note_paths))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Parquet 데이터셋 내보내기 테스트"""
+from datetime import date
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.func.dataset import EP_SCHEMA, NOVEL_SCHEMA, ParquetRowWriter, eps_to_parquet, novel_to_row
+from src.func.episode import Ep
+from src.myTest import fixtures
+
+
+class NovelsToParquet(TestCase):
+    novels = fixtures.NOVELS
+
+    def test_row_groups(self):
+        """row_group_size 개마다 row group 을 나눠 쓰는지 확인하는 테스트"""
+        with TemporaryDirectory() as tmp_dir:
+            with ParquetRowWriter(Path(tmp_dir), "novel", NOVEL_SCHEMA, date(2024, 8, 31), 3) as writer:
+                writer.write_many(novel_to_row(novel) for novel in self.novels)
+
+            self.assertEqual("crawl_date=2024-08-31", writer.file_path.parent.name)
+            self.assertEqual(2, pq.ParquetFile(writer.file_path).num_row_groups)
+
+            table = ds.dataset(Path(tmp_dir, "novel"), partitioning="hive").to_table()
+
+        self.assertEqual([1, 2, 3, 4], table["code"].to_pylist())
+        self.assertEqual(["판타지", "회귀"], table["tags"][0].as_py())
+        self.assertEqual("2021-01-07 10:38:08", str(table["start_date"][0]))
+        self.assertIsNone(table["count_pick"][0].as_py())  # '공개전'
+        self.assertEqual("2024-08-31", str(table["crawl_date"][0]))
+
+    def test_eps_to_parquet(self):
+        eps = [
+            ("30", Ep("프롤로그 : 기사와 양들이 만나는 날", "280", "https://novelpia.com/viewer/280", "2020-11-18",
+                      count_good=1, count_view=35, types={"자유"}, num=0, letter=2846)),
+            ("30", Ep("보너스", "286", num="BONUS")),
+        ]
+        with TemporaryDirectory() as tmp_dir:
+            file_path: Path = eps_to_parquet(eps, Path(tmp_dir))
+            table = pq.read_table(file_path)
+
+        self.assertEqual(EP_SCHEMA.names, table.schema.names)
+        self.assertEqual(["0", "BONUS"], table["num"].to_pylist())
+        self.assertEqual([2846, -1], table["letter"].to_pylist())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""최신 소설 번호 탐색 테스트"""
+from datetime import datetime, timedelta
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from src.func.discovery import MaxCodeFinder, get_max_code, read_max_code
+from src.func.liveness import DELETED, INVALID, LIVE, LivenessMap
+
+
+def fake_catalog(max_code: int, gaps: frozenset[int] = frozenset()):
+    """max_code 까지 등록되어 있고, gaps 는 잘못된 번호, 3의 배수는 삭제작인 가짜 요청 함수와 요청 기록"""
+    probed: list[int] = []
+
+    def probe(novel_code: int) -> int:
+        probed.append(novel_code)
+        if novel_code > max_code or novel_code in gaps:
+            return INVALID
+        return DELETED if novel_code % 3 == 0 else LIVE
+
+    return probe, probed
+
+
+class MaxCodeFinderTest(TestCase):
+    def test_find(self):
+        for max_code, start in ((310_123, 299_487), (299_487, 299_487), (1_000, 299_487), (5, 1)):
+            with self.subTest(max_code=max_code, start=start):
+                probe, probed = fake_catalog(max_code)
+                self.assertEqual(max_code, MaxCodeFinder(probe).find(start))
+
+                # 요청 수는 번호 차이의 로그에 비례
+                self.assertLess(len(probed), 400)
+
+    def test_gaps(self):
+        """중간에 잘못된 번호가 몇 개 이어져도 끝으로 보지 않는지 확인하는 테스트"""
+        gaps = frozenset(range(300_500, 300_505)) | frozenset([310_120, 310_121])
+        probe, probed = fake_catalog(310_123, gaps)
+
+        self.assertEqual(310_123, MaxCodeFinder(probe).find(299_487))
+
+        # 끝 번호 자체가 빈 번호여도 그 앞의 살아 있는 번호
+        probe, probed = fake_catalog(310_123, frozenset([310_123]))
+        self.assertEqual(310_122, MaxCodeFinder(probe).find(299_487))
+
+        probe, probed = fake_catalog(0)
+        self.assertEqual(0, MaxCodeFinder(probe).find(100))
+
+    def test_cache(self):
+        now = datetime(2024, 8, 23, 21, 36)
+
+        with TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir, "max_code.json")
+            liveness = LivenessMap()
+
+            probe, probed = fake_catalog(300_000)
+            self.assertEqual(300_000, get_max_code(probe, file_path=file_path, liveness=liveness, now=now))
+            self.assertEqual((300_000, now), read_max_code(file_path))
+            self.assertEqual(DELETED, liveness.state(300_000))  # 삭제작도 등록된 번호
+            self.assertEqual(INVALID, liveness.state(300_001))
+
+            # 저장한 지 하루가 안 지났으면 요청하지 않음
+            probed.clear()
+            self.assertEqual(300_000, get_max_code(probe, file_path=file_path, now=now + timedelta(hours=23)))
+            self.assertEqual([], probed)
+
+            # 하루가 지나면 저장한 번호부터 다시 찾음
+            probe, probed = fake_catalog(300_200)
+            self.assertEqual(300_200, get_max_code(probe, file_path=file_path, now=now + timedelta(days=1)))
+            self.assertLess(len(probed), 100)
+
+
+if __name__ == '__main__':
+    main()
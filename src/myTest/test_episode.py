@@ -286,5 +286,38 @@ class GetEpViewCount(TestCase):
         self.assertEqual(real_view_counts, [*got_view_counts])
 
 
+class EpContentToHtml(TestCase):
+    """회차 본문을 HTML 문서로 변환하는 테스트"""
+    ep = Ep("001. 능력 각성", "978", "https://novelpia.com/viewer/978", "2021-01-07", num=1)
+
+    def test_ep_content_to_html(self):
+        from src.func.episode import ep_content_to_html
+
+        lines: list[str] = ["첫 문단\n", "\n", "둘째 문단"]
+        html: str = "".join(ep_content_to_html(self.ep, lines))
+
+        self.assertIn('<link rel="stylesheet" href="style.css">', html)
+        self.assertIn("\t\t\t<p>첫 문단</p>\n\t\t\t<br>\n\t\t\t<p>둘째 문단</p>\n", html)
+        self.assertTrue(html.endswith("</html>\n"))
+
+    def test_streaming(self):
+        """본문 제너레이터를 미리 다 읽지 않고 한 문단씩 변환하는지 확인하는 테스트"""
+        from src.func.episode import ep_content_to_html
+
+        consumed: list[int] = []
+
+        def lines():
+            for i in range(3):
+                consumed.append(i)
+                yield f"{i}번째 문단"
+
+        html_gen = ep_content_to_html(self.ep, lines())
+        next(html_gen)  # 머리말
+        next(html_gen)  # <article>, 제목
+        next(html_gen)  # 첫 문단
+
+        self.assertEqual([0], consumed)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,79 @@
+"""EPUB 내려받기 기능 테스트"""
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+from zipfile import ZIP_STORED, ZipFile
+
+from src.novel_info import Novel
+
+
+class NovelToEpub(TestCase):
+    novel = Novel(tags='\n  - "현대판타지"\n  - "괴담"', novel_story="> [!TLDR] 시놉시스\n> 괴담, 저주, 여학생 등….\n")
+    novel.title = "숨겨진 흑막이 되었다"
+    novel.code = "247416"
+    novel.writer_nick = "미츄리"
+
+    ep_count: int = 50
+    ep_refs: list[tuple[str, str]] = [(str(1000 + i), f"{i:03}. 제목") for i in range(1, ep_count + 1)]
+
+    @staticmethod
+    def fake_get_ep_content(ep_code: str) -> list[str]:
+        """get_ep_content 함수 대역. 늦게 요청한 회차가 먼저 끝나도록 기다림"""
+        from time import sleep
+
+        sleep((2000 - int(ep_code)) / 1e5)
+
+        return [f"{ep_code}번 회차 본문&nbsp;\n", "\n"]
+
+    def test_novel_to_epub(self):
+        from src.epub import novel_to_epub
+
+        with TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir, "novel.epub")
+            fetched_codes: list[str] = []
+            count: int = novel_to_epub(self.novel, iter(self.ep_refs), file_path, self.fake_get_ep_content,
+                                       on_fetched=lambda ep_code, lines: fetched_codes.append(ep_code))
+
+            with ZipFile(file_path) as zf:
+                infos = zf.infolist()
+                chapters: list[str] = [zf.read(f"OEBPS/chapter/{i:05}.xhtml").decode() for i in range(1, count + 1)]
+                opf: str = zf.read("OEBPS/content.opf").decode()
+
+        # mimetype 이 압축 없이 맨 앞에 있어야 함
+        self.assertEqual(("mimetype", ZIP_STORED), (infos[0].filename, infos[0].compress_type))
+        self.assertEqual(self.ep_count, count)
+        self.assertEqual([ep_code for ep_code, title in self.ep_refs], fetched_codes)
+
+        # 회차 순서 유지
+        for (ep_code, title), chapter in zip(self.ep_refs, chapters):
+            with self.subTest(ep_code=ep_code):
+                self.assertIn(f"<h1>{title}</h1>", chapter)
+                self.assertIn(f"<p>{ep_code}번 회차 본문</p>", chapter)
+
+        self.assertIn("<dc:subject>괴담</dc:subject>", opf)
+        self.assertIn("<dc:description>괴담, 저주, 여학생 등….</dc:description>", opf)
+
+    def test_fetch_error(self):
+        """본문을 받다가 예외가 나면 파일을 남기지 않아서 다시 받을 수 있는지 확인하는 테스트"""
+        from src.epub import novel_to_epub
+
+        def failing_fetch(ep_code: str) -> list[str]:
+            if ep_code == "1010":
+                raise ConnectionError(ep_code)
+            return self.fake_get_ep_content(ep_code)
+
+        with TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir, "novel.epub")
+
+            with self.assertRaises(ConnectionError):
+                novel_to_epub(self.novel, iter(self.ep_refs), file_path, failing_fetch)
+            self.assertEqual([], list(Path(tmp_dir).iterdir()))
+
+            self.assertEqual(self.ep_count, novel_to_epub(self.novel, iter(self.ep_refs), file_path,
+                                                          self.fake_get_ep_content))
+            with self.assertRaises(FileExistsError):
+                novel_to_epub(self.novel, iter(self.ep_refs), file_path, self.fake_get_ep_content)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""소설 번호 생존 상태 기록 테스트"""
+from datetime import date, timedelta
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+import numpy as np
+
+from src.const.const import ALL_NOVEL_COUNT, NOVEL_STATUSES_NAMED_TUPLE as STATUSES
+from src.func.liveness import DELETED, DRAFT, INVALID, LIVE, UNKNOWN, LivenessMap, novel_to_state
+from src.novel_info import Novel
+
+
+class LivenessMapTest(TestCase):
+    day = date(2024, 8, 23)
+
+    def test_novel_to_state(self):
+        deleted, draft, ongoing = Novel(), Novel(), Novel()
+        deleted.up_status = STATUSES.deleted
+        draft.up_status = STATUSES.draft
+        ongoing.up_status = STATUSES.ongoing
+
+        self.assertEqual([INVALID, DELETED, DRAFT, LIVE], [novel_to_state(novel) for novel in (None, deleted, draft, ongoing)])
+
+    def test_mark_and_due(self):
+        liveness = LivenessMap(10, base_day=0)
+        liveness.mark([2, 3], DELETED, self.day)
+        liveness.mark(4, INVALID, self.day)
+        liveness.mark([1, 5], LIVE, self.day)
+
+        self.assertEqual([LIVE, DELETED, DELETED, INVALID, LIVE, UNKNOWN], [liveness.state(code) for code in range(1, 7)])
+        self.assertEqual(UNKNOWN, liveness.state(11))
+        self.assertEqual({"unknown": 5, "live": 2, "deleted": 2, "draft": 0, "invalid": 1}, liveness.counts())
+
+        # 오래 지나 기준일을 옮겨도 확인한 주는 그대로
+        checked: date = liveness.checked_on(2)
+        self.assertLessEqual(checked, self.day)
+        self.assertLess(self.day - checked, timedelta(7))
+
+        # 죽은 번호는 건너뛰고, 범위를 넘는 번호는 모두 요청
+        self.assertEqual([1, 5, 6, 7, 8, 9, 10, 11, 12], liveness.due(1, 12, self.day).tolist())
+
+        # 잘못된 번호는 4주, 삭제작은 26주 뒤에 다시 확인
+        self.assertIn(4, liveness.due(day=self.day + timedelta(weeks=4)).tolist())
+        self.assertNotIn(2, liveness.due(day=self.day + timedelta(weeks=4)).tolist())
+        self.assertIn(2, liveness.due(day=self.day + timedelta(weeks=26)).tolist())
+
+    def test_rebase(self):
+        liveness = LivenessMap(3, base_day=0)
+        liveness.mark(1, DELETED, self.day)
+        later: date = self.day + timedelta(weeks=40)
+        liveness.mark(2, LIVE, later)
+
+        self.assertEqual(DELETED, liveness.state(1))
+        self.assertLess(later - liveness.checked_on(2), timedelta(7))
+        self.assertEqual([1, 2, 3], liveness.due(day=later).tolist())
+
+    def test_save_and_load(self):
+        """전체 소설 수만큼의 상태가 몇백 KB 안에 저장되는지 확인하는 테스트"""
+        rng = np.random.default_rng(0)
+        liveness = LivenessMap(ALL_NOVEL_COUNT)
+
+        # 최근 몇 주에 걸쳐 확인했고, 20% 정도가 죽은 번호
+        states: np.ndarray = rng.choice([LIVE, DELETED, DRAFT, INVALID], ALL_NOVEL_COUNT, p=[0.78, 0.15, 0.04, 0.03])
+        weeks: np.ndarray = rng.integers(0, 6, ALL_NOVEL_COUNT)
+        for week in range(6):
+            for state in (LIVE, DELETED, DRAFT, INVALID):
+                codes: np.ndarray = np.flatnonzero((states == state) & (weeks == week)) + 1
+                liveness.mark(codes, state, self.day + timedelta(weeks=week))
+
+        with TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir, "liveness.bin")
+            size: int = liveness.save(file_path)
+            loaded: LivenessMap = LivenessMap.load(file_path)
+
+        self.assertLess(size, 300 * 1024)
+        self.assertEqual(liveness.base_day, loaded.base_day)
+        self.assertTrue(np.array_equal(liveness.cells, loaded.cells))
+        self.assertEqual(len(LivenessMap.load(Path(tmp_dir, "없는 파일"))), 0)
+
+    def test_load_size_mismatch(self):
+        """헤더의 소설 수와 본문 길이가 다르면 ValueError 를 내는지 확인하는 테스트"""
+        import zlib
+        from src.func.liveness import FILE_HEADER
+
+        liveness = LivenessMap(10)
+
+        with TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir, "liveness.bin")
+            liveness.save(file_path)
+            self.assertEqual(["liveness.bin"], [path.name for path in Path(tmp_dir).iterdir()])
+
+            data: bytes = file_path.read_bytes()
+            magic, base_day, _ = FILE_HEADER.unpack_from(data)
+            file_path.write_bytes(FILE_HEADER.pack(magic, base_day, 11) + zlib.compress(bytes(10)))
+
+            with self.assertRaises(ValueError):
+                LivenessMap.load(file_path)
+
+
+if __name__ == '__main__':
+    main()
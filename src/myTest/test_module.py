@@ -128,6 +128,33 @@ class TestAssurePathExists(TestCase):
                     print("[알림]", child, "폴더와 내용물을 모두 삭제했어요.")
                     break
 
+    def test_dir_cache(self):
+        from pathlib import Path
+        from tempfile import TemporaryDirectory
+        from unittest.mock import patch
+        from src.func.common import DirCache
+
+        dir_cache = DirCache()
+
+        with TemporaryDirectory() as tmp_dir:
+            dir_path = Path(tmp_dir, "a", "b", "c")
+
+            # 처음에만 (상위 폴더까지) 만들고, 그 뒤로는 파일 시스템을 확인하지 않음
+            self.assertTrue(dir_cache.ensure(dir_path))
+            self.assertTrue(dir_path.is_dir())
+            with patch.object(Path, "is_dir", side_effect=AssertionError), \
+                    patch.object(Path, "mkdir", side_effect=AssertionError):
+                self.assertFalse(dir_cache.ensure(dir_path))
+
+            # 이미 있는 폴더는 만들지 않음
+            self.assertFalse(dir_cache.ensure(Path(tmp_dir, "a")))
+
+            # 지워진 폴더는 잊으면 다시 만듦
+            shutil.rmtree(Path(tmp_dir, "a"))
+            dir_cache.forget(dir_path)
+            self.assertTrue(dir_cache.ensure(dir_path))
+            self.assertTrue(dir_path.is_dir())
+
 
 def join_url(code: str):
     """urljoin 함수 주석 참고"""
@@ -152,10 +179,10 @@ class GetNovelMainPage(TestCase):
 
     @skip
     def test_valid_novel_codes(self):
-        from src.const.const import ALL_NOVEL_COUNT
         from src.func.common import get_novel_main_w_error
+        from src.func.discovery import get_max_code
 
-        for num in range(1, ALL_NOVEL_COUNT):
+        for num in range(1, get_max_code() + 1):
             code = str(num)
             with self.subTest(code=code):
                 url: str = join_url(code)
@@ -165,5 +192,89 @@ class GetNovelMainPage(TestCase):
                 self.assertIsNotNone(html)
 
 
+class ChkNovelpiaUrl(TestCase):
+    """요청 없이 URL 형식만 검사하는 테스트"""
+
+    def test_is_novelpia_url(self):
+        from src.func.common import is_novelpia_url
+
+        test_set: set[tuple[str, bool]] = {
+            ("https://novelpia.com/novel/247416", True),
+            ("https://novelpia.com/viewer/978", True),
+            ("http://novelpia.com/novel/247416", False),
+            ("https://novelpia.com.evil.com/novel/1", False),
+            ("https://novelpia.com/", False),
+            ("novel/247416", False),
+        }
+        for url, answer in test_set:
+            with self.subTest(url=url):
+                self.assertEqual(answer, is_novelpia_url(url))
+
+    def test_url_setter_offline(self):
+        """url 속성을 바꿀 때 요청을 보내지 않는지 확인하는 테스트"""
+        import requests
+        from src.func.common import Page
+
+        def no_get(*args, **kwargs):
+            raise AssertionError("요청을 보냈어요.")
+
+        get, requests.get = requests.get, no_get
+        try:
+            page = Page()
+            page.url = "https://novelpia.com/novel/247416"
+            page.url = "https://example.com/novel/1"
+        finally:
+            requests.get = get
+
+        self.assertEqual("https://novelpia.com/novel/247416", page.url)
+
+    def test_chk_urls_reachable(self):
+        """노벨피아 응답인 URL 만 접속 가능으로 보고, 다른 사이트에는 요청하지 않는지 확인하는 테스트"""
+        from contextlib import nullcontext
+        from types import SimpleNamespace
+
+        import requests
+        from src.const.const import HOST
+        from src.func.common import URL_REACHABLE_CACHE, chk_urls_reachable
+
+        urls: list[str] = [join_url("247416"), "https://example.com/novel/1"]
+        requested: list[str] = []
+
+        def fake_get(url, *args, **kwargs):
+            requested.append(url)
+            return nullcontext(SimpleNamespace(ok=True, headers={"Access-Control-Allow-Origin": HOST}))
+
+        for url in urls:
+            URL_REACHABLE_CACHE.pop(url, None)
+
+        get, requests.get = requests.get, fake_get
+        try:
+            reachable: dict[str, bool] = chk_urls_reachable(urls)
+        finally:
+            requests.get = get
+
+        self.assertEqual({urls[0]: True, urls[1]: False}, reachable)
+        self.assertEqual(urls[:1], requested)
+
+    def test_chk_urls_reachable_error(self):
+        """요청 오류로 실패한 URL 은 기억하지 않는지 확인하는 테스트"""
+        import requests
+        from src.func.common import URL_REACHABLE_CACHE, chk_urls_reachable
+
+        def failing_get(*args, **kwargs):
+            raise requests.exceptions.ConnectionError("연결 끊김")
+
+        url: str = join_url("1")
+        URL_REACHABLE_CACHE.pop(url, None)
+
+        get, requests.get = requests.get, failing_get
+        try:
+            self.assertEqual({url: False}, chk_urls_reachable([url]))
+        finally:
+            requests.get = get
+
+        self.assertNotIn(url, URL_REACHABLE_CACHE)
+
+
 if __name__ == '__main__':
     main()
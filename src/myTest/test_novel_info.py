@@ -252,6 +252,22 @@ class CntNovelInStatus(GetNovelStatus):
 
                 self.assertTrue(real_up_status == got_up_status)
 
+    @skip
+    def test_estimate_shares(self):
+        """전체를 요청하는 대신 층화 표본으로 프롤로그/삭제작/연중작 비율을 추정하는 테스트"""
+        from src.func.common import print_under_new_line
+        from src.func.sampling import SHARE_NAMES, estimate_shares
+
+        result: dict = estimate_shares(max_code=self.ALL_NOVEL_COUNT,
+                                       on_batch=lambda sampler: print_under_new_line(
+                                           f"[알림] {sampler.probed}개 요청, 신뢰구간 반폭 {sampler.half_width():.4f}"))
+
+        for name in SHARE_NAMES:
+            row: dict = result[name]
+            print_under_new_line(f"{name}: {row['estimate']:.2%} ({row['low']:.2%} ~ {row['high']:.2%}, n={row['count']})")
+
+        self.assertLess(result["sampled"], self.ALL_NOVEL_COUNT)
+
 
 class NovelToMdFile(TestCase):
     from src.novel_info import Novel
@@ -394,5 +410,50 @@ PLUS: True
                 self.assertTrue(True)
 
 
+class TrustedInfoDicsToNovels(TestCase):
+    """검증을 건너뛰는 Novel 대량 생성 테스트"""
+    info_dic: dict = NovelToMdFile.info_dic
+
+    def test_same_as_init(self):
+        """Novel.__init__ 으로 만든 객체와 같은 Markdown 문서가 나오는지 확인하는 테스트"""
+        from src.novel_info import Novel, novel_info_to_md, trusted_info_dics_to_novels
+
+        fast_novel: Novel = next(trusted_info_dics_to_novels([self.info_dic]))
+
+        self.assertEqual(novel_info_to_md(Novel(self.info_dic)), novel_info_to_md(fast_novel))
+
+    def test_genre_json(self):
+        """띄어쓰기나 이스케이프가 있는 태그도 JSON 으로 읽는지 확인하는 테스트"""
+        from src.novel_info import trusted_info_dics_to_novels
+
+        genre: str = '["현대 판타지", "\\uacb0\\ud63c", "A\\"B"]'
+        novel = next(trusted_info_dics_to_novels([dict(self.info_dic, novel_genre=genre)]))
+
+        self.assertEqual(["현대 판타지", "결혼", 'A"B'], novel.novel_genre)
+        self.assertEqual('\n  - "현대 판타지"\n  - "결혼"\n  - "A\\"B"', novel.tags)
+
+    def test_genre_same_as_setter(self):
+        """Novel 의 novel_genre setter 와 빠른 경로가 같은 태그 목록과 문자열을 만드는지 확인하는 테스트"""
+        from src.novel_info import Novel, tags_to_genre, trusted_info_dics_to_novels
+
+        info_dic: dict = dict(self.info_dic, novel_genre='["현대 판타지", "A\\"B", "C\\\\D", "E-F"]')
+        novel = Novel(info_dic)
+        fast_novel = next(trusted_info_dics_to_novels([info_dic]))
+
+        self.assertEqual(["현대 판타지", 'A"B', "C\\D", "E-F"], novel.novel_genre)
+        self.assertEqual(novel.novel_genre, fast_novel.novel_genre)
+        self.assertEqual(novel.tags, fast_novel.tags)
+        self.assertEqual(novel.novel_genre, tags_to_genre(novel.tags))
+
+    def test_many_novels(self):
+        """Novel 객체 10만 개를 만들어도 순서와 값이 그대로인지 확인하는 테스트"""
+        from src.novel_info import trusted_info_dics_to_novels
+
+        count: int = 100_000
+        info_dics: list[dict] = [dict(self.info_dic, novel_no=i) for i in range(1, count + 1)]
+        novels: list = [*trusted_info_dics_to_novels(info_dics)]
+
+        self.assertEqual([str(i) for i in range(1, count + 1)], [novel.code for novel in novels])
+
 if __name__ == '__main__':
     main()
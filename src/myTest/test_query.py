@@ -0,0 +1,58 @@
+"""소설 저장소 조회 명령줄 도구 테스트"""
+import json
+from contextlib import redirect_stderr
+from io import StringIO
+from unittest import TestCase, main
+
+from src.func.store import NovelStore
+from src.myTest import fixtures
+from src.query import get_parser, run_query
+
+
+class QueryTest(TestCase):
+    novels = fixtures.NOVELS
+
+    @classmethod
+    def setUpClass(cls):
+        cls.store = NovelStore(":memory:")
+        cls.store.upsert_novels(cls.novels)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.store.close()
+
+    def query(self, *argv: str) -> str:
+        """명령줄 인자대로 조회한 결과 문자열을 반환하는 함수"""
+        f = StringIO()
+        run_query(self.store.conn, get_parser().parse_args(argv), f)
+        return f.getvalue()
+
+    def test_filters(self):
+        def codes(*argv: str) -> list[int]:
+            return [row["code"] for row in map(json.loads, self.query("--format", "json", *argv).splitlines())]
+
+        self.assertEqual([1], codes("--status", "완결", "--tag", "판타지", "--tag", "회귀"))
+        self.assertEqual([2, 3], codes("--any-tag", "판타지", "--any-tag", "회귀", "--type", "자유"))
+        self.assertEqual([1, 4], codes("--not-type", "자유"))
+        self.assertEqual([2, 3], codes("--since", "2022-01-01", "--until", "2023-01-01"))
+        self.assertEqual([3, 4], codes("--min", "count_view=30", "--sort=-count_view", "--max", "count_good=4")[::-1])
+
+    def test_group_by(self):
+        csv_text: str = self.query("--group-by", "tag", "--agg", "count", "--agg", "sum:count_view", "--format", "csv")
+        self.assertEqual(["tag,count,sum_count_view", "판타지,2,30", "현대판타지,1,30", "회귀,2,40"],
+                         csv_text.splitlines())
+
+        table_lines: list[str] = self.query("--group-by", "start_year").splitlines()
+        self.assertEqual(["start_year  count", "----------  -----", "            1", "2021        1", "2022        2"],
+                         table_lines)
+
+    def test_bad_args(self):
+        with self.assertRaises(SystemExit), redirect_stderr(StringIO()):
+            get_parser().parse_args(["--min", "title=3"])
+
+        with self.assertRaises(ValueError):
+            self.query("--group-by", "tag", "--sort", "title")
+
+
+if __name__ == '__main__':
+    main()
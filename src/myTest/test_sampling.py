@@ -0,0 +1,133 @@
+"""층화 표본 추출과 비율 추정 테스트"""
+from contextlib import contextmanager, redirect_stdout
+from io import StringIO
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from src.const.const import HTML_TITLE_PREFIX
+from src.func.sampling import SHARE_NAMES, StratifiedSampler, estimate_shares, probe_novel, wilson_interval
+
+
+def fake_probe(novel_code: int) -> dict[str, bool | None] | None:
+    """소설 번호만으로 결과가 정해지는 가짜 요청 함수
+
+    - 7의 배수는 잘못된 소설 번호
+    - 앞쪽 절반은 10개 中 3개, 뒤쪽 절반은 10개 中 1개가 삭제작 (전체 20%)
+    - 삭제작이 아니면 4개 中 1개에 프롤로그가 있음
+    """
+    if novel_code % 7 == 0:
+        return None
+
+    deleted: bool = novel_code % 10 < (3 if novel_code <= 50_000 else 1)
+
+    return {
+        "prologue": None if deleted else novel_code // 10 % 4 == 0,
+        "deleted": deleted,
+        "hiatus": False,
+    }
+
+
+class SamplingTest(TestCase):
+    def test_wilson_interval(self):
+        low, high = wilson_interval(0, 10)
+        self.assertEqual(0.0, low)
+        self.assertAlmostEqual(0.2775, high, 4)
+
+        low, high = wilson_interval(50, 100)
+        self.assertAlmostEqual(0.4038, low, 4)
+        self.assertAlmostEqual(0.5962, high, 4)
+
+        self.assertEqual((0.0, 1.0), wilson_interval(0, 0))
+
+    def test_draw(self):
+        sampler = StratifiedSampler(1_000, 10, seed=0)
+
+        codes: list[int] = sampler.draw(95) + sampler.draw(5)
+        self.assertEqual(100, len(set(codes)))
+        self.assertEqual([10] * 10, sampler.taken.tolist())
+
+        # 남은 번호를 모두 뽑으면 더 뽑을 게 없음
+        rest: list[int] = sampler.draw(5_000)
+        self.assertEqual(list(range(1, 1_001)), sorted(codes + rest))
+        self.assertTrue(sampler.exhausted)
+
+    def test_estimate(self):
+        result: dict = estimate_shares(fake_probe, 100_000, half_width=None, max_size=4_000, seed=1, max_workers=2)
+
+        self.assertEqual(4_000, result["sampled"])
+        self.assertAlmostEqual(1 / 7, result["invalid"] / result["sampled"], delta=0.02)
+
+        for name, truth in zip(SHARE_NAMES, (0.25, 0.2, 0.0)):
+            with self.subTest(name=name):
+                row: dict = result[name]
+                self.assertLessEqual(row["low"], truth)
+                self.assertLessEqual(truth, row["high"])
+                self.assertLess(row["high"] - row["low"], 0.06)
+
+        # 프롤로그 유무는 삭제작이 아닌 소설만 셈
+        self.assertLess(result["prologue"]["count"], result["deleted"]["count"])
+
+    def test_adaptive_stop(self):
+        half_widths: list[float] = []
+        result: dict = estimate_shares(fake_probe, 100_000, half_width=0.02, min_size=400, max_size=20_000,
+                                       batch_size=200, seed=2, max_workers=2,
+                                       on_batch=lambda sampler: half_widths.append(sampler.half_width()))
+
+        self.assertLess(result["sampled"], 20_000)
+        self.assertLessEqual(half_widths[-1], 0.02)
+        self.assertGreater(half_widths[-2], 0.02)
+
+    def test_probe_error(self):
+        """요청 오류가 난 소설은 따로 세고 나머지 표본 조사는 계속하는지 확인하는 테스트"""
+        def flaky_probe(novel_code: int) -> dict[str, bool | None] | None:
+            if novel_code % 11 == 0:
+                raise ConnectionError("연결 끊김")
+            return fake_probe(novel_code)
+
+        with redirect_stdout(StringIO()):
+            result: dict = estimate_shares(flaky_probe, 100_000, half_width=None, max_size=2_000, seed=3,
+                                           max_workers=2)
+
+        self.assertEqual(2_000, result["sampled"])
+        self.assertAlmostEqual(1 / 11, result["errors"] / result["sampled"], delta=0.02)
+        self.assertAlmostEqual(1 / 7, result["invalid"] / result["sampled"], delta=0.02)
+        self.assertEqual(result["sampled"] - result["errors"] - result["invalid"], result["deleted"]["count"])
+
+
+class ProbeNovelTest(TestCase):
+    """소설 메인 페이지 HTML 만으로 결과를 정하는지 확인하는 테스트 (선호작 목록은 건드리지 않음)"""
+
+    @staticmethod
+    def probe(html: str) -> dict[str, bool | None] | None:
+        @contextmanager
+        def fake_get_novel_main_w_error(url: str):
+            yield html, None
+
+        def no_likes(*args, **kwargs):
+            raise AssertionError("선호작 목록을 바꿨어요.")
+
+        with patch("src.func.common.get_novel_main_w_error", fake_get_novel_main_w_error), \
+                patch("src.novel_info.set_novel_from_likes", no_likes), \
+                patch("src.func.episode.has_prologue", return_value=True), redirect_stdout(StringIO()):
+            return probe_novel(10)
+
+    def test_probe_novel(self):
+        live_html: str = (f"<title>{HTML_TITLE_PREFIX}미대오빠의 여사친들</title>"
+                          '<div class="epnew-novel-info"><div class="epnew-novel-title">미대오빠의 여사친들</div>'
+                          '<p class="in-badge"><span>자유</span><span>{}</span></p></div>')
+
+        self.assertEqual({"prologue": True, "deleted": False, "hiatus": True},
+                         self.probe(live_html.format("연재중단")))
+        self.assertEqual({"prologue": True, "deleted": False, "hiatus": False},
+                         self.probe(live_html.format("완결")))
+
+        alert_html: str = (f"<title>{HTML_TITLE_PREFIX}건물주 아들</title>"
+                           '<div id="alert_modal"><div class="mg-b-5">{}</div></div>')
+
+        self.assertEqual({"prologue": None, "deleted": True, "hiatus": False},
+                         self.probe(alert_html.format("삭제된 소설 입니다.")))
+        self.assertIsNone(self.probe(alert_html.format("잘못된 소설 번호 입니다.")))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""다시 요청할 소설을 고르는 스케줄러 테스트"""
+from datetime import datetime
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from src.const.const import NOVEL_STATUSES_NAMED_TUPLE as STATUSES, SCHEDULE_MAX_INTERVAL_DAYS
+from src.func.episode import Ep
+from src.func.scheduler import RecrawlScheduler, expected_interval, next_change_day, to_julian_day
+from src.func.store import NovelStore
+from src.myTest.fixtures import make_info_dic
+from src.novel_info import trusted_info_dics_to_novels
+
+
+class RecrawlSchedulerTest(TestCase):
+    now = datetime(2024, 8, 23, 12)
+    info_dics: list[dict] = [
+        # 매일 연재 중, 어제 마지막으로 받음
+        dict(make_info_dic(1, "[]", 0, 2, "2024-08-01 00:00:00"), count_book=22, last_write_date="2024-08-22 00:00:00"),
+        # 완결, 한 달 전에 받음
+        dict(make_info_dic(2, "[]", 1, 2, "2023-01-01 00:00:00"), count_book=100,
+             last_write_date="2023-12-31 00:00:00"),
+        # 삭제작
+        dict(make_info_dic(3, "[]", 0, 2, "2023-01-01 00:00:00"), is_del=1),
+        # 주 1회 연재 중이지만 회차 목록상 최근에는 이틀에 한 번
+        dict(make_info_dic(4, "[]", 0, 2, "2024-01-01 00:00:00"), count_book=34, last_write_date="2024-08-20 00:00:00"),
+        # 연재중단
+        dict(make_info_dic(5, "[]", 0, 2, "2024-01-01 00:00:00"), count_book=10, novel_live=2,
+             last_write_date="2024-03-01 00:00:00"),
+    ]
+    got_times: dict[int, str] = {1: "2024-08-22T12:00", 2: "2024-07-23T12:00", 3: "2024-08-01T00:00",
+                                 4: "2024-08-21T00:00", 5: "2024-08-20T00:00"}
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.store = NovelStore(Path(self.tmp_dir.name, "novel.sqlite3"))
+
+        novels = list(trusted_info_dics_to_novels(self.info_dics))
+        for novel in novels:
+            novel._got_time = self.got_times[int(novel.code)]
+        self.store.upsert_novels(novels)
+
+        eps = [Ep(f"{i}화", str(4000 + i), ctime=f"2024-08-{2 * i:02d}") for i in range(1, 11)]
+        self.store.upsert_eps(4, eps)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def test_expected_interval(self):
+        start, last = to_julian_day("2024-08-01 00:00:00"), to_julian_day("2024-08-22 00:00:00")
+
+        self.assertAlmostEqual(1.0, expected_interval(STATUSES.ongoing, 22, start, last))
+        self.assertAlmostEqual(30.0, expected_interval(STATUSES.complete, 22, start, last))
+        self.assertAlmostEqual(2.0, expected_interval(STATUSES.ongoing, 22, start, last, cadence=2.0))
+        self.assertEqual(SCHEDULE_MAX_INTERVAL_DAYS, expected_interval(STATUSES.deleted, 22, start, last))
+
+        # 요청한 적이 없으면 가장 먼저, 예상 시각 뒤에 받았는데 그대로면 한 주기 뒤로
+        self.assertEqual(float("-inf"), next_change_day(STATUSES.ongoing, 22, start, last, None))
+        got: float = to_julian_day("2024-08-24 00:00:00")
+        self.assertAlmostEqual(got + 1.0, next_change_day(STATUSES.ongoing, 22, start, last, got))
+
+    def test_pop_due(self):
+        scheduler = RecrawlScheduler.from_store(self.store)
+
+        self.assertEqual(5, len(scheduler))
+        self.assertAlmostEqual(2.0, scheduler.cadences[4])
+
+        # 4번 (8/22 예상) > 1번 (8/23 예상), 완결작/연재중단/삭제작은 아직
+        self.assertEqual([4, 1], scheduler.pop_due(now=self.now))
+        self.assertEqual([], scheduler.pop_due(now=self.now))
+
+        # 요청 수 한도 (연재중단 10/26 예상 > 완결 11/10 예상)
+        self.assertEqual([5], scheduler.pop_due(budget=1, now=datetime(2025, 1, 1)))
+        self.assertEqual([2], scheduler.pop_due(budget=1, now=datetime(2025, 1, 1)))
+
+    def test_push_novel(self):
+        scheduler = RecrawlScheduler.from_store(self.store)
+        novel = next(self.store.iter_novels("code = ?", [1]))
+
+        # 방금 다시 받았으면 내일로 미룸
+        novel._got_time = "2024-08-23T12:00"
+        due_day: float = scheduler.push_novel(novel)
+
+        self.assertAlmostEqual(to_julian_day("2024-08-24 12:00:00"), due_day)
+        self.assertEqual([4], scheduler.pop_due(now=self.now))
+        self.assertEqual([1], scheduler.pop_due(now=datetime(2024, 8, 24, 13)))
+
+
+if __name__ == '__main__':
+    main()
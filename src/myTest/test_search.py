@@ -0,0 +1,106 @@
+"""소설 전문 검색 색인 테스트"""
+from random import Random
+from unittest import TestCase, main
+
+from src.myTest import fixtures
+from src.novel_info import trusted_info_dics_to_novels
+from src.search import EpSearchIndex, NovelSearchIndex
+
+
+class NovelSearchIndexTest(TestCase):
+    info_dics: list[dict] = [
+        dict(fixtures.make_info_dic(1, "[]", 0, 1, None), novel_name="회귀한 기사단장", novel_story="검을 든 기사"),
+        dict(fixtures.make_info_dic(2, "[]", 0, 1, None), novel_name="숨겨진 흑막이 되었다"),
+        dict(fixtures.make_info_dic(3, "[]", 0, 1, None), novel_name="마법사", novel_story="기사단에서 쫓겨났다"),
+    ]
+
+    def setUp(self):
+        self.index = NovelSearchIndex(":memory:")
+        self.index.add_novels(trusted_info_dics_to_novels(self.info_dics))
+
+    def tearDown(self):
+        self.index.close()
+
+    def test_search(self):
+        # 제목에 있는 소설이 시놉시스에만 있는 소설보다 위
+        self.assertEqual([1, 3], [row[0] for row in self.index.search("기사단")])
+        self.assertEqual([2], [row[0] for row in self.index.search("흑막")])
+        self.assertEqual([1, 2, 3], sorted(row[0] for row in self.index.search("미츄리")))
+        self.assertEqual([], self.index.search("기사단 흑막"))
+        self.assertEqual([], self.index.search("!!"))
+
+    def test_incremental(self):
+        """내용이 같은 소설은 건너뛰고, 바뀐 소설은 예전 색인을 지우는지 확인하는 테스트"""
+        self.assertEqual(0, self.index.add_novels(trusted_info_dics_to_novels(self.info_dics)))
+
+        changed = dict(self.info_dics[1], novel_name="회귀한 흑막")
+        self.assertEqual(1, self.index.add_novels(trusted_info_dics_to_novels([changed])))
+
+        self.assertEqual(3, len(self.index))
+        self.assertEqual([], self.index.search("숨겨진"))
+        self.assertEqual([1, 2], sorted(row[0] for row in self.index.search("회귀")))
+
+    def test_many_novels(self):
+        """소설 2만 개 색인에서도 흔한 낱말 검색이 결과를 돌려주는지 확인하는 테스트"""
+        random = Random(0)
+        common_words = ["회귀", "기사", "마법", "학원", "헌터", "아카데미", "흑막", "빙의", "용사", "마왕"]
+        rare_words = ["".join(random.choices("가나다라마바사아자차카타파하", k=3)) for _ in range(3000)]
+        info_dics = [
+            dict(
+                fixtures.make_info_dic(code, "[]", 0, 1, None),
+                novel_name=" ".join(random.choices(common_words + rare_words, k=3)),
+                # 흔한 낱말 2개 + 드문 낱말 58개 (흔한 낱말 하나가 소설 20% 정도에 나옴)
+                novel_story=" ".join(random.choices(common_words, k=2) + random.choices(rare_words, k=58)),
+            )
+            for code in range(1, 20_001)
+        ]
+        self.index.add_novels(trusted_info_dics_to_novels(info_dics))
+
+        for query in ("기사 마법", "아카데미", "흑막 빙의"):
+            self.assertTrue(self.index.search(query))
+
+
+class EpSearchIndexTest(TestCase):
+    def setUp(self):
+        self.index = EpSearchIndex(":memory:")
+        self.index.add_ep("30", "280", ["프롤로그", "\n", "<b>기사단장</b>이 회귀했다.", "기사 사단장"])
+        self.index.add_ep("30", "281", ["회귀한 기사단장은&nbsp;검을 들었다."])
+        self.index.add_ep("31", "290", ["흑막이 되었다."])
+
+    def tearDown(self):
+        self.index.close()
+
+    def test_search(self):
+        # 빈 줄은 건너뛰므로 줄 번호는 원래 본문 기준, '기사 사단장' 은 낱말 경계 때문에 걸러짐
+        self.assertEqual([(30, 280, 2, "기사단장이 회귀했다."), (30, 281, 0, "회귀한 기사단장은 검을 들었다.")],
+                         self.index.search("기사단 회귀"))
+        self.assertEqual([30], self.index.novel_codes("회귀"))
+        self.assertEqual([31], self.index.novel_codes("흑막"))
+        self.assertEqual(1, len(self.index.search("회귀", limit=1)))
+
+    def test_redownload(self):
+        """같은 회차를 다시 받으면 예전 줄을 지우고, 본문이 그대로면 건너뛰는지 확인하는 테스트"""
+        self.assertEqual(0, self.index.add_ep("31", "290", ["흑막이 되었다."]))
+        self.assertEqual(1, self.index.add_ep("31", "290", ["악역이 되었다."]))
+        self.assertEqual(0, self.index.add_ep("31", "291", None))
+
+        self.assertEqual([], self.index.search("흑막"))
+        self.assertEqual([(31, 290, 0, "악역이 되었다.")], self.index.search("악역"))
+        self.assertEqual(5, len(self.index))
+
+    def test_many_lines(self):
+        """본문 20만 줄 색인에서도 드문 낱말 검색이 결과를 돌려주는지 확인하는 테스트"""
+        random = Random(0)
+        rare_words = ["".join(random.choices("가나다라마바사아자차카타파하거너더러머버서어저", k=3)) for _ in range(20_000)]
+
+        for ep_code in range(1, 201):
+            lines = [" ".join(random.choices(rare_words, k=8)) for _ in range(1000)]
+            self.index.add_ep(ep_code // 20, ep_code, lines)
+
+        for word in rare_words[:10]:
+            self.assertTrue(self.index.search(word, None))
+        self.assertEqual(200_000 + 5, len(self.index))  # setUp 의 5줄
+
+
+if __name__ == '__main__':
+    main()
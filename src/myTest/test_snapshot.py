@@ -0,0 +1,67 @@
+"""통계 시계열 저장소 테스트"""
+from datetime import date, timedelta
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from src.const.const import NOVEL_SERIES_FIELDS
+from src.func.episode import Ep
+from src.func.snapshot import EP_KIND, NOVEL_KIND, SnapshotStore, decode_samples, encode_samples
+from src.func.table import to_int
+from src.myTest import fixtures
+
+
+class SnapshotStoreTest(TestCase):
+    novels = fixtures.NOVELS
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.store = SnapshotStore(Path(self.tmp_dir.name, "novel.sqlite3"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def test_encode(self):
+        samples = [(19000 + i, 1000 + i * 37, 5 + i // 3, -1) for i in range(31)]
+        data: bytes = encode_samples(samples)
+
+        self.assertEqual(samples, decode_samples(data))
+        self.assertLess(len(data), 31 * 4)
+        self.assertEqual([(19000, -(1 << 40), 1 << 40)], decode_samples(encode_samples([(19000, -(1 << 40), 1 << 40)])))
+
+    def test_series(self):
+        """월이 바뀌어도 시계열이 이어지고, 기간으로 잘라서 조회되는지 확인하는 테스트"""
+        novel = self.novels[0]
+        count_view = novel.count_view
+        start = date(2024, 1, 20)
+
+        try:
+            for i in range(20):
+                novel._count_view = count_view + i * 10
+                self.store.append_novels(self.novels, start + timedelta(days=i))
+        finally:
+            novel._count_view = count_view
+
+        series = self.store.series(NOVEL_KIND, novel.code)
+        self.assertEqual(20, len(series))
+        self.assertEqual((start, count_view, *(to_int(getattr(novel, name)) for name in NOVEL_SERIES_FIELDS[1:])),
+                         series[0])
+        self.assertEqual(count_view + 190, series[-1][1])
+
+        part = self.store.series(NOVEL_KIND, novel.code, date(2024, 1, 30), date(2024, 2, 2))
+        self.assertEqual([date(2024, 1, 30) + timedelta(days=i) for i in range(4)], [row[0] for row in part])
+
+    def test_same_day(self):
+        """같은 날 다시 추가하면 표본을 교체하는지 확인하는 테스트"""
+        day = date(2024, 5, 1)
+        ep = Ep("프롤로그", "280", num=0, count_view=10, count_good=1, comment=0)
+        self.store.append_eps([ep], day)
+        ep.count_view = 20
+        self.store.append_eps([ep], day)
+
+        self.assertEqual([(day, 20, 1, 0)], self.store.series(EP_KIND, 280))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""SQLite 저장소 테스트"""
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+from src.func.episode import Ep
+from src.func.store import NovelStore
+from src.myTest import fixtures
+from src.novel_info import novel_info_to_md
+
+
+class NovelStoreTest(TestCase):
+    novels = fixtures.NOVELS
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.store = NovelStore(Path(self.tmp_dir.name, "novel.sqlite3"))
+        self.store.upsert_novels(self.novels, batch_size=3)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        """저장한 소설을 불러와도 Markdown 문서가 같은지 확인하는 테스트"""
+        for novel, got_novel in zip(self.novels, self.store.iter_novels()):
+            with self.subTest(code=novel.code):
+                self.assertEqual(novel_info_to_md(novel), novel_info_to_md(got_novel))
+
+    def test_upsert(self):
+        """같은 번호의 소설을 다시 저장하면 갱신하는지 확인하는 테스트"""
+        novel = self.novels[0]
+        count_view = novel.count_view
+        novel._count_view = count_view + 1
+        try:
+            self.store.upsert_novels([novel])
+        finally:
+            novel._count_view = count_view
+
+        got_novel = next(self.store.iter_novels("code = ?", [novel.code]))
+
+        self.assertEqual(len(self.novels), len(self.store))
+        self.assertEqual(count_view + 1, got_novel.count_view)
+
+    def test_indexed_queries(self):
+        self.assertEqual([1, 3], self.store.codes_with_tags("회귀"))
+        self.assertEqual([1], self.store.codes_with_tags("판타지", "회귀"))
+        self.assertEqual([1, 2, 3, 4], self.store.codes_with_tags())
+        self.assertEqual([1, 2, 3, 4], self.store.codes_written_since("2024-04-17"))
+
+        plan: str = str(self.store.conn.execute("EXPLAIN QUERY PLAN SELECT code FROM novel WHERE up_status = ?",
+                                                ["완결"]).fetchall()[0][-1])
+        self.assertIn("novel_up_status", plan)
+
+    def test_upsert_eps(self):
+        eps = [Ep("프롤로그", "280", num=0, letter=2846), Ep("보너스", "286", num="BONUS")]
+        count: int = self.store.upsert_eps("30", eps)
+        rows = self.store.conn.execute("SELECT code, num FROM episode WHERE novel_code = 30 ORDER BY code").fetchall()
+
+        self.assertEqual(2, count)
+        self.assertEqual([(280, "0"), (286, "BONUS")], [tuple(row) for row in rows])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""소설 정보 열 단위 배열 테스트"""
+from unittest import TestCase, main
+
+from src.const.const import NOVEL_STATUSES_NAMED_TUPLE as STATUSES
+from src.func.table import NovelTable
+from src.myTest.fixtures import INFO_DICS, NOVELS
+from src.novel_info import Novel
+
+
+class NovelTableTest(TestCase):
+    info_dics: list[dict] = INFO_DICS
+    novels: list[Novel] = NOVELS
+    table: NovelTable = NovelTable.from_novels(novels)
+
+    def test_filters(self):
+        mask = self.table.mask_status(STATUSES.complete) & self.table.mask_tags("판타지", "회귀")
+        self.assertEqual([1], self.table.select(mask)["code"].tolist())
+
+        mask = self.table.mask_tags("판타지", "회귀", match_all=False) & self.table.mask_types("자유")
+        self.assertEqual([2, 3], self.table.select(mask)["code"].tolist())
+
+        mask = self.table.mask_between("start_date", "2022-01-01", "2023-01-01")
+        self.assertEqual([2, 3], self.table.select(mask)["code"].tolist())
+
+    def test_aggregates(self):
+        self.assertEqual({STATUSES.ongoing: 2, STATUSES.complete: 2}, self.table.status_counts())
+        self.assertEqual({"판타지": 2, "회귀": 2, "현대판타지": 1}, self.table.tag_counts())
+        self.assertEqual({-1: 40, 2021: 10, 2022: 50}, self.table.group_by(self.table.start_year(), "count_view"))
+
+    def test_round_trip(self):
+        """NovelTable > 파일 > NovelTable > Novel 변환 후에도 Markdown 문서가 같은지 확인하는 테스트"""
+        from pathlib import Path
+        from tempfile import TemporaryDirectory
+
+        from src.novel_info import novel_info_to_md
+
+        with TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir, "novels.npz")
+            self.table.save(file_path)
+            loaded: NovelTable = NovelTable.load(file_path)
+
+        for novel, got_novel in zip(self.novels, loaded.to_novels()):
+            with self.subTest(code=novel.code):
+                self.assertEqual(novel_info_to_md(novel), novel_info_to_md(got_novel))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""태그 역색인 테스트"""
+from itertools import accumulate
+from pathlib import Path
+from random import Random
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+
+import numpy as np
+
+from src.const.const import ALL_NOVEL_COUNT
+from src.const.const import NOVEL_STATUSES_NAMED_TUPLE as STATUSES
+from src.func.tag_index import TagIndex, decode_postings, encode_postings
+from src.myTest import fixtures
+
+
+class TagIndexTest(TestCase):
+    novels = fixtures.NOVELS
+
+    def test_novel_genre(self):
+        """태그 목록이 Markdown 문자열과 별도로 남아 있는지 확인하는 테스트"""
+        self.assertEqual(["회귀", "현대판타지"], self.novels[2].novel_genre)
+        self.assertIsNone(self.novels[3].novel_genre)
+
+    def test_postings(self):
+        codes = np.array([1, 2, 127, 128, 16_383, 16_384, 299_487, 2 ** 34], np.int64)
+        self.assertEqual(codes.tolist(), decode_postings(encode_postings(codes)).tolist())
+        self.assertEqual([], decode_postings(encode_postings([])).tolist())
+
+    def test_query(self):
+        index = TagIndex.from_novels(self.novels)
+
+        self.assertEqual([1], index.query(["판타지", "회귀"], up_statuses=[STATUSES.complete]).tolist())
+        self.assertEqual([1, 2, 3], index.query(any_tags=["판타지", "회귀"]).tolist())
+        self.assertEqual([3], index.query(["현대판타지"], ["판타지", "회귀"]).tolist())
+        self.assertEqual([], index.query(["없는 태그"]).tolist())
+
+        with TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir, "tags.npz")
+            index.save(file_path)
+            loaded = TagIndex.load(file_path)
+
+        self.assertEqual(index.postings, loaded.postings)
+        self.assertEqual(index.status_postings, loaded.status_postings)
+        self.assertEqual(index.counts, loaded.counts)
+
+    def test_all_novels(self):
+        """전체 소설 수만큼의 역색인에서 AND 검색 결과가 전수 조사와 같은지 확인하는 테스트"""
+        random = Random(0)
+        tags = ["판타지", "회귀", "현대판타지", "하렘", "로맨스", "무협"] + [f"태그{i}" for i in range(2000)]
+        cum_weights = list(accumulate([30, 10, 20, 15, 10, 5] + [0.05] * 2000))
+        statuses = list(STATUSES)
+        rows = [
+            (code, set(random.choices(tags, cum_weights=cum_weights, k=4)), random.choice(statuses))
+            for code in range(1, ALL_NOVEL_COUNT + 1)
+        ]
+        index = TagIndex.from_rows(rows)
+        expected = [
+            code for code, novel_tags, status in rows
+            if {"판타지", "회귀"} <= novel_tags and status == STATUSES.complete
+        ]
+
+        codes = index.query(["판타지", "회귀"], up_statuses=[STATUSES.complete])
+
+        self.assertEqual(expected, codes.tolist())
+
+
+if __name__ == '__main__':
+    main()
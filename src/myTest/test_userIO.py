@@ -1,5 +1,8 @@
 """사용자 입출력 기능 테스트"""
+from contextlib import redirect_stdout
+from io import StringIO
 from unittest import TestCase, main
+from unittest.mock import patch
 
 
 class TestChkStrType(TestCase):
@@ -18,5 +21,16 @@ class TestChkStrType(TestCase):
         self.assertTrue(is_num and not is_not_num)
 
 
+class TestInputText(TestCase):
+    def test_non_ascii(self):
+        """한글 검색어를 받고, 빈 입력은 다시 묻는지 확인하는 테스트"""
+        from src.func.userIO import input_text
+
+        with patch("builtins.input", side_effect=["  ", " 회귀 "]) as mock_input, redirect_stdout(StringIO()):
+            self.assertEqual("회귀", input_text("[입력] 검색어"))
+
+        self.assertEqual(2, mock_input.call_count)
+
+
 if __name__ == '__main__':
     main()
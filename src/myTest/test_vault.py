@@ -0,0 +1,409 @@
+"""Obsidian 보관함 관리 테스트"""
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from io import StringIO
+from os import environ
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from src.const.const import VAULT_STAT_KEYS
+from src.func.vault import (MdManifest, VaultIndex, md_digest, md_rel_path, migrate_vault, patch_frontmatter,
+                            patch_md_file)
+from src.myTest import fixtures
+from src.novel_info import get_md_dir, novel_info_to_md, novel_to_md_file, trusted_info_dics_to_novels
+
+
+class MdDigestTest(TestCase):
+    md: str = "---\n작가명: 미츄리\n회차 수: 225\n조회 수: 2198153\n로컬 갱신일: 2024-08-23T21:36\n---\n> 시놉시스\n조회 수: 본문\n"
+
+    def test_excluded_keys(self):
+        digest: str = md_digest(self.md, VAULT_STAT_KEYS)
+
+        # 통계, 로컬 갱신일만 바뀌면 같은 해시
+        stats_md: str = self.md.replace("2198153", "2198154").replace("21:36", "21:37")
+        self.assertEqual(digest, md_digest(stats_md, VAULT_STAT_KEYS))
+
+        # 회차 수, 본문이 바뀌면 다른 해시
+        self.assertNotEqual(digest, md_digest(self.md.replace("회차 수: 225", "회차 수: 226"), VAULT_STAT_KEYS))
+        self.assertNotEqual(digest, md_digest(self.md.replace("본문", "본문 수정"), VAULT_STAT_KEYS))
+
+        # 기본값은 빼는 속성이 없으므로 통계도 해시에 들어감
+        self.assertNotEqual(md_digest(self.md), md_digest(self.md.replace("2198153", "2198154")))
+
+
+class NovelToMdFileTest(TestCase):
+    novels = fixtures.NOVELS
+
+    def test_skip_unchanged(self):
+        with TemporaryDirectory() as tmp_dir, patch.dict(environ, {"NOVEL_INFO_MD_DIR": tmp_dir}):
+            md_dir: Path = get_md_dir()
+
+            with MdManifest.load(md_dir) as manifest:
+                self.assertEqual([True] * len(self.novels),
+                                 [novel_to_md_file(novel, True, True, manifest) for novel in self.novels])
+
+            # 다시 읽은 목록으로는 모두 건너뜀
+            manifest = MdManifest.load(md_dir)
+            self.assertEqual(len(self.novels), len(manifest))
+            self.assertEqual([False] * len(self.novels),
+                             [novel_to_md_file(novel, True, True, manifest) for novel in self.novels])
+            self.assertFalse(manifest.dirty)
+
+            # 통계를 해시에서 빼면 조회 수만 바뀐 소설은 건너뛰고, 회차 수가 바뀐 소설과 지워진 파일은 다시 씀
+            novel, other = self.novels[:2]
+            self.assertTrue(novel_to_md_file(novel, True, True, manifest, excluded_keys=VAULT_STAT_KEYS))
+            count_view, count_book = novel._count_view, other._count_book
+            try:
+                novel._count_view = count_view + 1
+                other._count_book = count_book + 1
+                self.assertFalse(novel_to_md_file(novel, True, True, manifest, excluded_keys=VAULT_STAT_KEYS))
+                self.assertTrue(novel_to_md_file(other, True, True, manifest, excluded_keys=VAULT_STAT_KEYS))
+
+                # 기본값으로는 조회 수만 바뀌어도 다시 씀
+                novel._count_view = count_view + 2
+                self.assertTrue(novel_to_md_file(novel, True, True, manifest))
+            finally:
+                novel._count_view, other._count_book = count_view, count_book
+
+            file_path = next(md_dir.glob(f"{novel.code.zfill(6)} - *.md"))
+            file_path.unlink()
+            self.assertTrue(novel_to_md_file(novel, True, True, manifest))
+            self.assertEqual(novel_info_to_md(novel), file_path.read_text(encoding="utf-8"))
+
+    def test_patch(self):
+        """이미 있는 문서는 사용자가 고친 속성을 남기고 크롤러 속성만 고치는지 확인하는 테스트"""
+        novel = self.novels[0]
+
+        with TemporaryDirectory() as tmp_dir, patch.dict(environ, {"NOVEL_INFO_MD_DIR": tmp_dir}):
+            self.assertTrue(novel_to_md_file(novel, True, True))
+            file_path = next(get_md_dir().glob("*.md"))
+            file_path.write_text(file_path.read_text(encoding="utf-8").replace("(직접 적어 주세요)", "친구 추천"),
+                                 encoding="utf-8")
+
+            count_view = novel._count_view
+            try:
+                novel._count_view = count_view + 1
+                self.assertTrue(novel_to_md_file(novel, True, True, patch=True))
+            finally:
+                novel._count_view = count_view
+
+            md: str = file_path.read_text(encoding="utf-8")
+            self.assertIn("유입 경로: 친구 추천\n", md)
+            self.assertIn(f"조회 수: {count_view + 1}\n", md)
+
+    def test_patch_stats_only(self):
+        """통계를 해시에서 빼면, 고치는 모드에서도 통계만 바뀐 문서는 고치지 않는지 확인하는 테스트"""
+        novel = self.novels[0]
+
+        with TemporaryDirectory() as tmp_dir, patch.dict(environ, {"NOVEL_INFO_MD_DIR": tmp_dir}):
+            with VaultIndex.load(get_md_dir()) as index:
+                self.assertTrue(novel_to_md_file(novel, True, True, index=index, excluded_keys=VAULT_STAT_KEYS))
+                file_path: Path = index.path_of(novel.code)
+                md: str = file_path.read_text(encoding="utf-8")
+
+                count_view, count_book = novel._count_view, novel._count_book
+                try:
+                    novel._count_view = count_view + 1
+                    self.assertFalse(novel_to_md_file(novel, True, True, patch=True, index=index,
+                                                      excluded_keys=VAULT_STAT_KEYS))
+                    self.assertEqual(md, file_path.read_text(encoding="utf-8"))
+
+                    # 해시에 들어가는 속성이 바뀌면 통계도 함께 고침
+                    novel._count_book = count_book + 1
+                    self.assertTrue(novel_to_md_file(novel, True, True, patch=True, index=index,
+                                                     excluded_keys=VAULT_STAT_KEYS))
+                finally:
+                    novel._count_view, novel._count_book = count_view, count_book
+
+                md = file_path.read_text(encoding="utf-8")
+                self.assertIn(f"회차 수: {count_book + 1}\n", md)
+                self.assertIn(f"조회 수: {count_view + 1}\n", md)
+
+
+class MybookMainTest(TestCase):
+    """선호작을 다음 날 다시 받아도 바뀐 소설만 쓰는지 확인하는 테스트 (선호작 목록 요청은 가짜)"""
+
+    @staticmethod
+    def run_mybook_main(got_time: str, count_book_of_first: int = None) -> str:
+        from src.user.mybook import mybook_main
+
+        novels = [*trusted_info_dics_to_novels(fixtures.INFO_DICS)]
+        for novel in novels:
+            novel._got_time = got_time
+        if count_book_of_first is not None:
+            novels[0]._count_book = count_book_of_first
+
+        with patch("src.novel_info.set_novel_from_likes", return_value=(iter(novels), len(novels))), \
+                redirect_stdout(StringIO()) as out:
+            mybook_main()
+
+        return out.getvalue()
+
+    def test_next_day(self):
+        with TemporaryDirectory() as tmp_dir, patch.dict(environ, {"NOVEL_INFO_MD_DIR": tmp_dir}):
+            count: int = len(fixtures.INFO_DICS)
+            self.assertIn(f"{count}개 中 {count}개를 썼어요.", self.run_mybook_main("2024-08-23T21:36"))
+
+            md_dir: Path = get_md_dir()
+            before: dict[Path, tuple[int, int]] = {
+                file_path: (file_path.stat().st_ino, file_path.stat().st_mtime_ns) for file_path in md_dir.glob("*.md")
+            }
+
+            # 같은 소설을 다음 날 받으면 (로컬 갱신일만 바뀜) 하나도 쓰지 않음
+            self.assertIn(f"{count}개 中 0개를 썼어요.", self.run_mybook_main("2024-08-24T21:36"))
+            after: dict[Path, tuple[int, int]] = {
+                file_path: (file_path.stat().st_ino, file_path.stat().st_mtime_ns) for file_path in md_dir.glob("*.md")
+            }
+            self.assertEqual(before, after)
+
+            # 받은 시각은 기록하므로 최근에 받은 소설로 봄
+            self.assertEqual("2024-08-24T21:36", VaultIndex.load(md_dir).entries["1"]["got_time"])
+
+            # 회차 수가 바뀐 소설만 씀
+            self.assertIn(f"{count}개 中 1개를 썼어요.", self.run_mybook_main("2024-08-25T21:36", 99))
+
+
+class VaultLayoutTest(TestCase):
+    novels = fixtures.NOVELS
+
+    def test_md_rel_path(self):
+        self.assertEqual("000001 - 제목|부제.md", md_rel_path("1", "제목/부제", "완결", "flat"))
+        self.assertEqual("001/001234 - 제목.md", md_rel_path("1234", "제목", "완결", "code"))
+        self.assertEqual("완결/001234 - 제목.md", md_rel_path("1234", "제목", "완결", "status"))
+        self.assertEqual("알 수 없음/001234 - 제목.md", md_rel_path("1234", "제목", None, "status"))
+
+    def test_sharded_write(self):
+        with TemporaryDirectory() as tmp_dir, \
+                patch.dict(environ, {"NOVEL_INFO_MD_DIR": tmp_dir, "NOVEL_INFO_MD_LAYOUT": "code"}):
+            md_dir: Path = get_md_dir()
+
+            with VaultIndex.load(md_dir) as index:
+                for novel in self.novels:
+                    self.assertTrue(novel_to_md_file(novel, True, True, index=index))
+
+            index = VaultIndex.load(md_dir)
+            self.assertEqual(len(self.novels), len(index))
+            for novel in self.novels:
+                file_path: Path = index.path_of(novel.code)
+                self.assertEqual(novel.code.zfill(6)[:3], file_path.parent.name)
+                self.assertEqual(novel_info_to_md(novel), file_path.read_text(encoding="utf-8"))
+
+            # 연재 상태별 구조로 바꾸면 목록에 적힌 문서를 옮김 (내용은 그대로이므로 고치지는 않음)
+            novel = self.novels[0]
+            with patch.dict(environ, {"NOVEL_INFO_MD_LAYOUT": "status"}):
+                self.assertFalse(novel_to_md_file(novel, True, True, patch=True, index=index))
+
+            self.assertEqual(Path(md_dir, novel.up_status), index.path_of(novel.code).parent)
+            self.assertEqual(len(self.novels), len(list(md_dir.rglob("*.md"))))
+
+    def test_migrate(self):
+        with TemporaryDirectory() as tmp_dir, patch.dict(environ, {"NOVEL_INFO_MD_DIR": tmp_dir}):
+            md_dir: Path = get_md_dir()
+            for novel in self.novels:
+                novel_to_md_file(novel, True, True)
+            Path(md_dir, "메모.md").write_text("번호 없는 문서", encoding="utf-8")
+
+            # 한 폴더 > 번호 앞자리별 폴더 > 연재 상태별 폴더 > 한 폴더
+            self.assertEqual(len(self.novels), migrate_vault(md_dir, "code"))
+            self.assertEqual([], list(md_dir.glob("0*.md")))
+
+            self.assertEqual(len(self.novels), migrate_vault(md_dir, "status"))
+            index = VaultIndex.load(md_dir)
+            for novel in self.novels:
+                self.assertEqual(md_rel_path(novel.code, novel.title, novel.up_status, "status"),
+                                 index.entries[novel.code]["path"])
+
+            migrate_vault(md_dir, "flat")
+            self.assertEqual(sorted(path.name for path in md_dir.rglob("*.md")),
+                             sorted(path.name for path in md_dir.glob("*.md")))
+            self.assertEqual([], [path for path in md_dir.iterdir() if path.is_dir()])
+            self.assertEqual(0, migrate_vault(md_dir, "flat"))
+
+            with self.assertRaises(ValueError):
+                migrate_vault(md_dir, "year")
+
+
+class VaultIndexTest(TestCase):
+    novels = fixtures.NOVELS
+
+    def test_build(self):
+        """목록이 없으면 파일 이름과 앞부분 속성으로 만드는지 확인하는 테스트"""
+        novel = self.novels[0]
+
+        with TemporaryDirectory() as tmp_dir, patch.dict(environ, {"NOVEL_INFO_MD_DIR": tmp_dir}):
+            md_dir: Path = get_md_dir()
+            for other in self.novels:
+                novel_to_md_file(other, True, True)
+
+            # 예전 제목으로 먼저 받은 문서
+            old_md: str = novel_info_to_md(novel).replace(f"로컬 갱신일: {novel.got_time}", "로컬 갱신일: 2020-01-01T00:00")
+            Path(md_dir, f"{novel.code.zfill(6)} - 예전 제목.md").write_text(old_md, encoding="utf-8")
+
+            index = VaultIndex.load(md_dir)
+            self.assertTrue(index.dirty)
+            self.assertEqual(len(self.novels), len(index))
+
+            entry: dict = index.entries[novel.code]
+            self.assertEqual(md_rel_path(novel.code, novel.title, novel.up_status, "flat"), entry["path"])
+            self.assertEqual(md_digest(novel_info_to_md(novel)), entry["digest"])
+            self.assertEqual(novel.got_time, entry["got_time"])
+
+            # 받은 지 얼마 안 된 소설
+            now = datetime.fromisoformat(novel.got_time)
+            self.assertEqual(frozenset(other.code for other in self.novels), index.fresh_codes(24, now))
+            self.assertEqual(frozenset(), index.fresh_codes(24, now + timedelta(days=2)))
+
+    def test_rename(self):
+        """제목이 바뀐 소설은 새 문서를 만들지 않고 기존 문서를 옮기는지 확인하는 테스트"""
+        novel = self.novels[0]
+
+        with TemporaryDirectory() as tmp_dir, patch.dict(environ, {"NOVEL_INFO_MD_DIR": tmp_dir}):
+            md_dir: Path = get_md_dir()
+
+            with VaultIndex.load(md_dir) as index:
+                self.assertTrue(novel_to_md_file(novel, True, True, index=index))
+                self.assertFalse(novel_to_md_file(novel, True, True, patch=True, index=index))
+
+            title: str = novel.title
+            try:
+                novel._title = title + " (개정판)"
+                # 제목은 문서 내용에 없으므로 옮기기만 하고 쓰지는 않음
+                index = VaultIndex.load(md_dir)
+                self.assertFalse(novel_to_md_file(novel, True, True, patch=True, index=index))
+                new_path: Path = index.path_of(novel.code)
+            finally:
+                novel._title = title
+
+            self.assertEqual([new_path], list(md_dir.glob("*.md")))
+            self.assertEqual(f"{novel.code.zfill(6)} - {title} (개정판).md", new_path.name)
+
+    def test_rename_onto_duplicate(self):
+        """옮길 경로에 이미 문서가 있으면 기존 문서로 덮어써서 중복 문서가 남지 않는지 확인하는 테스트"""
+        novel = self.novels[0]
+
+        with TemporaryDirectory() as tmp_dir, patch.dict(environ, {"NOVEL_INFO_MD_DIR": tmp_dir}):
+            md_dir: Path = get_md_dir()
+
+            with VaultIndex.load(md_dir) as index:
+                self.assertTrue(novel_to_md_file(novel, True, True, index=index))
+                old_path: Path = index.path_of(novel.code)
+                old_text: str = old_path.read_text(encoding="utf-8")
+
+            title: str = novel.title
+            try:
+                novel._title = title + " (개정판)"
+                dup_path: Path = md_dir / f"{novel.code.zfill(6)} - {novel.title}.md"
+                dup_path.write_text("중복 문서", encoding="utf-8")
+
+                index = VaultIndex.load(md_dir)
+                with redirect_stdout(StringIO()) as out:
+                    self.assertFalse(novel_to_md_file(novel, True, True, patch=True, index=index))
+            finally:
+                novel._title = title
+
+            self.assertIn("중복 문서", out.getvalue())
+            self.assertEqual([dup_path], list(md_dir.glob("*.md")))
+            self.assertEqual(old_text, dup_path.read_text(encoding="utf-8"))
+
+    def test_unchanged_got_time(self):
+        """내용이 같아서 쓰지 않은 소설도 받은 시각은 기록하는지 확인하는 테스트"""
+        novel = self.novels[0]
+
+        with TemporaryDirectory() as tmp_dir, patch.dict(environ, {"NOVEL_INFO_MD_DIR": tmp_dir}):
+            with VaultIndex.load(get_md_dir()) as index:
+                got_time: str = novel.got_time
+                try:
+                    novel._got_time = "2020-01-01T00:00"
+                    self.assertTrue(novel_to_md_file(novel, True, True, index=index, excluded_keys=VAULT_STAT_KEYS))
+
+                    # 로컬 갱신일만 바뀌었으므로 쓰지 않음
+                    novel._got_time = got_time
+                    self.assertFalse(novel_to_md_file(novel, True, True, index=index, excluded_keys=VAULT_STAT_KEYS))
+                finally:
+                    novel._got_time = got_time
+
+            index = VaultIndex.load(get_md_dir())
+            self.assertEqual(got_time, index.entries[novel.code]["got_time"])
+            self.assertIn(novel.code, index.fresh_codes(24, datetime.fromisoformat(got_time)))
+
+
+class PatchFrontmatterTest(TestCase):
+    old_md: str = """---
+aliases:
+  - 흑막
+유입 경로: 친구 추천
+작가명: 미츄리
+tags:
+  - "괴담"
+연재 중: True
+완독일: 2024-05-01T00:00
+최근(예정) 연재일: 2024-04-17 20:00:00
+회차 수: 225
+조회 수: 2198153
+별점: 5
+---
+
+> [!TLDR] 시놉시스
+> 괴담
+내 감상: 재밌음
+"""
+    new_md: str = """---
+aliases:
+  - (직접 적어 주세요)
+유입 경로: (직접 적어 주세요)
+작가명: 미츄리
+tags:
+  - "괴담"
+  - "집착"
+완결: True
+완독일: 0000-00-00T00:00
+최근(예정) 연재일: 2024-04-18 20:00:00
+로컬 갱신일: 2024-08-23T21:36
+회차 수: 226
+조회 수: 2200000
+---
+
+> [!TLDR] 시놉시스
+> 괴담
+"""
+
+    def test_patch(self):
+        patched: str = patch_frontmatter(self.old_md, self.new_md)
+
+        # 크롤러 속성 (날짜, 통계, 연재 상태) 만 바뀌고, 로컬 갱신일은 마지막으로 고친 속성 뒤에 들어감
+        expected: str = (self.old_md.replace("연재 중: True", "완결: True")
+                         .replace("2024-04-17 20:00:00", "2024-04-18 20:00:00")
+                         .replace("회차 수: 225\n조회 수: 2198153", "회차 수: 226\n조회 수: 2200000\n로컬 갱신일: 2024-08-23T21:36"))
+        self.assertEqual(expected, patched)
+
+        # 다시 고쳐도 그대로
+        self.assertEqual(patched, patch_frontmatter(patched, self.new_md))
+
+        # 삭제된 소설은 연재 상태만
+        self.assertEqual(self.old_md.replace("연재 중: True", "삭제: True"), patch_frontmatter(self.old_md, "삭제"))
+
+        # 앞부분 속성이 없는 문서는 고치지 않음
+        self.assertIsNone(patch_frontmatter("그냥 메모\n", self.new_md))
+
+    def test_patch_md_file(self):
+        with TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir, "000001 - 제목.md")
+            file_path.write_text(self.old_md, encoding="utf-8")
+
+            patched: str = patch_frontmatter(self.old_md, self.new_md)
+            self.assertEqual(len(patched.encode("utf-8")), patch_md_file(file_path, self.new_md))
+            self.assertEqual(patched, file_path.read_text(encoding="utf-8"))
+            self.assertEqual(0, patch_md_file(file_path, self.new_md))
+
+            # 임시 파일에 쓴 뒤 바꿔치기하므로 임시 파일은 남지 않음
+            self.assertTrue(patch_md_file(file_path, self.new_md.replace("2200000", "2200001")))
+            self.assertIn("조회 수: 2200001\n", file_path.read_text(encoding="utf-8"))
+            self.assertEqual([file_path], list(Path(tmp_dir).iterdir()))
+
+            self.assertIsNone(patch_md_file(Path(tmp_dir, "없는 파일.md"), self.new_md))
+
+
+if __name__ == '__main__':
+    main()
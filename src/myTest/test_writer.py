@@ -0,0 +1,150 @@
+"""스레드 풀로 파일을 쓰는 코드 테스트"""
+from os import environ
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from src.func.vault import VaultIndex, md_digest
+from src.func.writer import AtomicWriterPool, write_atomic
+from src.myTest import fixtures
+from src.novel_info import get_md_dir, novel_info_to_md, novel_to_md_file, trusted_info_dics_to_novels
+
+
+class AtomicWriterPoolTest(TestCase):
+    def test_write_atomic(self):
+        with TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir, "000001 - 제목.md")
+            file_path.write_text("예전 문서", encoding="utf-8")
+
+            self.assertEqual(len("새 문서"), write_atomic(file_path, "새 문서"))
+            self.assertEqual("새 문서", file_path.read_text(encoding="utf-8"))
+            self.assertEqual([file_path], list(Path(tmp_dir).iterdir()))
+
+    def test_submit(self):
+        with TemporaryDirectory() as tmp_dir:
+            # 폴더 3개에 나눠서, 묶음 크기보다 많이 씀
+            file_paths: list[Path] = [Path(tmp_dir, f"{i % 3}", f"{i:06d}.md") for i in range(100)]
+
+            with AtomicWriterPool(max_workers=2, batch_size=8) as writer:
+                for i, file_path in enumerate(file_paths):
+                    writer.submit(file_path, f"문서 {i}\n")
+
+            self.assertEqual(len(file_paths), writer.written)
+            self.assertEqual([], writer.errors)
+            for i, file_path in enumerate(file_paths):
+                self.assertEqual(f"문서 {i}\n", file_path.read_text(encoding="utf-8"))
+
+            # 임시 파일은 남지 않음
+            self.assertEqual([], list(Path(tmp_dir).rglob("*.tmp")))
+
+    def test_errors(self):
+        with TemporaryDirectory() as tmp_dir:
+            # 폴더를 만들 자리에 파일이 있으면 그 묶음은 모두 오류
+            Path(tmp_dir, "file").write_text("", encoding="utf-8")
+
+            done: list[str] = []
+            with AtomicWriterPool() as writer:
+                writer.submit(Path(tmp_dir, "file", "a.md"), "a", lambda: done.append("a"))
+                writer.submit(Path(tmp_dir, "ok", "b.md"), "b", lambda: done.append("b"))
+
+                # 다 쓰기 전에는 부르지 않음
+                self.assertEqual([], done)
+
+            self.assertEqual(1, writer.written)
+            self.assertEqual([Path(tmp_dir, "file", "a.md")], [file_path for file_path, err in writer.errors])
+
+            # 쓰지 못한 파일은 부르지 않음
+            self.assertEqual(["b"], done)
+
+    def test_novel_to_md_file(self):
+        novels = fixtures.NOVELS
+
+        with TemporaryDirectory() as tmp_dir, patch.dict(environ, {"NOVEL_INFO_MD_DIR": tmp_dir}):
+            with AtomicWriterPool() as writer:
+                self.assertEqual([True] * len(novels), [novel_to_md_file(novel, True, True, writer=writer)
+                                                        for novel in novels])
+
+            self.assertEqual(len(novels), writer.written)
+            for novel in novels:
+                file_path = next(get_md_dir().glob(f"{novel.code.zfill(6)} - *.md"))
+                self.assertEqual(novel_info_to_md(novel), file_path.read_text(encoding="utf-8"))
+
+            # 해시는 파일을 다 쓴 뒤에만 기록
+            novel = novels[0]
+            with VaultIndex.load(get_md_dir()) as index:
+                novel._count_view, count_view = novel._count_view + 1, novel._count_view
+                try:
+                    old_digest: str = index.entries[novel.code]["digest"]
+                    with AtomicWriterPool() as writer:
+                        self.assertTrue(novel_to_md_file(novel, True, True, writer=writer, index=index))
+                        self.assertEqual(old_digest, index.entries[novel.code]["digest"])
+                    self.assertEqual(md_digest(novel_info_to_md(novel)), index.entries[novel.code]["digest"])
+                finally:
+                    novel._count_view = count_view
+
+            # 덮어 쓰지 않으면 이미 있는 파일은 건너뜀
+            with AtomicWriterPool() as writer:
+                self.assertFalse(novel_to_md_file(novels[0], True, False, writer=writer))
+            self.assertEqual(0, writer.written)
+
+    def test_many_files(self):
+        """대기 중인 묶음 수를 넘길 만큼 문서를 써도 빠짐없이 쓰는지 확인하는 테스트"""
+        count: int = 20_000
+        md: str = novel_info_to_md(fixtures.NOVELS[0])
+
+        with TemporaryDirectory() as tmp_dir:
+            with AtomicWriterPool() as writer:
+                for i in range(count):
+                    writer.submit(Path(tmp_dir, f"{i:06d}.md"), md)
+
+            self.assertEqual(count, writer.written)
+            self.assertEqual(count, len(list(Path(tmp_dir).glob("*.md"))))
+
+
+class RenderMdTest(TestCase):
+    novels = fixtures.NOVELS
+
+    def test_novel_info_to_md(self):
+        novel = self.novels[1]
+        expected: str = f"""---
+aliases:
+  - (직접 적어 주세요)
+유입 경로: (직접 적어 주세요)
+작가명: 미츄리
+소설 링크: https://novelpia.com/novel/2
+tags:
+  - "판타지"
+자유: True
+연재 중: True
+완독일: 0000-00-00T00:00
+연재 시작일: 2022-03-01 00:00:00
+최근(예정) 연재일: 2024-04-17 20:00:00
+소설 등록일: 
+소설 갱신일: 
+원격 갱신일: 
+로컬 갱신일: {novel.got_time}
+회차 수: 2
+알람 수: None
+선호 수: None
+추천 수: 2
+조회 수: 20
+---
+
+> [!TLDR] 시놉시스
+> 괴담, 저주, 여학생 등….
+> 집착해선 안 될 것들이 내게 집착한다
+"""
+        self.assertEqual(expected, novel_info_to_md(novel))
+
+        # 시놉시스, 유형이 없는 소설과 삭제된 소설
+        info_dics = [dict(fixtures.make_info_dic(5, "[]", 0, 3, None), novel_story=None),
+                     dict(fixtures.make_info_dic(6, "[]", 0, 2, None), is_del=1)]
+        bare, deleted = trusted_info_dics_to_novels(info_dics)
+        self.assertIn("tags:\n\n연재 중: True\n", novel_info_to_md(bare))
+        self.assertTrue(novel_info_to_md(bare).endswith("조회 수: 50\n---\n"))
+        self.assertEqual("삭제", novel_info_to_md(deleted))
+
+
+if __name__ == '__main__':
+    main()
@@ -2,7 +2,8 @@
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Generator
+from string import Formatter
+from typing import Any, Container, Generator, Iterable
 from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup as Soup
@@ -10,7 +11,8 @@ from bs4.element import Tag
 from bs4.filter import SoupStrainer as Strainer
 from requests import post
 
-from .const.const import BASIC_HEADERS, HOST, PARSER
+from .const.const import BASIC_HEADERS, DEFAULT_TIME, HOST, PARSER
+from .const.const import NOVEL_STATUSES_NAMED_TUPLE as STATUS_TU
 from .func.common import Page
 from .func.userIO import print_under_new_line
 
@@ -27,6 +29,7 @@ class Novel(Page):
     :var _up_status: 연재 상태 (연재 중, 완결, 삭제, 연습작품, 연재지연, 연재중단 中 1)
     :var _types: 유형
     :var _main_genre: 1차 분류 태그
+    :var _novel_genre: 해시 태그 목록
     :var _tags: 해시 태그로 된 bulleted list
     :var _novel_story: 줄거리로 된 Markdown Callout
     :var _start_date: 연재 시작일
@@ -119,20 +122,11 @@ class Novel(Page):
                         self.types.add("자유")
 
                 elif key == "novel_genre":
-                    self.novel_genre = value
+                    if value:
+                        self.novel_genre = value
                 elif key == "novel_story":
-                    self.novel_story = value
-
-                elif key == "novel_live":
-                    if value == 1:
-                        self.up_status = "연재 지연"
-                    if value == 2:
-                        self.up_status = "연재 중단"
-
-                elif key == "is_del":
-                    self.up_status = "삭제"
-                elif key == "is_complete":
-                    self.up_status = "완결"
+                    if value:
+                        self.novel_story = value
 
                 else:
                     self.__setattr__(property_name, value)
@@ -147,6 +141,10 @@ class Novel(Page):
                     alias = alias_dic[key]
                     self.__setattr__(alias, value)
 
+        # 삭제/완결/연재 여부로 연재 상태 결정
+        if not UP_STATUS_KEYS.isdisjoint(info_dic):
+            self.up_status = info_dic_to_up_status(info_dic)
+
     def __str__(self):
         return novel_info_to_md(self)
 
@@ -169,16 +167,16 @@ class Novel(Page):
             self._count_pick = count_pick
 
     @property
-    def novel_genre(self) -> str:
+    def novel_genre(self) -> list[str] | None:
+        # 생성자의 tags 인자로만 태그를 받은 소설은 처음 읽을 때 목록으로 풀어 둠
+        if self._novel_genre is None and self._tags:
+            self._novel_genre = tags_to_genre(self._tags)
         return self._novel_genre
 
     @novel_genre.setter
-    def novel_genre(self, tags: str) -> None:
-        from re import findall
-
-        strings: list[str] = findall(r'\"\w+\"', tags)
-
-        self.tags = strings
+    def novel_genre(self, genre: str) -> None:
+        self._novel_genre = parse_genre(genre)
+        self.tags = [quote_tag(tag) for tag in self._novel_genre]
 
     @property
     def tags(self) -> str:
@@ -332,6 +330,152 @@ class Novel(Page):
         self._novel_story = summary_callout
 
 
+UP_STATUS_KEYS = frozenset(["is_del", "is_complete", "novel_live"])
+
+# Novel 슬롯 > (소설 정보 Dict 의 키, 기본값). 키가 None 이면 기본값만 넣고 trusted_info_dics_to_novels 에서 따로 처리
+NOVEL_FIELD_TABLE: dict[str, tuple[str | None, Any]] = {
+    "_title": ("novel_name", ""),
+    "_code": (None, ""),
+    "_url": (None, ""),
+    "_ctime": (None, DEFAULT_TIME),
+    "_mtime": (None, DEFAULT_TIME),
+    "_got_time": (None, None),
+    "_count_good": ("count_good", -1),
+    "_count_view": ("count_view", -1),
+    "_last_view_date": ("last_viewdate", None),
+    **{
+        slot: (slot[1:], None) for slot in Novel.__slots__[len(Page.__slots__):]
+        if slot[1:] not in ("types", "tags", "novel_type", "novel_genre", "novel_story", "up_status", "last_view_date")
+    },
+    "_types": (None, None),
+    "_tags": (None, None),
+    "_novel_type": ("novel_type", None),
+    "_novel_genre": (None, None),
+    "_novel_story": (None, None),
+    "_up_status": (None, None),
+}
+
+
+def parse_genre(genre: str | None) -> list[str]:
+    """서버 API 의 novel_genre (JSON 배열 문자열) 를 태그 목록으로 바꾸는 함수
+
+    >>> parse_genre('["현대 판타지","하렘"]')
+    ['현대 판타지', '하렘']
+
+    :param genre: '["현대판타지","하렘"]' 형식의 문자열
+    :return: 태그 목록
+    """
+    from json import loads
+
+    return loads(genre) if genre else []
+
+
+def quote_tag(tag: str) -> str:
+    """태그를 큰따옴표로 감싼 YAML 문자열로 바꾸는 함수 (따옴표, 역슬래시는 이스케이프)"""
+    from json import dumps
+
+    return dumps(tag, ensure_ascii=False)
+
+
+def genre_to_tags(genre: Iterable[str]) -> str:
+    """태그 목록을 Novel.tags 의 Markdown 목록 문자열로 바꾸는 함수
+
+    >>> genre_to_tags(["현대판타지", 'A"B'])
+    '\\n  - "현대판타지"\\n  - "A\\\\"B"'
+
+    :param genre: 태그 목록
+    :return: '\\n  - "태그"' 를 이어 붙인 문자열
+    """
+    return "".join("\n  - " + quote_tag(tag) for tag in genre)
+
+
+def tags_to_genre(tags: str | None) -> list[str]:
+    """Novel.tags 의 Markdown 목록 문자열을 태그 목록으로 되돌리는 함수 (genre_to_tags 의 역)
+
+    :param tags: Markdown 목록 문자열
+    :return: 태그 목록
+    """
+    from json import loads
+
+    if not tags:
+        return []
+
+    return [loads(tag) for tag in tags.split("\n  - ") if tag.strip()]
+
+
+def info_dic_to_up_status(info_dic: dict) -> str:
+    """소설 정보 Dict 의 삭제/완결/연재 여부로 연재 상태를 정하는 함수
+
+    :param info_dic: 소설 정보가 담긴 Dict
+    :return: 연재 상태 (삭제 > 완결 > 연재중단, 연재지연 > 연재 중 순으로 우선)
+    """
+    if info_dic.get("is_del"):
+        return STATUS_TU.deleted
+    if info_dic.get("is_complete"):
+        return STATUS_TU.complete
+
+    novel_live: int | None = info_dic.get("novel_live")
+
+    if novel_live == 1:
+        return STATUS_TU.delayed
+    if novel_live == 2:
+        return STATUS_TU.hiatus
+
+    return STATUS_TU.ongoing
+
+
+def new_novel_from_info_dic(info_dic: dict) -> Novel:
+    """NOVEL_FIELD_TABLE 대로 소설 정보 Dict 의 값을 슬롯에 바로 넣은 Novel 객체를 반환하는 함수 (속성 setter 를 거치지 않음)
+
+    :param info_dic: 소설 정보가 담긴 Dict
+    :return: Novel 객체
+    """
+    novel: Novel = Novel.__new__(Novel)
+    get = info_dic.get
+
+    for slot, (key, default) in NOVEL_FIELD_TABLE.items():
+        setattr(novel, slot, default if key is None else get(key, default))
+
+    return novel
+
+
+def trusted_info_dics_to_novels(info_dics: Iterable[dict]):
+    """서버 API 가 준 소설 정보 Dict 들을 검증 없이 Novel 객체로 빠르게 변환하는 함수
+
+    선호작 목록(/proc/user)이나 전체 목록 수집처럼 믿을 수 있는 Dict 를 대량으로 변환할 때 씁니다.
+    속성 setter 와 URL 확인 요청을 거치지 않고 슬롯에 바로 값을 넣습니다.
+
+    :param info_dics: 소설 정보가 담긴 Dict 목록 또는 제너레이터
+    :return: Novel 객체 제너레이터
+    """
+    base_url: str = urljoin(HOST, "/novel/")
+    got_time: str = datetime.today().isoformat(timespec="minutes")
+    types_by_novel_type: dict[int, tuple[str, ...]] = {1: ("PLUS",), 2: ("자유",)}
+
+    for info_dic in info_dics:
+        novel: Novel = new_novel_from_info_dic(info_dic)
+
+        code: str = str(info_dic["novel_no"])
+        novel._code = code
+        novel._url = base_url + code
+        novel._got_time = got_time
+        novel._types = set(types_by_novel_type.get(novel._novel_type, ()))
+        novel._up_status = info_dic_to_up_status(info_dic)
+
+        # '["현대판타지","하렘"]' > '\n  - "현대판타지"\n  - "하렘"' (Novel.novel_genre setter 와 같은 변환)
+        genre: str | None = info_dic.get("novel_genre")
+        if genre and genre != "[]":
+            novel._novel_genre = parse_genre(genre)
+            novel._tags = genre_to_tags(novel._novel_genre)
+
+        story: str | None = info_dic.get("novel_story")
+        if story:
+            lines = [line.lstrip("#") for line in story.splitlines() if line != ""]
+            novel._novel_story = "\n> ".join(["> [!TLDR] 시놉시스"] + lines) + "\n"
+
+        yield novel
+
+
 def toggle_novel_action(novel_code: str, action_n: int = 0, login: int = 0, csrf: str = None) -> tuple[int, int]:
     """소설 알람 또는 선호작 설정을 등록/해제하는 함수
 
@@ -457,11 +601,12 @@ def get_like_novel_info_dics(user_mem_no: int) -> tuple[None, None] | tuple[int,
         return count, info_dics
 
 
-def info_dics_to_novels(info_dics: Generator, count: int):
+def info_dics_to_novels(info_dics: Generator, count: int, skip_codes: Container[str] = frozenset()):
     """소설 정보가 담긴 Dict를 Novel 객체로 변환하는 함수
 
     :param info_dics: 소설 정보가 담긴 Dict 목록
     :param count: Dict 수
+    :param skip_codes: 건너뛸 소설 번호
     :return: Novel 객체
     """
     novels: list[Novel] = []
@@ -477,6 +622,8 @@ def info_dics_to_novels(info_dics: Generator, count: int):
         else:
             # 소설 번호 추출
             novel_code: str = info_dic["novel_no"]
+            if str(novel_code) in skip_codes:
+                continue
 
             # 알람 수 추출
             success, alarms = toggle_novel_action(novel_code)
@@ -620,12 +767,14 @@ def chk_novel_up_status(novel: Novel, html: str):
         yield novel, info_soup, None
 
 
-def set_novel_from_likes(login: int, novel_code: str = None) -> tuple[Generator, int]:
+def set_novel_from_likes(login: int, novel_code: str = None,
+                         skip_codes: Container[str] = frozenset()) -> tuple[Generator, int]:
     """계정의 선호작 목록에서 추출한 정보를 Novel 객체들로 변환하는 함수
 
     :param novel_code: 소설 번호
     :param login: 로그인 유형 (1은 일반 계정, 2는 구독 계정)
-    :return: Novel 객체 목록, 선호작 수
+    :param skip_codes: 알람, 좋아요 수를 요청하지 않고 건너뛸 소설 번호 (최근에 받은 소설 등)
+    :return: Novel 객체 목록, 선호작 수 (건너뛴 소설 포함)
     """
     from dotenv import dotenv_values
 
@@ -646,7 +795,7 @@ def set_novel_from_likes(login: int, novel_code: str = None) -> tuple[Generator,
 
     mem_no = int(config[env_var_name])
     count, info_dics = get_like_novel_info_dics(mem_no)
-    novels: Generator = info_dics_to_novels(info_dics, count)
+    novels: Generator = info_dics_to_novels(info_dics, count, skip_codes)
 
     if novel_code:
         success, stats = toggle_novel_action(novel_code, 1, login, csrf)
@@ -655,71 +804,62 @@ def set_novel_from_likes(login: int, novel_code: str = None) -> tuple[Generator,
     return novels, count
 
 
+# 소설 정보 문서의 앞부분 속성 (한 줄에 하나, {속성} 은 Novel 의 같은 이름 속성, {types} 는 '유형: True' 줄들)
+NOVEL_MD_LAYOUT: tuple[str, ...] = (
+    "---",
+    "aliases:\n  - (직접 적어 주세요)",
+    "유입 경로: (직접 적어 주세요)",
+    "작가명: {writer_nick}",
+    "소설 링크: {url}",
+    "tags:{tags}",
+    "{types}",
+    "{up_status}: True",
+    "완독일: " + DEFAULT_TIME,
+    "연재 시작일: {start_date}",
+    "최근(예정) 연재일: {last_write_date}",
+    "소설 등록일: {reg_date}",
+    "소설 갱신일: {update_dt}",
+    "원격 갱신일: {status_date}",
+    "로컬 갱신일: {got_time}",
+    "회차 수: {count_book}",
+    "알람 수: {count_alarm}",
+    "선호 수: {count_like}",
+    "추천 수: {count_good}",
+    "조회 수: {count_view}",
+    "---\n",
+)
+
+
+NOVEL_MD_TEMPLATE: str = "\n".join(NOVEL_MD_LAYOUT)
+
+# 템플릿에서 Novel 의 같은 이름 속성으로 채우는 이름 (tags, types 는 novel_info_to_md 에서 따로 채움)
+NOVEL_MD_FIELDS: tuple[str, ...] = tuple(
+    name for text, name, spec, conv in Formatter().parse(NOVEL_MD_TEMPLATE) if name and name not in ("tags", "types")
+)
+
+
 def novel_info_to_md(novel: Novel) -> str:
-    """추출한 소설 정보를 Markdown 문서로 변환하는 함수
+    """추출한 소설 정보를 Markdown 문서로 변환하는 함수 (콘솔에 출력하지 않음)
     
     :param novel: 소설 정보가 담긴 Novel 인스턴스
-    :return: Markdown 문서
+    :return: Markdown 문서, 삭제된 소설이면 연재 상태 문자열
     """
-    print_under_new_line(f"[알림] {novel.title}.md 파일에 '유입 경로' 속성을 추가했어요. Obsidian 으로 직접 수정해 주세요.")
+    if novel.up_status == STATUS_TU.deleted:
+        return STATUS_TU.deleted
 
-    from .const.const import NOVEL_STATUSES_NAMED_TUPLE as STATUS_TU
-
-    deleted: str = STATUS_TU.deleted
-
-    # 삭제된 소설, Markdown 미작성
-    if novel.up_status == deleted:
-        return deleted
-
-    type_bools: list[str] = [type + ": True" for type in novel.types]
-    types: str = "\n".join(type_bools)
-
-    # 소설 서비스 상태 정상, Markdown 작성
-    lines: list[str] = [
-        "aliases:\n  - (직접 적어 주세요)",
-        "유입 경로: (직접 적어 주세요)",
-        "작가명: " + novel.writer_nick,
-        "소설 링크: " + novel.url,
-        "tags:" + novel.tags,
-        types,
-        novel.up_status + ": True"
-    ]
-    from .const.const import DEFAULT_TIME
-
-    dates: list[str] = [
-        "완독일: " + DEFAULT_TIME,
-        "연재 시작일: " + novel.start_date,
-        "최근(예정) 연재일: " + novel.last_write_date,
-        "소설 등록일: " + novel.reg_date,
-        "소설 갱신일: " + novel.update_dt,
-        "원격 갱신일: " + novel.status_date,
-        "로컬 갱신일: " + novel.got_time,
-    ]
-    stats: list[str] = [
-        f"회차 수: {novel.count_book}",
-        f"알람 수: {novel.count_alarm}",
-        f"선호 수: {novel.count_like}",
-        f"추천 수: {novel.count_good}",
-        f"조회 수: {novel.count_view}",
-    ]
-    lines = ["---"] + lines + dates + stats
-    lines.append("---\n")
-
-    summary_callout: str = novel.novel_story
-    if summary_callout:
-        lines.append(summary_callout)
-
-    md_string: str = "\n".join(lines)
-
-    return md_string
-
-
-def novel_to_md_file(novel: Novel, skip: bool = False, overwrite: bool = False):
-    """입력받은 소설 정보를 파일에 쓰는 함수
+    fields: dict[str, Any] = {name: getattr(novel, name) for name in NOVEL_MD_FIELDS}
+    fields["tags"] = novel.tags or ""
+    fields["types"] = "\n".join(type + ": True" for type in novel.types)
 
-    :param novel: 소설 정보가 담긴 Novel 인스턴스
-    :param skip: 덮어 쓰기 질문을 건너뛸 지 여부
-    :param overwrite: 덮어 쓰기 여부
+    # 시놉시스는 앞부분 속성 뒤에 빈 줄 하나를 두고 붙임
+    story: str | None = novel.novel_story
+    return NOVEL_MD_TEMPLATE.format_map(fields) + ("\n" + story if story else "")
+
+
+def get_md_dir() -> Path:
+    """소설 정보 Markdown 파일을 쓸 폴더 경로를 반환하는 함수
+
+    :return: 환경 변수 NOVEL_INFO_MD_DIR 의 '소설 정보' 폴더, 없으면 ./novel/markdown
     """
     from .func.common import get_env_var_w_error
 
@@ -727,33 +867,95 @@ def novel_to_md_file(novel: Novel, skip: bool = False, overwrite: bool = False):
         # 환경 변수 無
         if key_err:
             novel_dir = Path(Path.cwd(), "novel")
-            md_dir = Path(novel_dir, "markdown")
+            return Path(novel_dir, "markdown")
 
         # 환경 변수의 Markdown 폴더 경로 사용
-        else:
-            md_dir: Path = Path(env_md_dir, "소설 정보")
+        return Path(env_md_dir, "소설 정보")
 
-    print_under_new_line("[알림] Markdown 파일은", md_dir, "에 쓸게요.")
 
-    hardened_title: str = novel.title.replace("/", "|")  # 제목의 "/"로 인한 폴더 생성 방지
-    padded_code: str = novel.code.zfill(6)  # 노벨피아 총 소설 수는 약 30만 개 (6자리)
-    file_name: str = padded_code + " - " + hardened_title  # '6자리 번호 - 제목'
+def novel_to_md_file(novel: Novel, skip: bool = False, overwrite: bool = False, manifest=None,
+                     patch: bool = False, writer=None, index=None, excluded_keys: tuple[str, ...] = None) -> bool:
+    """입력받은 소설 정보를 파일에 쓰는 함수
+
+    :param novel: 소설 정보가 담긴 Novel 인스턴스
+    :param skip: 덮어 쓰기 질문을 건너뛸 지 여부
+    :param overwrite: 덮어 쓰기 여부
+    :param manifest: MdManifest 객체. 주면 지난번과 해시가 같은 문서는 쓰지 않음
+    :param patch: 파일이 이미 있으면 덮어 쓰는 대신 크롤러가 쓰는 속성만 고칠 지 여부
+    :param writer: AtomicWriterPool 객체. 주면 새 파일을 직접 쓰는 대신 맡기고 (해시는 다 쓴 뒤에 기록), 콘솔에 출력하지 않음
+    :param index: VaultIndex 객체. 주면 문서 경로, 해시, 받은 시각을 기록하고, 지난번과 해시가 같은 문서는 쓰지 않음.
+        제목이나 폴더 구조가 바뀐 소설은 기존 문서를 옮김
+    :param excluded_keys: 해시에서 뺄 속성 이름 (기본값 VAULT_HASH_EXCLUDED_KEYS, 통계만 바뀐 문서를 건너뛰려면 VAULT_STAT_KEYS)
+    :return: 파일을 썼는지 (맡겼는지) 여부
+    """
+    from .func.vault import get_md_layout, md_rel_path
 
-    file_path = Path(md_dir, file_name).with_suffix(".md")  # 기본 경로: ../novel/markdown/제목.md
+    md_dir: Path = get_md_dir()
+
+    # 기본 경로: ../novel/markdown/6자리 번호 - 제목.md (폴더 구조에 따라 하위 폴더)
+    rel_path: str = md_rel_path(novel.code, novel.title, novel.up_status, get_md_layout())
+    file_path: Path = Path(md_dir, rel_path) if index is None else index.place(novel.code, rel_path)
 
     # Markdown 형식으로 변환하기
     md_file_content = novel_info_to_md(novel)
 
+    digest: str | None = None
+    if manifest is not None or index is not None:
+        from .func.vault import md_digest
+
+        digest = md_digest(md_file_content) if excluded_keys is None else md_digest(md_file_content, excluded_keys)
+
+    def record() -> None:
+        """쓴 문서의 해시 (와 소설 정보를 받은 시각) 를 기록"""
+        if manifest is not None:
+            manifest.update(file_path, digest)
+        if index is not None:
+            index.update(novel.code, digest, novel.got_time)
+
+    # 지난번에 쓴 문서와 같으면 건너뜀 (Obsidian 재색인, 동기화 방지)
+    # 고치는 모드에서도 먼저 확인하므로, 해시에서 뺀 속성 (통계 등) 만 바뀐 문서는 고치지 않음
+    if (manifest is not None and manifest.is_unchanged(file_path, digest)) or \
+            (index is not None and index.is_unchanged(novel.code, digest)):
+        # 쓰지 않아도 받은 시각은 기록 (fresh_codes 가 최근에 받은 소설로 보도록)
+        record()
+        return False
+
+    # 기존 파일의 사용자 속성, 본문은 두고 크롤러 속성만 고침 (속성이 그대로면 patch_md_file 이 쓰지 않음)
+    if patch:
+        from .func.vault import patch_md_file
+
+        patched_size: int | None = patch_md_file(file_path, md_file_content)
+        if patched_size is not None:
+            record()
+            return patched_size > 0
+
+    # 임시 파일에 쓴 뒤 바꿔치기하도록 스레드 풀에 맡김
+    if writer is not None:
+        if not overwrite and file_path.exists():
+            return False
+
+        # 해시는 파일을 다 쓴 뒤에 기록 (쓰지 못하면 다음번에 다시 씀)
+        writer.submit(file_path, md_file_content, record)
+        return True
+
+    print_under_new_line(f"[알림] {novel.title}.md 파일에 '유입 경로' 속성을 추가했어요. Obsidian 으로 직접 수정해 주세요.")
+    print_under_new_line("[알림] Markdown 파일은", md_dir, "에 쓸게요.")
+
     # Markdown 폴더 확보 및 새 파일 열기
     from .func.common import opened_x_error
     with opened_x_error(file_path, "xt", 'utf-8', skip, overwrite) as (f, err):
         if err:
             print_under_new_line("[오류]", f"{err = }")
             print("[오류]", file_path, "파일을 열지 못했어요.")
-        else:
-            # print(md_file_content, file=f)
-            f.write(md_file_content)
-            print("[알림]", file_path, "파일을 썼어요.")
+            return False
+
+        # print(md_file_content, file=f)
+        f.write(md_file_content)
+        print("[알림]", file_path, "파일을 썼어요.")
+
+    record()
+
+    return True
 
 
 def novel_info_main() -> None:
@@ -0,0 +1,250 @@
+"""크롤링해 둔 소설 저장소(SQLite)에서 조건에 맞는 소설을 찾거나 집계하는 명령줄 도구
+
+사용 예)
+    python -m src.query --status 완결 --tag 판타지 --tag 회귀 --min count_view=10000 --sort=-count_view
+    python -m src.query --type PLUS --since 2023-01-01 --group-by start_year --agg avg:count_book --format csv
+"""
+import csv
+import json
+import sqlite3
+import sys
+from argparse import ArgumentParser, ArgumentTypeError, Namespace
+from typing import Iterable, TextIO
+from unicodedata import east_asian_width
+
+from src.const.const import (NOVEL_STATUSES_NAMED_TUPLE, NOVEL_TYPE_FLAGS, QUERY_AGG_FUNCS,
+                             QUERY_DEFAULT_COLUMNS)
+from src.func.store import NOVEL_COLUMNS, NovelStore, get_store_path
+from src.func.table import NOVEL_DATE_FIELDS, NOVEL_STR_FIELDS
+
+# 정수 열 (문턱값 조건, 집계에 쓸 수 있는 열)
+INT_FIELDS: tuple[str, ...] = tuple(
+    name for name in NOVEL_COLUMNS if name not in NOVEL_STR_FIELDS and name not in NOVEL_DATE_FIELDS
+    and name != "types"
+)
+# --group-by 에 쓸 수 있는 키 > SQL 식
+GROUP_KEYS: dict[str, str] = {
+    **{name: f"novel.{name}" for name in NOVEL_COLUMNS},
+    "start_year": "substr(novel.start_date, 1, 4)",
+    "tag": "novel_tag.tag",
+}
+
+
+def threshold(value: str) -> tuple[str, int]:
+    """'count_view=1000' 형식의 인자를 (열 이름, 값) 으로 바꾸는 함수"""
+    name, sep, number = value.partition("=")
+
+    if not sep or name not in INT_FIELDS or not number.lstrip("-").isdecimal():
+        raise ArgumentTypeError(f"'열=정수' 형식이어야 해요. 열: {', '.join(INT_FIELDS)}")
+    return name, int(number)
+
+
+def aggregate(value: str) -> tuple[str, str | None]:
+    """'avg:count_view' 또는 'count' 형식의 인자를 (집계 함수, 열 이름) 으로 바꾸는 함수"""
+    func, sep, name = value.partition(":")
+
+    if func not in QUERY_AGG_FUNCS or (func != "count" and name not in INT_FIELDS):
+        raise ArgumentTypeError(f"'함수:열' 형식이어야 해요. 함수: {', '.join(QUERY_AGG_FUNCS)}")
+    return func, name or None
+
+
+def column_list(value: str) -> list[str]:
+    """'code,title' 형식의 인자를 열 이름 목록으로 바꾸는 함수"""
+    names: list[str] = [name.strip() for name in value.split(",") if name.strip()]
+    unknown: list[str] = [name for name in names if name not in NOVEL_COLUMNS]
+
+    if unknown:
+        raise ArgumentTypeError(f"없는 열: {', '.join(unknown)}")
+    return names
+
+
+def get_parser() -> ArgumentParser:
+    """명령줄 인자 해석기를 반환하는 함수"""
+    parser = ArgumentParser(prog="python -m src.query", description="크롤링해 둔 소설 저장소에서 소설을 찾거나 집계합니다.")
+    parser.add_argument("--db", help="DB 파일 경로 (기본값: 환경 변수 NOVEL_DB_PATH 또는 ./novel/novelpia.sqlite3)")
+
+    where = parser.add_argument_group("조건")
+    where.add_argument("--status", action="append", default=[], choices=list(NOVEL_STATUSES_NAMED_TUPLE),
+                       help="연재 상태 (여러 번 쓰면 그중 하나)")
+    where.add_argument("--type", action="append", default=[], choices=NOVEL_TYPE_FLAGS, dest="types",
+                       help="작품 유형 (여러 번 쓰면 모두)")
+    where.add_argument("--not-type", action="append", default=[], choices=NOVEL_TYPE_FLAGS, dest="not_types",
+                       help="제외할 작품 유형")
+    where.add_argument("--tag", action="append", default=[], dest="tags", help="태그 (여러 번 쓰면 모두)")
+    where.add_argument("--any-tag", action="append", default=[], dest="any_tags", help="태그 (여러 번 쓰면 그중 하나)")
+    where.add_argument("--writer", help="작가명")
+    where.add_argument("--date-field", default="start_date", choices=sorted(NOVEL_DATE_FIELDS & set(NOVEL_COLUMNS)),
+                       metavar="DATE_FIELD", help="--since, --until 에 쓸 날짜 열 (기본값: start_date)")
+    where.add_argument("--since", help="이 날짜 이후 (포함, YYYY-MM-DD)")
+    where.add_argument("--until", help="이 날짜 이전 (미포함, YYYY-MM-DD)")
+    where.add_argument("--min", action="append", default=[], type=threshold, help="열=값, 값 이상")
+    where.add_argument("--max", action="append", default=[], type=threshold, help="열=값, 값 이하")
+
+    output = parser.add_argument_group("출력")
+    output.add_argument("--columns", type=column_list, default=list(QUERY_DEFAULT_COLUMNS), help="출력할 열 (쉼표로 구분)")
+    output.add_argument("--group-by", choices=list(GROUP_KEYS), metavar="KEY",
+                        help="이 키로 묶어서 집계 (열 이름, start_year, tag)")
+    output.add_argument("--agg", action="append", default=[], type=aggregate,
+                        help="집계 (count, sum:열, avg:열, min:열, max:열). 기본값 count")
+    output.add_argument("--sort", help="정렬할 열 (--sort=-열 처럼 앞에 '-' 를 붙이면 내림차순)")
+    output.add_argument("--limit", type=int, help="출력할 행 수")
+    output.add_argument("--format", default="table", choices=["table", "csv", "json"], help="출력 형식")
+
+    return parser
+
+
+def build_query(args: Namespace) -> tuple[str, list]:
+    """인자를 SQL 과 매개변수로 바꾸는 함수
+
+    :param args: get_parser().parse_args() 의 결과
+    :return: (SQL, 매개변수 목록)
+    """
+    conditions: list[str] = []
+    params: list = []
+
+    if args.status:
+        conditions.append(f"novel.up_status IN ({', '.join('?' * len(args.status))})")
+        params += args.status
+
+    # types 열은 'PLUS,성인' 처럼 쉼표로 이어 붙인 문자열
+    for novel_type in args.types:
+        conditions.append("(',' || novel.types || ',') LIKE ?")
+        params.append(f"%,{novel_type},%")
+    for novel_type in args.not_types:
+        conditions.append("(',' || novel.types || ',') NOT LIKE ?")
+        params.append(f"%,{novel_type},%")
+
+    for tag in args.tags:
+        conditions.append("novel.code IN (SELECT code FROM novel_tag WHERE tag = ?)")
+        params.append(tag)
+    if args.any_tags:
+        marks: str = ", ".join("?" * len(args.any_tags))
+        conditions.append(f"novel.code IN (SELECT code FROM novel_tag WHERE tag IN ({marks}))")
+        params += args.any_tags
+
+    if args.writer:
+        conditions.append("novel.writer_nick = ?")
+        params.append(args.writer)
+    if args.since:
+        conditions.append(f"novel.{args.date_field} >= ?")
+        params.append(args.since)
+    if args.until:
+        conditions.append(f"novel.{args.date_field} < ?")
+        params.append(args.until)
+
+    for name, value in args.min:
+        conditions.append(f"novel.{name} >= ?")
+        params.append(value)
+    for name, value in args.max:
+        conditions.append(f"novel.{name} <= ?")
+        params.append(value)
+
+    where: str = " WHERE " + " AND ".join(conditions) if conditions else ""
+
+    if args.group_by:
+        key: str = GROUP_KEYS[args.group_by]
+        aggs: list[tuple[str, str | None]] = args.agg or [("count", None)]
+        selects: list[str] = [f"{key} AS {args.group_by}"] + [
+            "COUNT(*) AS count" if func == "count" else f"{func.upper()}(novel.{name}) AS {func}_{name}"
+            for func, name in aggs
+        ]
+        tag_join: str = " JOIN novel_tag ON novel_tag.code = novel.code" if args.group_by == "tag" else ""
+        sql: str = f"SELECT {', '.join(selects)} FROM novel{tag_join}{where} GROUP BY 1"
+        output_columns: list[str] = [select.rsplit(" AS ", 1)[1] for select in selects]
+    else:
+        sql = f"SELECT {', '.join('novel.' + name for name in args.columns)} FROM novel{where}"
+        output_columns = args.columns
+
+    if args.sort:
+        name: str = args.sort.lstrip("-")
+        # 묶지 않았으면 출력하지 않는 열로도 정렬할 수 있음
+        if name not in output_columns and (args.group_by or name not in NOVEL_COLUMNS):
+            raise ValueError(f"정렬할 열 {name} 이(가) 출력 열 {output_columns} 에 없어요.")
+        sql += f" ORDER BY {name} {'DESC' if args.sort.startswith('-') else 'ASC'}"
+    elif args.group_by:
+        sql += " ORDER BY 1"
+    else:
+        sql += " ORDER BY novel.code"
+
+    if args.limit is not None:
+        sql += " LIMIT ?"
+        params.append(args.limit)
+
+    return sql, params
+
+
+def text_width(text: str) -> int:
+    """터미널에 찍힐 때의 글자 폭을 반환하는 함수 (한글 등 전각 문자는 2칸)"""
+    return sum(2 if east_asian_width(char) in "WF" else 1 for char in text)
+
+
+def write_rows(headers: list[str], rows: Iterable[tuple], output_format: str, f: TextIO) -> int:
+    """행들을 표/CSV/JSON 형식으로 쓰는 함수
+
+    :param headers: 열 이름 목록
+    :param rows: 행 목록 또는 제너레이터
+    :param output_format: table, csv, json 中 1
+    :param f: 출력 파일 객체
+    :return: 쓴 행 수
+    """
+    count: int = 0
+
+    if output_format == "csv":
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+
+    elif output_format == "json":
+        # 한 줄에 한 행씩 (JSON Lines)
+        for row in rows:
+            f.write(json.dumps(dict(zip(headers, row)), ensure_ascii=False) + "\n")
+            count += 1
+
+    else:
+        # 표는 열 폭을 재야 하므로 모아서 씀
+        cells: list[list[str]] = [headers] + [["" if value is None else str(value) for value in row] for row in rows]
+        widths: list[int] = [max(text_width(line[i]) for line in cells) for i in range(len(headers))]
+
+        for i, line in enumerate(cells):
+            f.write("  ".join(cell + " " * (width - text_width(cell)) for cell, width in zip(line, widths)).rstrip())
+            f.write("\n")
+            if i == 0:
+                f.write("  ".join("-" * width for width in widths) + "\n")
+        count = len(cells) - 1
+
+    return count
+
+
+def run_query(conn: sqlite3.Connection, args: Namespace, f: TextIO) -> int:
+    """인자대로 DB 를 조회하여 결과를 쓰는 함수
+
+    :param conn: NovelStore 의 SQLite 연결
+    :param args: get_parser().parse_args() 의 결과
+    :param f: 출력 파일 객체
+    :return: 쓴 행 수
+    """
+    sql, params = build_query(args)
+    cursor = conn.execute(sql, params)
+    headers: list[str] = [description[0] for description in cursor.description]
+
+    return write_rows(headers, (tuple(row) for row in cursor), args.format, f)
+
+
+def query_main(argv: list[str] = None) -> None:
+    """직접 실행할 때만 호출되는 메인 함수"""
+    parser = get_parser()
+    args: Namespace = parser.parse_args(argv)
+
+    with NovelStore(args.db or get_store_path()) as store:
+        try:
+            count: int = run_query(store.conn, args, sys.stdout)
+        except ValueError as ve:
+            parser.error(str(ve))
+        else:
+            print(f"[알림] {count}행", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    query_main()
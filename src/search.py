@@ -0,0 +1,367 @@
+"""소설 제목, 작가명, 시놉시스를 검색하는 전문 검색(full-text search) 색인 코드
+
+한국어는 띄어쓰기 단위로 나누면 조사가 붙어서 검색이 잘 안 되므로, 낱말을 두 글자씩 겹쳐
+자른 bigram 으로 색인합니다. 예) '회귀한 기사' > '회귀 귀한 기사'
+bigram 은 SQLite FTS5 테이블에 넣고, 순위는 FTS5 의 BM25 점수로 매깁니다.
+내려받은 회차 본문도 줄 단위로 같은 방식으로 색인해서 (소설, 회차, 줄) 위치를 찾습니다.
+"""
+import re
+import sqlite3
+from html import unescape
+from itertools import islice
+from pathlib import Path
+from time import perf_counter
+from typing import Generator, Iterable
+
+from src.const.const import SEARCH_COLUMN_WEIGHTS, SEARCH_RESULT_LIMIT
+from src.func.common import UserMeta
+from src.func.userIO import print_under_new_line
+from src.novel_info import Novel
+
+WORD_PATTERN = re.compile(r"[^\W_]+")  # FTS5 unicode61 토큰과 같은 기준 (밑줄은 구분자)
+TAG_PATTERN = re.compile(r"<[^>]+>")
+
+SEARCH_SQL: str = """
+CREATE TABLE IF NOT EXISTS novel_doc (
+    code INTEGER PRIMARY KEY,
+    title TEXT,
+    writer_nick TEXT,
+    story TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS novel_fts USING fts5(
+    title, writer_nick, story, content = '', tokenize = 'unicode61'
+);
+"""
+EP_SEARCH_SQL: str = """
+CREATE TABLE IF NOT EXISTS ep_line (
+    id INTEGER PRIMARY KEY,
+    novel_code INTEGER NOT NULL,
+    ep_code INTEGER NOT NULL,
+    line_no INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ep_line_ep_code ON ep_line (ep_code, line_no);
+CREATE VIRTUAL TABLE IF NOT EXISTS ep_fts USING fts5(text, content = '', tokenize = 'unicode61');
+"""
+
+
+def word_bigrams(word: str) -> list[str]:
+    """낱말을 두 글자씩 겹쳐 자르는 함수 (한 글자 낱말은 그대로)"""
+    if len(word) < 2:
+        return [word]
+    return [word[i:i + 2] for i in range(len(word) - 1)]
+
+
+def to_bigram_text(text: str | None) -> str:
+    """문장을 bigram 을 띄어 쓴 문자열로 바꾸는 함수
+
+    >>> to_bigram_text("회귀한 기사, 7서클")
+    '회귀 귀한 기사 7서 서클'
+
+    :param text: 문장
+    :return: FTS5 테이블에 넣을 문자열
+    """
+    if not text:
+        return ""
+
+    return " ".join(gram for word in WORD_PATTERN.findall(text.lower()) for gram in word_bigrams(word))
+
+
+def to_match_query(query: str) -> str:
+    """검색어를 FTS5 MATCH 구문으로 바꾸는 함수. 낱말마다 bigram 구(phrase)를 만들어 AND 로 묶음
+
+    >>> to_match_query("기사단 회귀 검")
+    '"기사 사단" AND "회귀" AND "검"*'
+
+    :param query: 검색어
+    :return: MATCH 구문 (검색어에 낱말이 없으면 빈 문자열)
+    """
+    phrases: list[str] = []
+
+    for word in WORD_PATTERN.findall(query.lower()):
+        if len(word) == 1:
+            # 한 글자 검색어는 그 글자로 시작하는 bigram 으로 찾음
+            phrases.append(f'"{word}"*')
+        else:
+            phrases.append(f'"{" ".join(word_bigrams(word))}"')
+
+    return " AND ".join(phrases)
+
+
+def story_to_text(novel_story: str | None) -> str:
+    """Novel.novel_story 의 Obsidian Callout 을 줄거리 본문으로 되돌리는 함수
+
+    >>> story_to_text("> [!TLDR] 시놉시스\\n> 괴담, 저주\\n> 집착\\n")
+    '괴담, 저주\\n집착'
+    """
+    if not novel_story:
+        return ""
+
+    return "\n".join(line.removeprefix(">").strip() for line in novel_story.splitlines()[1:])
+
+
+def ep_line_to_text(line: str) -> str:
+    """회차 본문 한 줄에서 HTML 태그를 지우고 글자만 남기는 함수
+
+    >>> ep_line_to_text('<b>흑막</b>&nbsp;등장\\n')
+    '흑막 등장'
+    """
+    return unescape(TAG_PATTERN.sub("", line)).replace("\xa0", " ").strip()
+
+
+def connect(db_path: Path | str, schema_sql: str) -> sqlite3.Connection:
+    """WAL 모드로 DB 에 연결하고 테이블을 만드는 함수"""
+    if db_path != ":memory:":
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.executescript(schema_sql)
+
+    return conn
+
+
+class NovelSearchIndex(metaclass=UserMeta):
+    """소설 제목, 작가명, 시놉시스의 bigram 전문 검색 색인 클래스.
+
+    원문은 novel_doc 테이블에만 두고, FTS5 테이블은 색인만 저장(contentless)해서 용량을 줄입니다.
+
+    :var conn: SQLite 연결
+    """
+    __slots__ = (
+        "conn",
+    )
+
+    def __init__(self, db_path: Path | str):
+        self.conn = connect(db_path, SEARCH_SQL)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM novel_doc").fetchone()[0]
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def add_novels(self, novels: Iterable[Novel]) -> int:
+        """크롤링한 소설들을 색인에 추가하거나 갱신하는 함수. 내용이 그대로인 소설은 건너뜀
+
+        :param novels: Novel 객체 목록 또는 제너레이터
+        :return: 새로 색인한 소설 수
+        """
+        count: int = 0
+
+        with self.conn:
+            for novel in novels:
+                code: int = int(novel.code)
+                doc: tuple = (novel.title, novel.writer_nick, story_to_text(novel.novel_story))
+                old_doc = self.conn.execute(
+                    "SELECT title, writer_nick, story FROM novel_doc WHERE code = ?", (code,)
+                ).fetchone()
+
+                if old_doc == doc:
+                    continue
+
+                # contentless 테이블은 지울 때 예전 값을 그대로 다시 넣어 줘야 함
+                if old_doc is not None:
+                    self.conn.execute(
+                        "INSERT INTO novel_fts (novel_fts, rowid, title, writer_nick, story) "
+                        "VALUES ('delete', ?, ?, ?, ?)",
+                        (code, *map(to_bigram_text, old_doc)),
+                    )
+
+                self.conn.execute(
+                    "INSERT INTO novel_fts (rowid, title, writer_nick, story) VALUES (?, ?, ?, ?)",
+                    (code, *map(to_bigram_text, doc)),
+                )
+                self.conn.execute("INSERT OR REPLACE INTO novel_doc VALUES (?, ?, ?, ?)", (code, *doc))
+                count += 1
+
+        return count
+
+    def search(self, query: str, limit: int = SEARCH_RESULT_LIMIT) -> list[tuple[int, str, str, float]]:
+        """검색어가 들어간 소설을 순위대로 반환하는 함수
+
+        :param query: 검색어 (띄어 쓴 낱말은 모두 들어가야 함)
+        :param limit: 결과 수
+        :return: (소설 번호, 제목, 작가명, BM25 점수) 목록. 점수가 낮을수록 위
+        """
+        match_query: str = to_match_query(query)
+
+        if not match_query:
+            return []
+
+        weights: str = ", ".join(map(str, SEARCH_COLUMN_WEIGHTS))
+        # 순위를 먼저 매기고 상위 limit 개만 novel_doc 과 이어 붙임
+        sql: str = (
+            "SELECT novel_doc.code, novel_doc.title, novel_doc.writer_nick, hit.score FROM ("
+            f"SELECT rowid, bm25(novel_fts, {weights}) AS score FROM novel_fts "
+            "WHERE novel_fts MATCH ? ORDER BY score LIMIT ?"
+            ") AS hit JOIN novel_doc ON novel_doc.code = hit.rowid ORDER BY hit.score"
+        )
+
+        return [tuple(row) for row in self.conn.execute(sql, (match_query, limit))]
+
+
+class EpSearchIndex(metaclass=UserMeta):
+    """내려받은 회차 본문의 줄 단위 bigram 전문 검색 색인 클래스.
+
+    :var conn: SQLite 연결
+    """
+    __slots__ = (
+        "conn",
+    )
+
+    def __init__(self, db_path: Path | str):
+        self.conn = connect(db_path, EP_SEARCH_SQL)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM ep_line").fetchone()[0]
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def add_ep(self, novel_code: str | int, ep_code: str | int, lines: Iterable[str] | None) -> int:
+        """내려받은 회차 본문을 색인에 넣는 함수. 이미 색인한 회차면 예전 줄을 지우고 다시 넣음
+
+        :param novel_code: 소설 번호
+        :param ep_code: 회차 번호
+        :param lines: get_ep_content 가 반환한 본문 줄별 목록 (받지 못했으면 None)
+        :return: 새로 색인한 줄 수 (본문이 그대로면 0)
+        """
+        if lines is None:
+            return 0
+
+        novel_code, ep_code = int(novel_code), int(ep_code)
+        # 빈 줄은 빼고, 원래 본문의 줄 번호를 함께 저장
+        texts: list[tuple[int, str]] = [
+            (line_no, text) for line_no, line in enumerate(lines) if (text := ep_line_to_text(line))
+        ]
+        old_rows: list[tuple[int, int, str]] = self.conn.execute(
+            "SELECT id, line_no, text FROM ep_line WHERE ep_code = ? ORDER BY line_no", (ep_code,)
+        ).fetchall()
+
+        if [row[1:] for row in old_rows] == texts:
+            return 0
+
+        with self.conn:
+            # contentless 테이블은 지울 때 예전 값을 그대로 다시 넣어 줘야 함
+            self.conn.executemany(
+                "INSERT INTO ep_fts (ep_fts, rowid, text) VALUES ('delete', ?, ?)",
+                [(row_id, to_bigram_text(text)) for row_id, line_no, text in old_rows],
+            )
+            self.conn.execute("DELETE FROM ep_line WHERE ep_code = ?", (ep_code,))
+
+            start_id: int = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM ep_line").fetchone()[0]
+            self.conn.executemany(
+                "INSERT INTO ep_line (id, novel_code, ep_code, line_no, text) VALUES (?, ?, ?, ?, ?)",
+                [(start_id + i, novel_code, ep_code, line_no, text) for i, (line_no, text) in enumerate(texts)],
+            )
+            self.conn.executemany(
+                "INSERT INTO ep_fts (rowid, text) VALUES (?, ?)",
+                [(start_id + i, to_bigram_text(text)) for i, (line_no, text) in enumerate(texts)],
+            )
+
+        return len(texts)
+
+    def iter_hits(self, query: str) -> Generator[tuple[int, int, int, str], None, None]:
+        """검색어의 낱말이 모두 들어간 본문 줄을 하나씩 반환하는 함수
+
+        bigram 색인으로 후보 줄을 찾은 뒤, 낱말이 줄에 그대로 들어 있는지 한 번 더 확인합니다.
+
+        :param query: 검색어
+        :return: (소설 번호, 회차 번호, 줄 번호, 줄) 제너레이터
+        """
+        match_query: str = to_match_query(query)
+
+        if not match_query:
+            return
+
+        words: list[str] = WORD_PATTERN.findall(query.lower())
+        sql: str = (
+            "SELECT ep_line.novel_code, ep_line.ep_code, ep_line.line_no, ep_line.text "
+            "FROM ep_fts JOIN ep_line ON ep_line.id = ep_fts.rowid WHERE ep_fts MATCH ?"
+        )
+
+        for hit in self.conn.execute(sql, (match_query,)):
+            text: str = hit[3].lower()
+            if all(word in text for word in words):
+                yield hit
+
+    def search(self, query: str, limit: int | None = SEARCH_RESULT_LIMIT) -> list[tuple[int, int, int, str]]:
+        """검색어가 들어간 본문 줄을 limit 개까지 반환하는 함수
+
+        :param query: 검색어 (띄어 쓴 낱말은 모두 들어가야 함)
+        :param limit: 결과 수 (None 이면 전부)
+        :return: (소설 번호, 회차 번호, 줄 번호, 줄) 목록
+        """
+        return list(islice(self.iter_hits(query), limit))
+
+    def novel_codes(self, query: str) -> list[int]:
+        """검색어가 본문에 들어간 소설 번호 목록을 반환하는 함수"""
+        return sorted({novel_code for novel_code, *_ in self.iter_hits(query)})
+
+
+def search_main() -> None:
+    """직접 실행할 때만 호출되는 메인 함수"""
+    from src.func.store import NovelStore, get_store_path
+    from src.func.userIO import input_permission, input_text
+
+    db_path: Path = get_store_path()
+
+    # 검색 대상 선택
+    asked, in_eps = input_permission("[확인] 회차 본문에서 찾을까요? 아니면 소설 제목, 작가명, 시놉시스에서 찾을게요.")
+
+    if in_eps:
+        with EpSearchIndex(db_path) as ep_index:
+            print_under_new_line("[알림]", f"본문 {len(ep_index)}줄에서 찾아요.")
+
+            while True:
+                query: str = input_text("[입력] 검색어")
+
+                start: float = perf_counter()
+                hits = ep_index.search(query)
+                elapsed: float = perf_counter() - start
+
+                print_under_new_line("[검색]", f"{len(hits)}건, {elapsed * 1000:.1f} ms")
+                for novel_code, ep_code, line_no, text in hits:
+                    print(f"[{novel_code}/{ep_code}:{line_no}] {text}")
+
+                if not input_permission("[확인] 계속 검색할까요?")[1]:
+                    return
+
+    with NovelSearchIndex(db_path) as index:
+        # 저장소에 쌓인 소설로 색인 갱신 (바뀐 소설만)
+        if input_permission("[확인] 저장소의 소설로 색인을 갱신할까요?")[1]:
+            with NovelStore(db_path) as store:
+                count: int = index.add_novels(store.iter_novels())
+            print_under_new_line("[알림]", f"소설 {count}개를 색인했어요.")
+
+        while True:
+            query: str = input_text("[입력] 검색어")
+
+            start: float = perf_counter()
+            results = index.search(query)
+            elapsed: float = perf_counter() - start
+
+            print_under_new_line("[검색]", f"{len(results)}건, {elapsed * 1000:.1f} ms")
+            for rank, (code, title, writer_nick, score) in enumerate(results, 1):
+                print(f"{rank:>3}. [{code}] {title} - {writer_nick}")
+
+            if not input_permission("[확인] 계속 검색할까요?")[1]:
+                break
+
+
+if __name__ == "__main__":
+    search_main()
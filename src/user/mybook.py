@@ -118,20 +118,34 @@ def mybook_main_old():
 
 def mybook_main():
     """직접 실행할 때만 호출되는 메인 함수"""
-    from ..novel_info import Novel, set_novel_from_likes, novel_to_md_file
+    from ..const.const import VAULT_STAT_KEYS
+    from ..func.vault import VaultIndex
+    from ..func.writer import AtomicWriterPool
+    from ..novel_info import Novel, get_md_dir, set_novel_from_likes, novel_to_md_file
 
-    # Novel 객체 생성
-    novels, count = set_novel_from_likes(2)
+    md_dir = get_md_dir()
+    written, crawled = 0, 0
+
+    # 지난번과 내용이 같은 소설은 다시 쓰지 않고, 이미 있는 문서는 크롤러 속성만 고침 (새 문서는 스레드 풀로 씀)
+    # 로컬 갱신일, 통계는 크롤링할 때마다 바뀌므로 해시에서 뺌 (이것만 바뀐 소설은 쓰지 않음)
+    with VaultIndex.load(md_dir) as index, AtomicWriterPool() as writer:
+        # Novel 객체 생성 (최근에 받은 소설은 요청하지 않음)
+        novels, count = set_novel_from_likes(2, skip_codes=index.fresh_codes())
+
+        novel: Novel
+        for novel in novels:
+            crawled += 1
 
-    for i in range(count):
-        try:
-            novel: Novel = next(novels)
-        except StopIteration as si:
-            raise RuntimeError(mybook_main, f"{si = }")
-        else:
             # Markdown 파일 열기
-            novel_to_md_file(novel, True, True)
-            print_under_new_line(f"{i + 1}번째 소설을 Markdown 파일에 썼어요.")
+            if novel_to_md_file(novel, True, True, patch=True, writer=writer, index=index,
+                                excluded_keys=VAULT_STAT_KEYS):
+                written += 1
+
+    for file_path, err in writer.errors:
+        print_under_new_line("[오류]", file_path, f"{err = }")
+
+    print_under_new_line(f"[알림] 소설 {count}개 中 {count - crawled}개는 최근에 받았으므로 건너뛰었고, "
+                         f"{crawled}개 中 {written}개를 썼어요.")
 
 
 if __name__ == "__main__":
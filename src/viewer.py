@@ -138,21 +138,35 @@ def viewer_main() -> None:
     # 회차 본문 추출
     ep_lines: list[str] = get_ep_content(ep.code)
 
+    # 회차 본문 검색 색인 갱신
+    from src.func.store import get_store_path
+    from src.search import EpSearchIndex
+
+    with EpSearchIndex(get_store_path()) as ep_index:
+        ep_index.add_ep(novel_code, ep.code, ep_lines)
+
     # 파일 확장자 지정
-    suffix: str = ".md"
-    # suffix: str = ".html"
+    from src.func.userIO import input_permission
+
+    asked, to_html = input_permission("[확인] HTML 파일로 저장할까요? 아니면 Markdown 파일로 저장할게요.")
+    suffix: str = ".html" if to_html else ".md"
 
     # 파일 경로 지정
-    if suffix == ".md":
-        from src.func.common import get_env_var_w_error
+    from src.func.common import get_env_var_w_error
 
+    if suffix == ".md":
         with get_env_var_w_error("MARKDOWN_DIR") as (file_dir, err):
             if err:
                 raise
             file_dir = Path.cwd().joinpath("novel", novel_title)  # ~/novel/제목
 
     elif suffix == ".html":
-        raise ValueError("작업 예정")
+        with get_env_var_w_error("HTML_DIR") as (env_html_dir, err):
+            # 환경 변수 無
+            if err:
+                file_dir = Path.cwd().joinpath("novel", novel_title)  # ~/novel/제목
+            else:
+                file_dir = Path(env_html_dir, novel_title)
 
     file_name: str = f"EP.{ep_num} - {ep.title}"  # EP.0 프롤로그.ext
     file_path = Path(file_dir).joinpath(file_name).with_suffix(suffix)  # ~/novel/제목/EP.0 프롤로그.html
@@ -162,19 +176,29 @@ def viewer_main() -> None:
     # 폴더 확보
     assure_path_exists(file_path)
 
-    # 회차 본문 줄별 목록을 Markdown 문자열 Generator로 변환
     from typing import Generator
-    from src.func.episode import ep_content_to_md
 
-    markup_gen: Generator = ep_content_to_md(ep, ep_lines)
+    if suffix == ".html":
+        from src.const.const import HTML_BUFFER_SIZE
+        from src.func.episode import ep_content_to_html, write_html_css
+
+        # 공용 스타일 시트 쓰기 (폴더당 한 번)
+        write_html_css(file_path.parent)
+
+        # 회차 본문 줄별 목록을 HTML 문자열 Generator로 변환
+        markup_gen: Generator = ep_content_to_html(ep, ep_lines)
+        buffering: int = HTML_BUFFER_SIZE
+    else:
+        from src.func.episode import ep_content_to_md
 
-    # 회차 본문 줄별 목록을 HTML로 변환
-    # markup: str = ep_content_to_html(ep_lines)
+        # 회차 본문 줄별 목록을 Markdown 문자열 Generator로 변환
+        markup_gen: Generator = ep_content_to_md(ep, ep_lines)
+        buffering: int = -1
 
     from src.func.common import opened_x_error
 
-    # Markdown 문자열 Generator를 파일에 쓰기
-    with opened_x_error(file_path, mode="x") as (f, err):
+    # 문자열 Generator를 파일에 쓰기
+    with opened_x_error(file_path, mode="x", buffering=buffering) as (f, err):
         # OSError 등
         if err:
             print_under_new_line("[오류]", f"{err = }")